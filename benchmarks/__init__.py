@@ -0,0 +1,27 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-17:00
+@DependencyLibrary:[sanic-testing]
+@MainFunction:None
+@FileDoc:
+    __init__.py
+    性能基准测试，不随包发布，在仓库根目录运行:
+        python -m benchmarks                                运行全部测试
+        python -m benchmarks -k 'serializers.*' -k 'views.*' 只运行匹配的测试
+        python -m benchmarks --save baseline.json           保存为基线
+        python -m benchmarks --compare baseline.json        与基线比较，超过阈值(默认 10%)的退化以非零状态码退出
+        python -m benchmarks.memory                         内存检查，请求结束后仍存活的请求/序列化器/视图以非零状态码退出
+        python -m benchmarks.loop_lag                       混合负载下开启/关闭渲染线程池时的事件循环延迟
+@ChangeHistory:
+    datetime action why
+    2026/10/19-17:00 [Create] __init__.py
+    2026/10/19-20:10 [Change] 新增 loop_lag
+"""
+import importlib.util
+import os
+import sys
+
+# rest_framework reads TIMEZONE and TOKEN_KEY from the project's top-level `settings` module
+if importlib.util.find_spec('settings') is None:
+    sys.path.append(os.path.dirname(__file__))
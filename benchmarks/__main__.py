@@ -0,0 +1,76 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-17:00
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    __main__.py
+    python -m benchmarks [-k PATTERN] [--repeat N] [--save PATH] [--compare PATH] [--threshold RATIO] [--list]
+@ChangeHistory:
+    datetime action why
+    2026/10/19-17:00 [Create] __main__.py
+    2026/10/19-20:40 [Change] 新增 bench_request
+    2026/10/19-21:40 [Change] 新增 bench_bulk
+    2026/10/20-00:20 [Change] 新增 bench_filters
+"""
+import argparse
+import asyncio
+import importlib
+import sys
+
+SUITES = ('bench_fields', 'bench_serializers', 'bench_views', 'bench_cache', 'bench_response', 'bench_request', 'bench_bulk', 'bench_filters')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='sanic-rest-framework benchmarks')
+    parser.add_argument('-k', dest='patterns', action='append', help='only run benchmarks matching this glob, may be repeated')
+    parser.add_argument('--repeat', type=int, help='override the number of rounds of every benchmark')
+    parser.add_argument('--save', metavar='PATH', help='write the results to a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='compare the results against a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative slowdown reported as a regression (default 0.1)')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    return parser.parse_args(argv)
+
+
+def load_suites():
+    return [importlib.import_module(f'benchmarks.{name}').suite for name in SUITES]
+
+
+async def run(suites, args):
+    from .runner import format_result
+
+    results = {}
+    for suite in suites:
+        results.update(await suite.run(args.patterns, repeat=args.repeat, report=lambda name, result: print(format_result(name, result))))
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    suites = load_suites()
+    from .runner import compare, format_comparison, load, save
+
+    if args.list:
+        for suite in suites:
+            for bench in suite.select(args.patterns):
+                print(bench.name)
+        return 0
+
+    results = asyncio.run(run(suites, args))
+    if args.save:
+        save(args.save, results)
+        print(f'\nSaved {len(results)} results to {args.save}')
+    if args.compare:
+        rows = compare(load(args.compare), results, threshold=args.threshold)
+        print(f'\nCompared with {args.compare} (threshold {args.threshold:.0%}):')
+        print(format_comparison(rows, args.threshold))
+        regressions = [row[0] for row in rows if row[4]]
+        if regressions:
+            print(f'\n{len(regressions)} benchmark(s) regressed: {", ".join(regressions)}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-21:40
+@DependencyLibrary:[tortoise-orm]
+@MainFunction:None
+@FileDoc:
+    bench_bulk.py
+    ModelSerializer 批量写入 rows 行图书，ops/s 为每秒写入的行数
+    bulk.create.loop[rows]       ListSerializer.create 逐行 INSERT
+    bulk.create.bulk[rows]       Meta.bulk_create，每批 BULK_BATCH_SIZE 行一次 INSERT
+    bulk.create.bulk.m2m[rows]   同上，每行关联 2 个标签(逐行 INSERT 取主键，多对多批量 INSERT)
+    bulk.update.loop[rows]       逐行 PUT 的做法: 查询、校验、save()
+    bulk.update.bulk[rows]       BulkUpdateListSerializer: 一次查询，按变更列 bulk_update
+@ChangeHistory:
+    datetime action why
+    2026/10/19-21:40 [Create] bench_bulk.py
+    2026/10/19-22:10 [Change] 新增批量更新
+"""
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from rest_framework.serializers import BulkUpdateListSerializer, ModelSerializer
+
+from .models import BenchBook, BenchTag, book_kwargs, book_payload, database
+from .runner import Suite
+
+ROWS = 10000
+
+
+class BookModelSerializer(ModelSerializer):
+    class Meta:
+        model = BenchBook
+        fields = ('id', 'title', 'pages', 'price', 'rating', 'available', 'published')
+
+
+class BulkBookModelSerializer(ModelSerializer):
+    class Meta:
+        model = BenchBook
+        fields = ('id', 'title', 'pages', 'price', 'rating', 'available', 'published')
+        bulk_create = True
+
+
+class UpdateBookModelSerializer(ModelSerializer):
+    class Meta:
+        model = BenchBook
+        fields = ('id', 'title', 'pages', 'price', 'rating', 'available', 'published')
+        list_serializer_class = BulkUpdateListSerializer
+
+
+@asynccontextmanager
+async def bulk_context():
+    async with database(books=0, authors=0):
+        serializer = BookModelSerializer(data=[book_payload(index) for index in range(ROWS)], many=True)
+        await serializer.is_valid(raise_exception=True)
+        tags = [await BenchTag.create(name=f'Tag {index}') for index in range(10)]
+        # Rows 1..ROWS are updated, the created ones come after them
+        await BenchBook.bulk_create([BenchBook(id=index + 1, **book_kwargs(index)) for index in range(ROWS)])
+        yield SimpleNamespace(validated_data=serializer.validated_data, tags=tags, round=0)
+
+
+suite = Suite('bulk', setup=bulk_context)
+
+
+def rows(validated_data, **extra):
+    # save() hands create() fresh dicts
+    return [{**attrs, **extra} for attrs in validated_data]
+
+
+@suite.benchmark(f'create.loop[{ROWS}]', number=1, repeat=3, ops=ROWS)
+async def create_loop(ctx):
+    await BookModelSerializer(many=True).create(rows(ctx.validated_data))
+
+
+@suite.benchmark(f'create.bulk[{ROWS}]', number=1, repeat=3, ops=ROWS)
+async def create_bulk(ctx):
+    await BulkBookModelSerializer(many=True).create(rows(ctx.validated_data))
+
+
+@suite.benchmark(f'create.bulk.m2m[{ROWS}]', number=1, repeat=3, ops=ROWS)
+async def create_bulk_m2m(ctx):
+    data = [{**attrs, 'tags': ctx.tags[index % 9:index % 9 + 2]} for index, attrs in enumerate(ctx.validated_data)]
+    await BulkBookModelSerializer(many=True).create(data)
+
+
+def update_items(ctx):
+    # Every round changes the pages of every row, and the title of every other row
+    ctx.round += 1
+    return [
+        {'id': index + 1, 'pages': ctx.round, **({'title': f'Book {index} #{ctx.round}'} if index % 2 else {})}
+        for index in range(ROWS)
+    ]
+
+
+@suite.benchmark(f'update.loop[{ROWS}]', number=1, repeat=3, ops=ROWS)
+async def update_loop(ctx):
+    for item in update_items(ctx):
+        serializer = BookModelSerializer(await BenchBook.get(id=item['id']), data=item, partial=True)
+        await serializer.is_valid(raise_exception=True)
+        await serializer.save()
+
+
+@suite.benchmark(f'update.bulk[{ROWS}]', number=1, repeat=3, ops=ROWS)
+async def update_bulk(ctx):
+    serializer = UpdateBookModelSerializer(BenchBook.all(), data=update_items(ctx), many=True, partial=True)
+    await serializer.is_valid(raise_exception=True)
+    await serializer.save()
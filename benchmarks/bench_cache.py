@@ -0,0 +1,114 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-17:00
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    bench_cache.py
+    缓存后端与限流在并发下的表现，每次调用以 asyncio.gather 并发执行 CONCURRENCY 个任务
+    cache.<backend>.get / set / incr [concurrency]
+    cache.throttle.allow_request[concurrency]
+    设置环境变量 SRF_BENCH_REDIS=redis://host:port/db 时额外测试 RedisCache
+@ChangeHistory:
+    datetime action why
+    2026/10/19-17:00 [Create] bench_cache.py
+"""
+import asyncio
+import itertools
+import os
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+from rest_framework.cache.backends.base import cache_manager
+from rest_framework.cache.backends.locmem import LocMemCache
+from rest_framework.throttling import RedisThrottle
+
+from .runner import Suite
+
+CONCURRENCY = (1, 100)
+# LocMemCache clears itself once it holds more than 300 entries
+KEYS = 200
+CLIENTS = 200
+
+
+def redis_cache():
+    url = os.environ.get('SRF_BENCH_REDIS')
+    if not url:
+        return None
+    from rest_framework.cache.backends.redis import RedisCache
+
+    parsed = urlparse(url)
+    options = {'host': parsed.hostname, 'port': parsed.port or 6379, 'db': parsed.path.strip('/') or 0}
+    if parsed.password:
+        options['password'] = parsed.password
+    return RedisCache(alias='benchmark_redis', key_prefix='srf_bench', **options)
+
+
+@asynccontextmanager
+async def caches():
+    backends = {'locmem': LocMemCache(name='benchmark')}
+    redis = redis_cache()
+    if redis is not None:
+        backends['redis'] = redis
+    for cache in backends.values():
+        for index in range(KEYS):
+            await cache.set(f'key{index}', f'value{index}')
+        await cache.set('counter', 0)
+    cache_manager.add_cache('benchmark_throttle', LocMemCache(name='benchmark_throttle'))
+    try:
+        yield SimpleNamespace(caches=backends)
+    finally:
+        for cache in backends.values():
+            await cache.clear()
+
+
+async def gather(concurrency, func):
+    await asyncio.gather(*(func(index) for index in range(concurrency)))
+
+
+suite = Suite('cache', setup=caches)
+
+
+def register(backend):
+    for concurrency in CONCURRENCY:
+        options = {'number': max(10, 2000 // concurrency), 'ops': concurrency}
+
+        async def get(ctx, concurrency=concurrency):
+            cache = ctx.caches[backend]
+            await gather(concurrency, lambda index: cache.get(f'key{index % KEYS}'))
+
+        async def set_(ctx, concurrency=concurrency):
+            cache = ctx.caches[backend]
+            await gather(concurrency, lambda index: cache.set(f'key{index % KEYS}', index))
+
+        async def incr(ctx, concurrency=concurrency):
+            cache = ctx.caches[backend]
+            await gather(concurrency, lambda index: cache.incr('counter'))
+
+        suite.add(f'{backend}.get[{concurrency}]', get, **options)
+        suite.add(f'{backend}.set[{concurrency}]', set_, **options)
+        suite.add(f'{backend}.incr[{concurrency}]', incr, **options)
+
+
+register('locmem')
+if os.environ.get('SRF_BENCH_REDIS'):
+    register('redis')
+
+
+_clients = itertools.cycle(range(CLIENTS))
+
+
+async def throttled_request(index):
+    # Throttles are instantiated per request by APIView.get_throttles
+    client = next(_clients)
+    request = SimpleNamespace(headers={}, ip=f'10.0.0.{client}')
+    await RedisThrottle(rate='1000000/m', cache_engine_name='benchmark_throttle').allow_request(request, view=None)
+
+
+for concurrency in CONCURRENCY:
+
+    @suite.benchmark(f'throttle.allow_request[{concurrency}]', number=max(10, 1000 // concurrency), ops=concurrency)
+    async def allow_request(ctx, concurrency=concurrency):
+        await gather(concurrency, throttled_request)
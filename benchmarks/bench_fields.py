@@ -0,0 +1,108 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-17:00
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    bench_fields.py
+    每种字段类型的双向转换
+    fields.<Field>.external_to_internal
+    fields.<Field>.internal_to_external
+@ChangeHistory:
+    datetime action why
+    2026/10/19-17:00 [Create] bench_fields.py
+"""
+import enum
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from rest_framework import fields
+
+from .models import BenchAuthor, database
+from .runner import Suite
+
+
+class Color(enum.Enum):
+    RED = 'red'
+    BLUE = 'blue'
+
+
+class MethodParent:
+    def get_value(self, data):
+        return data
+
+
+def method_field():
+    field = fields.SerializerMethodField()
+    field.bind('value', MethodParent())
+    return field
+
+
+class FromContext:
+    """A value that depends on the seeded rows, e.g. model instances for relational fields."""
+
+    def __init__(self, getter):
+        self.getter = getter
+
+    def resolve(self, ctx):
+        return self.getter(ctx)
+
+
+# name: (field factory, external value, internal value), `None` skips that direction
+FIELD_CASES = {
+    'CharField': (lambda: fields.CharField(max_length=64), '  some text  ', 'some text'),
+    'IntegerField': (lambda: fields.IntegerField(max_value=10**6), '1234', 1234),
+    'FloatField': (lambda: fields.FloatField(), '12.5', 12.5),
+    'DecimalField': (lambda: fields.DecimalField(max_digits=10, decimal_places=2), '123.45', Decimal('123.45')),
+    'BooleanField': (lambda: fields.BooleanField(), 'true', True),
+    'DateTimeField': (lambda: fields.DateTimeField(), '2024-01-02 03:04:05', datetime(2024, 1, 2, 3, 4, 5)),
+    'DateField': (lambda: fields.DateField(), '2024-01-02', date(2024, 1, 2)),
+    'TimeField': (lambda: fields.TimeField(), '03:04:05', time(3, 4, 5)),
+    'ChoiceField': (lambda: fields.ChoiceField(choices=((1, 'one'), (2, 'two'))), 2, 2),
+    'EnumChoiceField': (lambda: fields.EnumChoiceField(Color, str), 'blue', Color.BLUE),
+    'ListField': (lambda: fields.ListField(child=fields.IntegerField()), ['1', '2', '3', '4'], [1, 2, 3, 4]),
+    'JsonField': (lambda: fields.JsonField(), '{"a": [1, 2, 3], "b": {"c": null}}', {'a': [1, 2, 3], 'b': {'c': None}}),
+    'PrimaryKeyRelatedField': (
+        lambda: fields.PrimaryKeyRelatedField(queryset=BenchAuthor.all()),
+        1,
+        FromContext(lambda authors: authors[0]),
+    ),
+    'SlugRelatedField': (
+        lambda: fields.SlugRelatedField(slug_field='name', queryset=BenchAuthor.all()),
+        'Author 1',
+        FromContext(lambda authors: authors[1]),
+    ),
+    'ManyRelatedField': (
+        lambda: fields.ManyRelatedField(child_relation=fields.PrimaryKeyRelatedField(queryset=BenchAuthor.all())),
+        [1, 2, 3],
+        FromContext(lambda authors: authors[:3]),
+    ),
+    'SerializerMethodField': (method_field, None, {'id': 1}),
+}
+
+# Relational fields query the database on every conversion
+DB_FIELDS = {'PrimaryKeyRelatedField', 'SlugRelatedField', 'ManyRelatedField'}
+
+
+def conversion(factory, method, value):
+    """The field is built on the first call, inside the suite setup, so querysets can be created after `Tortoise.init`."""
+    state = {}
+
+    async def run(authors):
+        if not state:
+            state['field'] = factory()
+            state['value'] = value.resolve(authors) if isinstance(value, FromContext) else value
+        await getattr(state['field'], method)(state['value'])
+
+    return run
+
+
+suite = Suite('fields', setup=lambda: database(books=0, authors=10))
+
+for name, (factory, external, internal) in FIELD_CASES.items():
+    number = 200 if name in DB_FIELDS else 2000
+    if external is not None:
+        suite.add(f'{name}.external_to_internal', conversion(factory, 'external_to_internal', external), number=number)
+    if internal is not None:
+        suite.add(f'{name}.internal_to_external', conversion(factory, 'internal_to_external', internal), number=number)
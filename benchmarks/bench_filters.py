@@ -0,0 +1,97 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/20-00:20
+@DependencyLibrary:[sanic-testing]
+@MainFunction:None
+@FileDoc:
+    bench_filters.py
+    列表过滤，数据库为内存 SQLite，BOOKS 行图书的标题由词表中的单词组成
+    filters.plan.orm_filter        预编译的 search_fields 计划生成一次请求的 Q
+    filters.icontains.list         search_fields '@title' 的 LIKE '%x%' 全表扫描，取第一页
+    filters.fts.list               FullTextSearchFilter ?search= 经 FTS5 索引检索并按 bm25 排序，取第一页
+@ChangeHistory:
+    datetime action why
+    2026/10/20-00:20 [Create] bench_filters.py
+"""
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import httpx
+from sanic import Sanic
+from sanic.request import RequestParameters
+
+from rest_framework.filters import FullTextSearchFilter, ORMAndFilter
+from rest_framework.generics import ListAPIView
+from rest_framework.request import SRFRequest
+
+from .bench_serializers import BookModelSerializer
+from .models import BenchBook, book_kwargs, database
+from .runner import Suite
+
+BOOKS = 50000
+WORDS = (
+    'red', 'green', 'blue', 'quick', 'slow', 'river', 'mountain', 'city', 'garden', 'night', 'morning', 'winter',
+    'summer', 'silent', 'golden', 'hidden', 'broken', 'last', 'first', 'secret', 'ocean', 'forest', 'stone', 'glass',
+)
+
+
+def title(index):
+    return ' '.join(WORDS[index * step % len(WORDS)] for step in (1, 7, 13)) + f' {index}'
+
+
+class IContainsBookListView(ListAPIView):
+    serializer_class = BookModelSerializer
+    search_fields = ('@title:q',)
+
+
+class SearchBookListView(ListAPIView):
+    serializer_class = BookModelSerializer
+    filter_backends = (FullTextSearchFilter,)
+    search_fts_fields = ('title',)
+
+
+@asynccontextmanager
+async def client():
+    async with database(books=0, authors=0):
+        await BenchBook.bulk_create([BenchBook(**{**book_kwargs(index), 'title': title(index)}) for index in range(BOOKS)], batch_size=5000)
+        for view in (IContainsBookListView, SearchBookListView):
+            # Querysets can only be built once the ORM is initialised
+            view.queryset = BenchBook.all()
+        app = Sanic('srf_bench_filters', request_class=SRFRequest, configure_logging=False)
+        app.add_route(IContainsBookListView.as_view(), '/icontains', methods=['GET'])
+        app.add_route(SearchBookListView.as_view(), '/search', methods=['GET'])
+        _, response = await app.asgi_client.get('/search', params={'search': 'river'})
+        assert response.status == 200, response.text
+        app.asgi_client.gather_request = False
+        async with httpx.AsyncClient(app=app, base_url='http://srf.benchmark') as http_client:
+            yield SimpleNamespace(app=app, client=http_client)
+
+
+async def request(ctx, uri, **params):
+    response = await ctx.client.get(uri, params=params)
+    assert response.status_code == 200, response.text
+
+
+class FilterView:
+    queryset = SimpleNamespace(model=BenchBook)
+    search_fields = ('^title', '>=pages:min_pages', '<=price:max_price', 'available', 'published__gte:since', 'id__in:ids')
+
+
+suite = Suite('filters', setup=client)
+
+
+@suite.benchmark('plan.orm_filter', number=2000)
+async def plan_orm_filter(ctx):
+    request = SimpleNamespace(args=RequestParameters({'min_pages': ['200'], 'available': ['true'], 'ids': ['1,2,3']}))
+    ORMAndFilter(request, FilterView).orm_filter
+
+
+@suite.benchmark('icontains.list', number=20)
+async def icontains_list(ctx):
+    await request(ctx, '/icontains', q='hidden stone')
+
+
+@suite.benchmark('fts.list', number=20)
+async def fts_list(ctx):
+    await request(ctx, '/search', search='hidden stone')
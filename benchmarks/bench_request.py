@@ -0,0 +1,87 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-20:40
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    bench_request.py
+    SRFRequest.post_data 解析耗时，请求体为 rows 行图书数据的 JSON 数组
+    request.post_data[rows]            新请求首次读取(含嵌套深度检查)
+    request.post_data.no_depth[rows]   REQUEST_MAX_JSON_DEPTH=None
+    request.post_data.cached[rows]     同一请求再次读取
+    request.iter_json_array[rows]      以 64KiB 分块增量解析(流式上传)
+@ChangeHistory:
+    datetime action why
+    2026/10/19-20:40 [Create] bench_request.py
+    2026/10/19-21:10 [Change] 新增 iter_json_array
+"""
+from contextlib import contextmanager
+
+import orjson
+from sanic import Sanic
+from sanic.compat import Header
+
+from rest_framework.request import JSONArrayParser, SRFRequest
+from rest_framework.settings import srf_settings
+
+from .models import book_kwargs
+from .runner import Suite
+
+ROWS = (1, 10000)
+CHUNK_SIZE = 64 * 1024
+
+HEADERS = Header({'content-type': 'application/json'})
+
+
+@contextmanager
+def max_json_depth(value):
+    srf_settings.REQUEST_MAX_JSON_DEPTH = value
+    try:
+        yield
+    finally:
+        srf_settings.__dict__.pop('REQUEST_MAX_JSON_DEPTH', None)
+
+
+def make_request(body):
+    request = SRFRequest(b'/books', HEADERS, '1.1', 'POST', None, Sanic.get_app('srf_bench_request', force_create=True))
+    request.body = body
+    return request
+
+
+suite = Suite('request')
+
+
+def register(rows, number):
+    body = orjson.dumps([{**book_kwargs(index), 'price': str(book_kwargs(index)['price'])} for index in range(rows)])
+
+    async def info(ctx):
+        return {'bytes': len(body)}
+
+    async def parse(ctx):
+        make_request(body).post_data
+
+    async def parse_without_depth(ctx):
+        with max_json_depth(None):
+            make_request(body).post_data
+
+    request = make_request(body)
+
+    async def cached(ctx):
+        request.post_data
+
+    suite.add(f'post_data[{rows}]', parse, number=number, info=info)
+    suite.add(f'post_data.no_depth[{rows}]', parse_without_depth, number=number)
+    async def iter_json_array(ctx):
+        # The chunks SRFRequest.iter_json_array() receives from a streamed body
+        parser = JSONArrayParser(srf_settings.REQUEST_MAX_JSON_DEPTH, srf_settings.REQUEST_MAX_JSON_ELEMENT_SIZE)
+        for start in range(0, len(body), CHUNK_SIZE):
+            parser.feed(body[start:start + CHUNK_SIZE])
+        parser.close()
+
+    suite.add(f'post_data.cached[{rows}]', cached, number=1000)
+    suite.add(f'iter_json_array[{rows}]', iter_json_array, number=number)
+
+
+for rows in ROWS:
+    register(rows, max(1, 2000 // rows))
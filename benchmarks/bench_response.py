@@ -0,0 +1,75 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-18:40
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    bench_response.py
+    响应体渲染耗时及大小，数据为 rows 行未经序列化的图书数据(含 datetime/Decimal)
+    response.json.compact[rows] / pretty / iso / msgpack
+    response.gzip[rows] / deflate   压缩紧凑 JSON 响应体，bytes 为压缩后大小
+@ChangeHistory:
+    datetime action why
+    2026/10/19-18:40 [Create] bench_response.py
+    2026/10/19-19:10 [Change] 新增 gzip/deflate 压缩基准
+"""
+from contextlib import contextmanager
+
+from rest_framework.middleware import deflate_compress, gzip_compress
+from rest_framework.response import JSONRenderer, MsgPackRenderer, msgpack
+from rest_framework.settings import srf_settings
+
+from .models import book_kwargs
+from .runner import Suite
+
+ROWS = (100, 10000)
+
+
+@contextmanager
+def datetime_format(value):
+    srf_settings.JSON_DATETIME_FORMAT = value
+    try:
+        yield
+    finally:
+        srf_settings.__dict__.pop('JSON_DATETIME_FORMAT', None)
+
+
+def body(rows):
+    return {'code': 1, 'message': 'Request succeeded.', 'data': [{'id': index, **book_kwargs(index)} for index in range(rows)]}
+
+
+suite = Suite('response')
+
+
+def register(name, render, rows, number):
+    data = body(rows)
+
+    async def run(ctx):
+        render(data)
+
+    async def info(ctx):
+        return {'bytes': len(render(data))}
+
+    suite.add(f'{name}[{rows}]', run, number=number, ops=rows, info=info)
+
+
+def render_iso(renderer):
+    def render(data):
+        with datetime_format('iso'):
+            return renderer.render(data)
+
+    return render
+
+
+for rows in ROWS:
+    number = max(1, 2000 // rows)
+    json_renderer = JSONRenderer()
+    register('json.compact', json_renderer.render, rows, number)
+    register('json.pretty', lambda data: json_renderer.render(data, pretty=True), rows, number)
+    register('json.iso', render_iso(json_renderer), rows, number)
+    if msgpack is not None:
+        register('msgpack', MsgPackRenderer().render, rows, number)
+    compact = json_renderer.render(body(rows))
+    for name, encoder in (('gzip', gzip_compress), ('deflate', deflate_compress)):
+        register(name, lambda data, encoder=encoder, compact=compact: encoder(compact, srf_settings.COMPRESSION_LEVEL), rows, number)
@@ -0,0 +1,96 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-17:00
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    bench_serializers.py
+    Serializer / ListSerializer / ModelSerializer 在 1、100、10k 行下的序列化与反序列化
+    serializers.<Serializer>.data[rows]
+    serializers.<Serializer>.is_valid[rows]
+@ChangeHistory:
+    datetime action why
+    2026/10/19-17:00 [Create] bench_serializers.py
+"""
+from functools import lru_cache
+
+from rest_framework import fields
+from rest_framework.serializers import ModelSerializer, Serializer
+
+from .models import BenchBook, book_kwargs, database
+from .runner import Suite
+
+ROWS = (1, 100, 10000)
+
+
+class BookSerializer(Serializer):
+    id = fields.IntegerField(read_only=True)
+    title = fields.CharField(max_length=128)
+    pages = fields.IntegerField()
+    price = fields.DecimalField(max_digits=10, decimal_places=2)
+    rating = fields.FloatField()
+    available = fields.BooleanField()
+    published = fields.DateTimeField()
+
+
+class BookModelSerializer(ModelSerializer):
+    class Meta:
+        model = BenchBook
+        fields = ('id', 'title', 'pages', 'price', 'rating', 'available', 'published')
+
+
+@lru_cache(maxsize=None)
+def instances(rows):
+    # Unsaved instances, built lazily because models can only be instantiated after `Tortoise.init`
+    return [BenchBook(id=index + 1, **book_kwargs(index)) for index in range(rows)]
+
+
+@lru_cache(maxsize=None)
+def payloads(rows):
+    return [
+        {
+            'title': f'Book {index}',
+            'pages': str(100 + index % 900),
+            'price': '19.99',
+            'rating': '4.5',
+            'available': 'true',
+            'published': '2024-01-02 03:04:05',
+        }
+        for index in range(rows)
+    ]
+
+
+def number_for(rows):
+    return max(1, 2000 // rows)
+
+
+def repeat_for(rows):
+    return 3 if rows >= 10000 else 5
+
+
+suite = Suite('serializers', setup=lambda: database(books=0, authors=0))
+
+
+def register(serializer_class):
+    name = serializer_class.__name__
+    for rows in ROWS:
+        many = rows > 1
+
+        async def serialize(ctx, rows=rows, many=many):
+            objects = instances(rows)
+            serializer = serializer_class(instance=objects, many=True) if many else serializer_class(instance=objects[0])
+            await serializer.data
+
+        async def deserialize(ctx, rows=rows, many=many):
+            data = payloads(rows)
+            serializer = serializer_class(data=data, many=True) if many else serializer_class(data=data[0])
+            assert await serializer.is_valid(), serializer.errors
+
+        options = {'number': number_for(rows), 'repeat': repeat_for(rows), 'ops': rows}
+        suite.add(f'{name}.data[{rows}]', serialize, **options)
+        suite.add(f'{name}.is_valid[{rows}]', deserialize, **options)
+
+
+register(BookSerializer)
+register(BookModelSerializer)
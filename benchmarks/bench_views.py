@@ -0,0 +1,142 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-17:00
+@DependencyLibrary:[sanic-testing]
+@MainFunction:None
+@FileDoc:
+    bench_views.py
+    通过 Sanic 测试客户端(ASGI) 请求完整的 ModelViewSet，数据库为内存 SQLite
+    测试客户端每次请求都会重新 finalize 路由(约数十毫秒)，因此只用它完成一次启动，
+    之后直接以 httpx 请求同一个 ASGI 应用
+    views.BookViewSet.list / retrieve / create
+    views.*.list.not_modified  携带 If-None-Match 的 304 请求，ETag 分别由响应体及 updated_at 计算
+    views.CachedBookListView.list  查询集结果缓存(queryset_cache)命中时的列表请求
+@ChangeHistory:
+    datetime action why
+    2026/10/19-17:00 [Create] bench_views.py
+    2026/10/19-19:40 [Change] 新增条件 GET 基准
+    2026/10/20-01:00 [Change] 新增查询集结果缓存基准
+"""
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import httpx
+from sanic import Sanic
+
+from rest_framework.generics import ListAPIView
+from rest_framework.request import SRFRequest
+from rest_framework.routes import ViewSetRouter
+from rest_framework.viewsets import ModelViewSet
+
+from .bench_serializers import BookModelSerializer, BookSerializer
+from .models import BenchBook, database
+from .runner import Suite
+
+BOOKS = 1000
+
+
+def create_app():
+    class BookViewSet(ModelViewSet):
+        # Querysets can only be built once the ORM is initialised
+        queryset = BenchBook.all()
+        serializer_class = BookModelSerializer
+
+    class PlainBookListView(ListAPIView):
+        queryset = BenchBook.all()
+        serializer_class = BookSerializer
+
+    class VersionedBookListView(ListAPIView):
+        queryset = BenchBook.all()
+        serializer_class = BookModelSerializer
+        etag_field = 'updated_at'
+
+    class CachedBookListView(ListAPIView):
+        queryset = BenchBook.all()
+        serializer_class = BookModelSerializer
+        queryset_cache = 'default'
+
+    app = Sanic('srf_benchmarks', request_class=SRFRequest)
+    router = ViewSetRouter()
+    router.register(BookViewSet, '/books')
+    for route in router.urls:
+        app.add_route(route['handler'], route['uri'], name=route['name'], methods=route['handler'].methods)
+    app.add_route(PlainBookListView.as_view(), '/plain-books', methods=['GET'])
+    app.add_route(VersionedBookListView.as_view(), '/versioned-books', methods=['GET'])
+    app.add_route(CachedBookListView.as_view(), '/cached-books', methods=['GET'])
+    return app
+
+
+@asynccontextmanager
+async def client():
+    async with database(books=BOOKS):
+        app = create_app()
+        test_client = app.asgi_client
+        _, response = await test_client.get('/books/1')
+        assert response.status == 200, response.text
+        # The test client middleware would otherwise keep a reference to the last request
+        test_client.gather_request = False
+        async with httpx.AsyncClient(app=app, base_url='http://srf.benchmark') as http_client:
+            yield SimpleNamespace(app=app, client=http_client)
+
+
+async def request(ctx, method, uri, **kwargs):
+    response = await ctx.client.request(method, uri, **kwargs)
+    assert response.status_code < 300, response.text
+
+
+async def etag(ctx, uri, **kwargs):
+    response = await ctx.client.get(uri, **kwargs)
+    assert response.status_code == 200, response.text
+    return response.headers['etag']
+
+
+async def not_modified(ctx, uri, etag_value, **kwargs):
+    response = await ctx.client.get(uri, headers={'if-none-match': etag_value}, **kwargs)
+    assert response.status_code == 304, response.status_code
+
+
+suite = Suite('views', setup=client)
+
+
+@suite.benchmark('BookViewSet.list', number=50)
+async def list_books(ctx):
+    await request(ctx, 'GET', '/books', params={'page': 3})
+
+
+@suite.benchmark('PlainBookListView.list', number=50)
+async def list_plain_books(ctx):
+    await request(ctx, 'GET', '/plain-books', params={'page': 3})
+
+
+@suite.benchmark('CachedBookListView.list', number=50)
+async def list_cached_books(ctx):
+    # The page and the count are read from the cache after the first request
+    await request(ctx, 'GET', '/cached-books', params={'page': 3})
+
+
+@suite.benchmark('BookViewSet.list.not_modified', number=50)
+async def list_books_not_modified(ctx):
+    # The ETag is computed from the rendered body, only the transfer is saved
+    if not hasattr(ctx, 'list_etag'):
+        ctx.list_etag = await etag(ctx, '/books', params={'page': 3})
+    await not_modified(ctx, '/books', ctx.list_etag, params={'page': 3})
+
+
+@suite.benchmark('VersionedBookListView.list.not_modified', number=50)
+async def list_versioned_books_not_modified(ctx):
+    # The ETag is computed from the ids and updated_at of the page, serialization is skipped
+    if not hasattr(ctx, 'versioned_etag'):
+        ctx.versioned_etag = await etag(ctx, '/versioned-books', params={'page': 3})
+    await not_modified(ctx, '/versioned-books', ctx.versioned_etag, params={'page': 3})
+
+
+@suite.benchmark('BookViewSet.retrieve', number=100)
+async def retrieve_book(ctx):
+    await request(ctx, 'GET', '/books/42')
+
+
+@suite.benchmark('BookViewSet.create', number=100)
+async def create_book(ctx):
+    payload = {'title': 'New book', 'pages': 320, 'price': '12.50', 'rating': 4.5, 'available': True, 'published': '2024-01-02 03:04:05'}
+    await request(ctx, 'POST', '/books', json=payload)
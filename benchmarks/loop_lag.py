@@ -0,0 +1,160 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-20:10
+@DependencyLibrary:[httpx]
+@MainFunction:None
+@FileDoc:
+    loop_lag.py
+    混合负载下的事件循环延迟，python -m benchmarks.loop_lag [--rows N] [--seconds S]
+    在子进程中启动 Sanic 服务，若干并发客户端持续请求小响应 /ping，同时另有客户端请求 rows 行的大响应 /rows，
+    分别在关闭(RENDER_OFFLOAD_THRESHOLD=None)与开启渲染线程池时报告:
+    loop lag  服务进程内 1ms 定时器的实际延迟 p50/p99/max
+    ping      小请求的耗时 p50/p99/max
+    rows      大请求的耗时 p50
+@ChangeHistory:
+    datetime action why
+    2026/10/19-20:10 [Create] loop_lag.py
+"""
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import statistics
+import sys
+import time
+
+import httpx
+from sanic import Sanic
+
+from rest_framework.request import SRFRequest
+from rest_framework.response import JsonResponse
+from rest_framework.settings import srf_settings
+from rest_framework.views import APIView
+
+from .models import book_kwargs
+
+TICK = 0.001
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.loop_lag', description='event loop lag under mixed load')
+    parser.add_argument('--rows', type=int, default=50000, help='rows of the large response (default 50000)')
+    parser.add_argument('--seconds', type=float, default=3, help='duration of each run (default 3)')
+    parser.add_argument('--ping-clients', type=int, default=20, help='concurrent clients of the small endpoint (default 20)')
+    parser.add_argument('--rows-clients', type=int, default=2, help='concurrent clients of the large endpoint (default 2)')
+    return parser.parse_args(argv)
+
+
+def create_app(rows):
+    data = [{'id': index, **book_kwargs(index)} for index in range(rows)]
+    lags = []
+
+    class PingView(APIView):
+        async def get(self, request, *args, **kwargs):
+            return self.success_json_response(data={'pong': True})
+
+    class RowsView(APIView):
+        async def get(self, request, *args, **kwargs):
+            return self.success_json_response(data=data)
+
+    async def lag_view(request):
+        """Lags measured since the previous call"""
+        measured = lags[:]
+        lags.clear()
+        return JsonResponse(measured)
+
+    async def monitor():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - started - TICK)
+
+    app = Sanic('srf_loop_lag', request_class=SRFRequest, configure_logging=False)
+    app.add_route(PingView.as_view(), '/ping', methods=['GET'])
+    app.add_route(RowsView.as_view(), '/rows', methods=['GET'])
+    app.add_route(lag_view, '/lag', methods=['GET'])
+    app.add_task(monitor())
+    return app
+
+
+def serve(port, rows, threshold):
+    srf_settings.RENDER_OFFLOAD_THRESHOLD = threshold
+    create_app(rows).run(host='127.0.0.1', port=port, access_log=False)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def summary(values):
+    return f'p50 {statistics.median(values) * 1000:7.2f}ms  p99 {percentile(values, 0.99) * 1000:7.2f}ms  max {max(values) * 1000:7.2f}ms'
+
+
+async def wait_until_up(http_client, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            await http_client.get('/ping')
+            return
+        except httpx.TransportError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def measure(base_url, args):
+    """Returns the loop lags measured by the server, the durations of the small and of the large requests."""
+    pings, rows = [], []
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as http_client:
+        await wait_until_up(http_client)
+        await http_client.get('/rows')
+        deadline = time.perf_counter() + args.seconds
+
+        async def worker(uri, durations):
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await http_client.get(uri)
+                assert response.status_code == 200, response.text
+                durations.append(time.perf_counter() - started)
+
+        await http_client.get('/lag')
+        await asyncio.gather(
+            *(worker('/ping', pings) for _ in range(args.ping_clients)),
+            *(worker('/rows', rows) for _ in range(args.rows_clients)),
+        )
+        lags = (await http_client.get('/lag')).json()
+    return lags, pings, rows
+
+
+def run(args):
+    context = multiprocessing.get_context('fork')
+    for mode, threshold in (('inline', None), ('offloaded', srf_settings.RENDER_OFFLOAD_THRESHOLD)):
+        port = free_port()
+        server = context.Process(target=serve, args=(port, args.rows, threshold), daemon=True)
+        server.start()
+        try:
+            lags, pings, rows = asyncio.run(measure(f'http://127.0.0.1:{port}', args))
+        finally:
+            server.terminate()
+            server.join()
+        print(f'\n{mode} (RENDER_OFFLOAD_THRESHOLD={threshold}), {args.rows} rows, {len(rows)} large responses')
+        print(f'    loop lag  {summary(lags)}')
+        print(f'    ping      {summary(pings)}  ({len(pings)} requests)')
+        print(f'    rows      p50 {statistics.median(rows) * 1000:7.2f}ms')
+
+
+def main(argv=None):
+    run(parse_args(argv))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
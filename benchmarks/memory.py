@@ -0,0 +1,232 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-18:10
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    memory.py
+    基于 tracemalloc 的内存检查，python -m benchmarks.memory [--requests N] [--top N]
+    endpoints  重复请求 views 基准中的 ModelViewSet，报告每个请求残留的内存及主要分配位置，
+               请求结束后仍存活的 SRFRequest、序列化器或视图实例视为泄漏，以非零状态码退出
+    locmem     报告 locmem 模块级 _caches 中各缓存的条目数变化
+    peak       大列表序列化与渲染的峰值内存，整体解析与流式(stream_create)批量上传的峰值内存
+@ChangeHistory:
+    datetime action why
+    2026/10/19-18:10 [Create] memory.py
+    2026/10/19-21:10 [Change] 新增批量上传的峰值内存
+"""
+import argparse
+import asyncio
+import gc
+import inspect
+import linecache
+import sys
+import tracemalloc
+from types import SimpleNamespace
+
+ENDPOINTS = (
+    ('list', 'GET', '/books', {'params': {'page': 3}}),
+    ('plain list', 'GET', '/plain-books', {'params': {'page': 3}}),
+    ('retrieve', 'GET', '/books/42', {}),
+    ('create', 'POST', '/books', {'json': {'title': 'New book', 'pages': 320, 'price': '12.50', 'rating': 4.5, 'available': True}}),
+)
+
+PEAK_ROWS = 10000
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+IGNORED_FILES = (tracemalloc.__file__, linecache.__file__, __file__, '<frozen importlib._bootstrap>', '<unknown>')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.memory', description='sanic-rest-framework memory checks')
+    parser.add_argument('--requests', type=int, default=200, help='requests per endpoint (default 200)')
+    parser.add_argument('--top', type=int, default=5, help='allocation sites reported per endpoint (default 5)')
+    parser.add_argument('--frames', type=int, default=1, help='traceback depth stored by tracemalloc (default 1)')
+    return parser.parse_args(argv)
+
+
+def tracked_classes():
+    from rest_framework.request import SRFRequest
+    from rest_framework.serializers import BaseSerializer
+    from rest_framework.views import BaseView
+
+    return (SRFRequest, BaseSerializer, BaseView)
+
+
+def tracked_objects():
+    gc.collect()
+    classes = tracked_classes()
+    return [obj for obj in gc.get_objects() if isinstance(obj, classes)]
+
+
+def snapshot():
+    gc.collect()
+    return tracemalloc.take_snapshot()
+
+
+def locmem_entries():
+    from rest_framework.cache.backends import locmem
+
+    return {name: len(entries) for name, entries in locmem._caches.items()}
+
+
+def _format_size(size):
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}GiB'
+
+
+async def profile_endpoint(ctx, method, uri, requests, top, **kwargs):
+    """
+    Returns:
+        tuple: (retained bytes per request, top allocation sites, surviving tracked objects)
+    """
+
+    async def request():
+        response = await ctx.client.request(method, uri, **kwargs)
+        assert response.status_code < 300, response.text
+
+    # Lazily built state (routes, querysets, serializer metadata) is not a leak
+    for _ in range(5):
+        await request()
+    ctx.app._asgi_app = None
+    before_ids = {id(obj) for obj in tracked_objects()}
+    before = snapshot()
+    for _ in range(requests):
+        await request()
+    # Sanic keeps the last ASGI connection, and with it the last request, on the application
+    ctx.app._asgi_app = None
+    after = snapshot()
+    survivors = [obj for obj in tracked_objects() if id(obj) not in before_ids]
+
+    # Filtering the statistics is much cheaper than filtering the snapshots trace by trace
+    stats = [stat for stat in after.compare_to(before, 'lineno') if stat.traceback[0].filename not in IGNORED_FILES]
+    retained = sum(stat.size_diff for stat in stats) / requests
+    sites = [stat for stat in stats if stat.size_diff > 0][:top]
+    return retained, sites, survivors
+
+
+def describe_survivor(obj, survivors):
+    # Skip the harness' own references: the survivor list and the coroutine iterating it
+    referrers = [
+        type(referrer).__name__
+        for referrer in gc.get_referrers(obj)
+        if referrer is not survivors and not inspect.iscoroutine(referrer)
+    ]
+    return f'{obj.__class__.__module__}.{obj.__class__.__qualname__} referred to by {", ".join(referrers[:5]) or "nothing (cycle)"}'
+
+
+async def check_endpoints(args):
+    from .bench_views import client
+
+    leaks = 0
+    async with client() as ctx:
+        for name, method, uri, kwargs in ENDPOINTS:
+            entries_before = locmem_entries()
+            retained, sites, survivors = await profile_endpoint(ctx, method, uri, args.requests, args.top, **kwargs)
+            print(f'\n{name}: {method} {uri} x {args.requests}, retained {_format_size(retained)}/request')
+            for stat in sites:
+                frame = stat.traceback[0]
+                print(f'    {_format_size(stat.size_diff):>10} {stat.count_diff:>+7} blocks  {frame.filename}:{frame.lineno}')
+            for alias, count in locmem_entries().items():
+                if count != entries_before.get(alias, 0):
+                    print(f'    locmem `{alias}`: {entries_before.get(alias, 0)} -> {count} entries')
+            if survivors:
+                leaks += len(survivors)
+                print(f'    LEAK: {len(survivors)} object(s) survived the requests')
+                for obj in survivors[:10]:
+                    print(f'        {describe_survivor(obj, survivors)}')
+    return leaks
+
+
+async def measure_peak(coroutine_factory):
+    gc.collect()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = await coroutine_factory()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    return peak, result
+
+
+async def check_peaks():
+    from rest_framework.response import JsonResponse
+
+    from .bench_serializers import BookModelSerializer, instances
+    from .models import database
+
+    async with database(books=0, authors=0):
+        objects = instances(PEAK_ROWS)
+
+        async def serialize():
+            return await BookModelSerializer(instance=objects, many=True).data
+
+        peak, data = await measure_peak(serialize)
+        print(f'\npeak: serialize {PEAK_ROWS} rows {_format_size(peak)}')
+        for mode, request in (('compact', None), ('pretty', SimpleNamespace(headers={}, args={'pretty': '1'}))):
+
+            async def render():
+                return JsonResponse(data, request=request)
+
+            peak, response = await measure_peak(render)
+            print(f'peak: render {PEAK_ROWS} rows ({mode}) {_format_size(peak)} for a {_format_size(len(response.body))} body')
+
+    await check_upload_peaks()
+
+
+async def check_upload_peaks():
+    import orjson
+
+    from rest_framework.request import JSONArrayParser
+
+    from .bench_serializers import BookModelSerializer
+    from .models import book_payload, database
+
+    body = orjson.dumps([book_payload(index) for index in range(PEAK_ROWS)])
+
+    async def buffered():
+        serializer = BookModelSerializer(data=orjson.loads(body), many=True)
+        await serializer.is_valid(raise_exception=True)
+        await serializer.save()
+
+    async def items():
+        # What SRFRequest.iter_json_array() does with the chunks of a streamed body
+        parser = JSONArrayParser()
+        for start in range(0, len(body), UPLOAD_CHUNK_SIZE):
+            for item in parser.feed(body[start:start + UPLOAD_CHUNK_SIZE]):
+                yield item
+        for item in parser.close():
+            yield item
+
+    async def streamed():
+        return await BookModelSerializer(many=True).stream_create(items())
+
+    for mode, upload in (('buffered', buffered), ('streamed', streamed)):
+        async with database(books=0, authors=0):
+            peak, _ = await measure_peak(upload)
+        print(f'peak: upload {PEAK_ROWS} rows ({mode}) {_format_size(peak)} for a {_format_size(len(body))} body')
+
+
+async def run(args):
+    leaks = await check_endpoints(args)
+    await check_peaks()
+    return leaks
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tracemalloc.start(args.frames)
+    try:
+        leaks = asyncio.run(run(args))
+    finally:
+        tracemalloc.stop()
+    if leaks:
+        print(f'\n{leaks} object(s) outlived their request')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-17:00
+@DependencyLibrary:[tortoise-orm]
+@MainFunction:None
+@FileDoc:
+    models.py
+    基准测试使用的模型及内存 SQLite 数据库
+@ChangeHistory:
+    datetime action why
+    2026/10/19-17:00 [Create] models.py
+    2026/10/19-19:40 [Change] BenchBook 新增 updated_at 版本字段
+    2026/10/19-21:10 [Change] 新增 book_payload，请求体中的图书数据
+    2026/10/19-21:40 [Change] 新增 BenchTag 及 BenchBook.tags 多对多字段
+    2026/10/19-23:30 [Change] 新增树形的 BenchCategory
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime
+from decimal import Decimal
+
+from tortoise import Tortoise, fields, models
+
+
+class BenchAuthor(models.Model):
+    name = fields.CharField(max_length=64, unique=True)
+
+
+class BenchTag(models.Model):
+    name = fields.CharField(max_length=32)
+
+
+class BenchBook(models.Model):
+    title = fields.CharField(max_length=128)
+    pages = fields.IntField(default=0)
+    price = fields.DecimalField(max_digits=10, decimal_places=2, default=0)
+    rating = fields.FloatField(default=0)
+    available = fields.BooleanField(default=True)
+    published = fields.DatetimeField(null=True)
+    author = fields.ForeignKeyField('models.BenchAuthor', related_name='books', null=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+    tags = fields.ManyToManyField('models.BenchTag', related_name='books')
+
+
+class BenchCategory(models.Model):
+    name = fields.CharField(max_length=64)
+    order = fields.IntField(default=0)
+    parent = fields.ForeignKeyField('models.BenchCategory', related_name='children', null=True)
+
+
+def book_kwargs(index):
+    return {
+        'title': f'Book {index}',
+        'pages': 100 + index % 900,
+        'price': Decimal('9.99') + index % 100,
+        'rating': (index % 50) / 10,
+        'available': index % 3 != 0,
+        'published': datetime(2020, 1, 1 + index % 28, 12, 30),
+    }
+
+
+def book_payload(index):
+    """book_kwargs as a client sends them"""
+    kwargs = book_kwargs(index)
+    return {**kwargs, 'price': str(kwargs['price']), 'published': kwargs['published'].strftime('%Y-%m-%d %H:%M:%S')}
+
+
+@asynccontextmanager
+async def database(books=100, authors=10):
+    """In-memory SQLite with `books` rows spread over `authors`, the connection is closed on exit."""
+    await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+    await Tortoise.generate_schemas()
+    try:
+        author_list = [await BenchAuthor.create(name=f'Author {index}') for index in range(authors)]
+        await BenchBook.bulk_create([BenchBook(author=author_list[index % authors], **book_kwargs(index)) for index in range(books)])
+        yield author_list
+    finally:
+        await Tortoise.close_connections()
@@ -0,0 +1,187 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-17:00
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    runner.py
+    基准测试运行器
+    Suite      一组共享 setup 的基准测试，setup 为异步上下文管理器，其返回值作为 ctx 传给每个测试
+    Benchmark  单个测试，每轮执行 number 次，取各轮中单次操作耗时的最小值作为结果
+    save/load  以 JSON 保存、读取基线
+    compare    与基线比较，单次操作耗时增加超过阈值的视为退化
+@ChangeHistory:
+    datetime action why
+    2026/10/19-17:00 [Create] runner.py
+"""
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+__all__ = ('Suite', 'Benchmark', 'save', 'load', 'compare', 'format_results', 'format_comparison')
+
+
+@asynccontextmanager
+async def _no_setup():
+    yield None
+
+
+class Benchmark:
+    def __init__(self, name, func, number=100, repeat=5, ops=1, info=None):
+        """
+        :param name: 测试名称, 例如 `fields.CharField.external_to_internal`
+        :param func: 异步函数 func(ctx), 每次调用完成 `ops` 次操作
+        :param number: 每轮调用次数
+        :param repeat: 轮数
+        :param ops: 每次调用包含的操作数, 并发测试中为并发任务数
+        :param info: 可选的异步函数 info(ctx), 返回附加在结果中的数据, 例如响应大小
+        """
+        self.name = name
+        self.func = func
+        self.number = number
+        self.repeat = repeat
+        self.ops = ops
+        self.info = info
+
+    async def run(self, ctx, repeat=None):
+        repeat = repeat or self.repeat
+        # Warm up caches and lazily built state before measuring
+        await self.func(ctx)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(self.number):
+                await self.func(ctx)
+            timings.append((time.perf_counter() - started) / (self.number * self.ops))
+        result = {
+            'per_op': min(timings),
+            'median': statistics.median(timings),
+            'ops_per_sec': 1 / min(timings) if min(timings) else 0,
+            'number': self.number,
+            'repeat': repeat,
+            'ops': self.ops,
+        }
+        if self.info is not None:
+            result['info'] = await self.info(ctx)
+        return result
+
+
+class Suite:
+    """
+    example:
+        suite = Suite('cache', setup=cache_context)
+
+        @suite.benchmark('locmem.get', number=1000)
+        async def locmem_get(ctx):
+            await ctx.cache.get('key')
+    """
+
+    def __init__(self, name, setup=None):
+        self.name = name
+        self.setup = setup or _no_setup
+        self.benchmarks = []
+
+    def benchmark(self, name, number=100, repeat=5, ops=1, info=None):
+        def decorator(func):
+            self.add(name, func, number=number, repeat=repeat, ops=ops, info=info)
+            return func
+
+        return decorator
+
+    def add(self, name, func, number=100, repeat=5, ops=1, info=None):
+        self.benchmarks.append(Benchmark(f'{self.name}.{name}', func, number=number, repeat=repeat, ops=ops, info=info))
+
+    def select(self, patterns=None):
+        if not patterns:
+            return list(self.benchmarks)
+        return [bench for bench in self.benchmarks if any(fnmatch.fnmatch(bench.name, pattern) for pattern in patterns)]
+
+    async def run(self, patterns=None, repeat=None, report=None):
+        """Run the selected benchmarks inside a single setup, returns {name: result}."""
+        benchmarks = self.select(patterns)
+        results = {}
+        if not benchmarks:
+            return results
+        async with self.setup() as ctx:
+            for bench in benchmarks:
+                results[bench.name] = await bench.run(ctx, repeat=repeat)
+                if report is not None:
+                    report(bench.name, results[bench.name])
+        return results
+
+
+def environment():
+    import orjson
+    import sanic
+    import tortoise
+
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'sanic': sanic.__version__,
+        'tortoise': tortoise.__version__,
+        'orjson': orjson.__version__,
+        'created': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def save(path, results):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'environment': environment(), 'results': results}, file, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['results']
+
+
+def compare(baseline, results, threshold=0.1):
+    """
+    Compare per-operation times against a baseline.
+
+    Returns:
+        list: [(name, baseline_per_op, per_op, change, regressed)], change being the relative difference,
+            benchmarks missing on either side are skipped.
+    """
+    rows = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['per_op'], result['per_op']
+        change = (after - before) / before if before else 0.0
+        rows.append((name, before, after, change, change > threshold))
+    return rows
+
+
+def _format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if seconds >= 1 / scale:
+            return f'{seconds * scale:.2f}{unit}'
+    return f'{seconds * 1e9:.0f}ns'
+
+
+def format_result(name, result):
+    line = f'{name:<64} {_format_time(result["per_op"]):>10}/op {result["ops_per_sec"]:>14,.0f} ops/s'
+    if result.get('info'):
+        line += '  ' + ' '.join(f'{key}={value}' for key, value in result['info'].items())
+    return line
+
+
+def format_results(results):
+    return '\n'.join(format_result(name, result) for name, result in results.items())
+
+
+def format_comparison(rows, threshold):
+    lines = []
+    for name, before, after, change, regressed in rows:
+        flag = 'REGRESSED' if regressed else ('faster' if change < -threshold else '')
+        lines.append(f'{name:<64} {_format_time(before):>10} -> {_format_time(after):>10} {change:>+8.1%} {flag}')
+    return '\n'.join(lines)
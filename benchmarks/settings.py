@@ -0,0 +1,8 @@
+"""
+Project settings of the benchmark run, `rest_framework` reads these from the top-level `settings` module.
+A `settings` module already importable from the current project takes precedence.
+"""
+from datetime import timedelta, timezone
+
+TIMEZONE = timezone(timedelta(hours=8), 'Asia/Shanghai')
+TOKEN_KEY = 'Authorization'
@@ -0,0 +1,133 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-23:30
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    tree.py
+    TreeAPIView 在大树上的耗时与峰值内存，python -m benchmarks.tree [--nodes N] [--fanout F]
+    树为 nodes 个节点，每个节点 fanout 个子节点，子节点的 order 与创建顺序无关
+    python        旧做法: 读取全部行，在 Python 中建树并逐节点排序子节点
+    full          数据库按 order_field 排序的整棵树
+    full.stream   同上，stream_tree 逐节点写出响应
+    depth=2       递归 CTE 只取前两层
+    lazy          ?parent=<第二层的节点>&depth=2 懒加载一棵子树的两层
+@ChangeHistory:
+    datetime action why
+    2026/10/19-23:30 [Create] tree.py
+"""
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from sanic import Sanic
+
+from rest_framework.generics import TreeAPIView
+from rest_framework.request import SRFRequest
+from rest_framework.serializers import ModelSerializer
+
+from .models import BenchCategory, database
+
+
+class CategorySerializer(ModelSerializer):
+    class Meta:
+        model = BenchCategory
+        fields = ('id', 'name', 'order', 'parent_id')
+
+
+class CategoryTreeView(TreeAPIView):
+    serializer_class = CategorySerializer
+
+
+class PythonSortedTreeView(CategoryTreeView):
+    def is_db_ordered(self, model):
+        return False
+
+
+class StreamedTreeView(CategoryTreeView):
+    stream_tree = True
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.tree', description='TreeAPIView on a large tree')
+    parser.add_argument('--nodes', type=int, default=500000, help='nodes of the tree (default 500000)')
+    parser.add_argument('--fanout', type=int, default=20, help='children per node (default 20)')
+    return parser.parse_args(argv)
+
+
+def parent_of(index, fanout):
+    """Parent of the node `index` (from 1) when the nodes are numbered level by level"""
+    return None if index <= fanout else (index - fanout - 1) // fanout + 1
+
+
+async def create_tree(nodes, fanout):
+    await BenchCategory.bulk_create(
+        [
+            BenchCategory(id=index, name=f'Category {index}', order=index * 7919 % 1000, parent_id=parent_of(index, fanout))
+            for index in range(1, nodes + 1)
+        ],
+        batch_size=5000,
+    )
+
+
+def create_app():
+    CategoryTreeView.queryset = BenchCategory.all()
+    app = Sanic('srf_bench_tree', request_class=SRFRequest, configure_logging=False)
+    app.add_route(PythonSortedTreeView.as_view(), '/python', methods=['GET'])
+    app.add_route(CategoryTreeView.as_view(), '/tree', methods=['GET'])
+    app.add_route(StreamedTreeView.as_view(), '/streamed', methods=['GET'])
+    return app
+
+
+def _format_size(size):
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}GiB'
+
+
+async def measure(app, uri, params):
+    """Duration of the request, and its peak memory measured in a second request"""
+    started = time.perf_counter()
+    _, response = await app.asgi_client.get(uri, params=params)
+    duration = time.perf_counter() - started
+    assert response.status == 200, response.text
+
+    tracemalloc.start()
+    try:
+        _, response = await app.asgi_client.get(uri, params=params)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return duration, peak, len(response.body)
+
+
+async def run(args):
+    async with database(books=0, authors=0):
+        started = time.perf_counter()
+        await create_tree(args.nodes, args.fanout)
+        print(f'{args.nodes} nodes, fanout {args.fanout}, created in {time.perf_counter() - started:.1f}s\n')
+        app = create_app()
+        cases = (
+            ('python', '/python', {}),
+            ('full', '/tree', {}),
+            ('full.stream', '/streamed', {}),
+            ('depth=2', '/tree', {'depth': 2}),
+            ('lazy', '/tree', {'parent': args.fanout + 1, 'depth': 2}),
+        )
+        for name, uri, params in cases:
+            duration, peak, size = await measure(app, uri, params)
+            print(f'{name:<12} {duration * 1000:9.1f}ms  peak {_format_size(peak):>10}  body {_format_size(size):>10}')
+
+
+def main(argv=None):
+    asyncio.run(run(parse_args(argv)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,15 +11,97 @@
     datetime action why
     example:
     2021/3/31 16:21 change 'Fix bug'
+    2026/10/20-01:20 [Change] 缓存校验后的 Token 声明与用户对象，新增 Token 吊销名单
+    2026/10/20-02:00 [Change] 新增 JWKSTokenAuthenticate，以 JWKS 公钥校验 RS256/ES256/EdDSA 签名
+    2026/10/20-02:40 [Fix] Token 声明缓存的键包含校验算法，算法变化后重新校验
 """
+import hashlib
+import time
+from collections import OrderedDict
 
 import jwt
-from jwt.exceptions import DecodeError, ExpiredSignatureError
+from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 
 from settings import TOKEN_KEY
+from rest_framework.cache.backends.base import cache_manager, dumps_text, loads_text
 from rest_framework.exceptions import AuthenticationDenied
+from rest_framework.jwks import get_key_set
 from rest_framework.openapi3.definitions import SecurityScheme
 from rest_framework.request import SRFRequest
+from rest_framework.signals import connect_writes
+
+# Revoked tokens without an `exp` claim are kept this long
+REVOKED_TIMEOUT = 30 * 24 * 3600
+
+
+class ClaimsCache:
+    """Bounded LRU of verified token -> claims, an entry is dropped once the `exp` of its token is reached"""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        claims, expires = entry
+        if expires is not None and expires <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def set(self, key, claims):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (claims, claims.get('exp'))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class TokenDenyList:
+    """
+    Revoked tokens until they expire, by their `jti` claim or the digest of tokens without one.
+    In memory, or in the CACHES `alias` to be shared by the processes, one lookup per request either way.
+    """
+
+    def __init__(self, alias=None):
+        self.alias = alias
+        # {key: exp}
+        self._revoked = {}
+
+    @staticmethod
+    def get_key(token, claims):
+        return claims.get('jti') or hashlib.sha256(token.encode('utf8')).hexdigest()
+
+    async def revoke(self, token, claims=None):
+        """Revokes `token`, its claims are read without verification when not given"""
+        if claims is None:
+            claims = jwt.decode(token, options={'verify_signature': False})
+        key = self.get_key(token, claims)
+        expires = claims.get('exp') or time.time() + REVOKED_TIMEOUT
+        if self.alias is not None:
+            timeout = max(int(expires - time.time()) + 1, 1)
+            await cache_manager.get_cache(self.alias).set(f"srf_revoked:{key}", '1', timeout)
+            return
+        now = time.time()
+        # Tokens past their expiry are refused by the verification, the revocations are not needed anymore
+        self._revoked = {revoked: exp for revoked, exp in self._revoked.items() if exp > now}
+        self._revoked[key] = expires
+
+    async def is_revoked(self, token, claims):
+        key = self.get_key(token, claims)
+        if self.alias is not None:
+            return await cache_manager.get_cache(self.alias).get(f"srf_revoked:{key}") is not None
+        return key in self._revoked
 
 
 class BaseAuthenticate:
@@ -36,9 +118,34 @@ class BaseAuthenticate:
 
 
 class BaseTokenAuthenticate(BaseAuthenticate):
-    """Base authentication class using JWT tokens"""
+    """
+    Base authentication class using JWT tokens
+
+    Verified claims are kept in the `claims_cache` LRU of the class until the token expires,
+    repeated requests with a token skip `decode_token()`. Tokens revoked in `deny_list` are refused.
+    Subclasses either implement `_authenticate()`, or `load_user()` for the user set as `request.user`,
+    which is kept in the CACHES `user_cache` for `user_cache_timeout` seconds by its `user_id_claim`.
+    The cached users are dropped with `invalidate_user()`, and on the writes of the mixins on `user_model`.
+    """
 
     token_key = TOKEN_KEY
+    algorithms = ('HS256',)
+    # Verified tokens kept per class, 0 disables the cache
+    claims_cache_size = 1024
+    claims_cache = ClaimsCache(claims_cache_size)
+    # TokenDenyList, None skips the revocation check
+    deny_list = None
+    # CACHES alias of the users of `load_user()`, None loads the user on every request
+    user_cache = None
+    user_cache_timeout = 60
+    user_id_claim = 'user_id'
+    user_model = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.claims_cache = ClaimsCache(cls.claims_cache_size)
+        if cls.user_cache is not None and cls.user_model is not None:
+            connect_writes(cls.user_model, cls.on_user_written)
 
     @classmethod
     def to_openapi(cls):
@@ -55,19 +162,75 @@ class BaseTokenAuthenticate(BaseAuthenticate):
         if not token:
             raise AuthenticationDenied(f'`{self.token_key}` must exist in the request header.')
 
-        token_secret = request.app.config.TOKEN_SECRET
-        try:
-            token_info = self.decode_token(token, token_secret)
-        except ExpiredSignatureError:
-            raise AuthenticationDenied('Login timeout.')
-        except DecodeError:
-            raise AuthenticationDenied('Invalid Token.')
+        token_info = await self.get_token_claims(request, token)
+        if self.deny_list is not None and await self.deny_list.is_revoked(token, token_info):
+            raise AuthenticationDenied('Token has been revoked.')
 
         await self._authenticate(request, view, token_info, **kwargs)
 
+    async def get_token_claims(self, request: SRFRequest, token: str):
+        """The claims of the token, verified by `decode_token()` once and then read from `claims_cache` until `exp`"""
+        key = await self.get_claims_cache_key(request, token)
+        claims = self.claims_cache.get(key)
+        if claims is None:
+            try:
+                claims = self.decode_token(token, await self.get_verifying_key(request, token))
+            except ExpiredSignatureError:
+                raise AuthenticationDenied('Login timeout.')
+            except InvalidTokenError:
+                raise AuthenticationDenied('Invalid Token.')
+            self.claims_cache.set(key, claims)
+        # The cached claims are not changed by `_authenticate()`
+        return dict(claims)
+
+    async def get_claims_cache_key(self, request: SRFRequest, token: str):
+        """The secret and the algorithms are part of the key, the tokens are verified again once they changed"""
+        return request.app.config.TOKEN_SECRET, self.algorithms, token
+
+    async def get_verifying_key(self, request: SRFRequest, token: str):
+        """The key given to `decode_token()`"""
+        return request.app.config.TOKEN_SECRET
+
     async def _authenticate(self, request: SRFRequest, view, token_info: dict, **kwargs):
-        """Core authentication logic"""
-        pass
+        """Core authentication logic, sets the user of `get_user()` as `request.user` by default"""
+        user = await self.get_user(token_info)
+        if user is not None:
+            request.user = user
+
+    async def get_user(self, token_info: dict):
+        """The user of `load_user()`, read from `user_cache` when it is set"""
+        user_id = token_info.get(self.user_id_claim)
+        if self.user_cache is None or user_id is None:
+            return await self.load_user(token_info)
+        cache = cache_manager.get_cache(self.user_cache)
+        key = self.get_user_cache_key(user_id)
+        cached = await cache.get(key)
+        if cached is not None:
+            return loads_text(cached)
+        user = await self.load_user(token_info)
+        if user is not None:
+            await cache.set(key, dumps_text(user), self.user_cache_timeout)
+        return user
+
+    async def load_user(self, token_info: dict):
+        """Loads the user of the token, e.g. from the database, None leaves `request.user` unset"""
+        return None
+
+    @classmethod
+    def get_user_cache_key(cls, user_id):
+        return f"srf_user:{cls.__module__}.{cls.__qualname__}:{user_id}"
+
+    @classmethod
+    async def invalidate_user(cls, user_id):
+        """Drops the cached user, `user_id` being the value of its `user_id_claim`"""
+        if cls.user_cache is not None:
+            await cache_manager.get_cache(cls.user_cache).delete(cls.get_user_cache_key(user_id))
+
+    @classmethod
+    async def on_user_written(cls, request, saved, deleted, rebuild):
+        """Drops the written users, the `user_id_claim` of the tokens holding their primary key"""
+        for user_id in (*(instance.pk for instance in saved), *deleted):
+            await cls.invalidate_user(user_id)
 
     def decode_token(self, token: str, token_secret: str):
         """
@@ -80,4 +243,46 @@ class BaseTokenAuthenticate(BaseAuthenticate):
         Returns:
             dict: The decoded token information
         """
-        return jwt.decode(token, token_secret, algorithms=['HS256'])
+        return jwt.decode(token, token_secret, algorithms=list(self.algorithms))
+
+
+class JWKSTokenAuthenticate(BaseTokenAuthenticate):
+    """
+    JWT tokens signed with RS256, ES256 or EdDSA, verified with the public keys of the JWKS document at `jwks_source`,
+    a local file or an http(s) URL, so that the services verifying the tokens do not hold the signing secret.
+    The parsed keys are kept by `kid` and reloaded when the document changes, see `rest_framework.jwks.JWKSet`.
+    A token is only verified with the algorithm of its key, `audience` and `issuer` are checked when set.
+    """
+
+    jwks_source = None
+    jwks_refresh_interval = 300
+    algorithms = ('RS256', 'ES256', 'EdDSA')
+    audience = None
+    issuer = None
+
+    @property
+    def key_set(self):
+        assert self.jwks_source is not None, f'`{self.__class__.__name__}.jwks_source` is required.'
+        return get_key_set(self.jwks_source, refresh_interval=self.jwks_refresh_interval)
+
+    async def get_claims_cache_key(self, request: SRFRequest, token: str):
+        # Tokens are verified again once the keys changed, e.g. a key was removed
+        key_set = self.key_set
+        await key_set.refresh()
+        return key_set.generation, token
+
+    async def get_verifying_key(self, request: SRFRequest, token: str):
+        try:
+            kid = jwt.get_unverified_header(token).get('kid')
+        except InvalidTokenError:
+            raise AuthenticationDenied('Invalid Token.')
+        key = await self.key_set.get_key(kid)
+        if key is None or key.algorithm_name not in self.algorithms:
+            raise AuthenticationDenied('Invalid Token.')
+        return key
+
+    def decode_token(self, token: str, token_secret):
+        """`token_secret` is the PyJWK of the `kid` of the token"""
+        return jwt.decode(
+            token, token_secret.key, algorithms=[token_secret.algorithm_name], audience=self.audience, issuer=self.issuer
+        )
@@ -9,8 +9,15 @@
 @ChangeHistory:
     datetime action why
     2022/6/8-10:50 [Create] backends.py
+    2026/10/20-01:20 [Change] 新增 dumps_text/loads_text，以文本形式缓存任意对象
+    2026/10/20-01:40 [Change] 新增 get_version/bump_version 版本令牌
 """
 
+import base64
+import pickle
+import uuid
+
+from rest_framework import metrics
 from rest_framework.settings import import_string, srf_settings
 
 DEFAULT_TIMEOUT = 300
@@ -18,8 +25,36 @@ CACHE_MAX_ENTRIES = 300
 DEFAULT_VERSION = 1
 
 
+def dumps_text(value):
+    """Pickles `value` into text, which every backend stores as it is (RedisCache decodes the values it reads)"""
+    return base64.b64encode(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)).decode()
+
+
+def loads_text(text):
+    return pickle.loads(base64.b64decode(text))
+
+
+async def get_version(cache, key, timeout):
+    """
+    The version token stored at `key`, part of the keys of the values it invalidates, created when missing.
+    Tokens are random so that a token evicted and created again never matches the keys built from the previous one.
+    """
+    version = await cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not await cache.add(key, version, timeout):
+            version = await cache.get(key, version)
+    return version
+
+
+async def bump_version(cache, key, timeout):
+    """Replaces the version token at `key`, the values of the keys built from the previous one are not read anymore"""
+    await cache.set(key, uuid.uuid4().hex, timeout)
+
+
 class BaseCache:
-    def __init__(self, timeout=DEFAULT_TIMEOUT, max_entries=CACHE_MAX_ENTRIES, key_prefix=None, **kwargs):
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_entries=CACHE_MAX_ENTRIES, key_prefix=None, alias='default', **kwargs):
+        self.alias = alias
         self.default_timeout = timeout
         self._max_entries = max_entries
         if key_prefix is None:
@@ -32,6 +67,10 @@ class BaseCache:
             version = DEFAULT_VERSION
         return "%s:%s:%s" % (self.key_prefix, version, key)
 
+    def record_lookup(self, hit):
+        """Count a get() as a hit or a miss of this alias in the metrics registry."""
+        metrics.record_cache_lookup(self.alias, hit)
+
     async def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
         """
         Set a value in the cache if the key does not already exist. If
@@ -79,25 +118,29 @@ class BaseCache:
 
 
 class CacheManager:
+    """
+    Creates the caches configured in `CACHES` on first use,
+    backends import this module so they can not be loaded while it is being imported.
+    """
+
     def __init__(self):
         self.caches = {}
-        for name, cache_config in srf_settings.CACHES.items():
-            backend = cache_config.pop('BACKEND', None)
-            options = cache_config.pop('OPTIONS', {})
-            cache_class = import_string(backend)
-            cache = cache_class(**options)
-            self.add_cache(name, cache)
 
     def __getitem__(self, name):
-        return self.caches[name]
+        return self.get_cache(name)
 
     def add_cache(self, name, cache):
         self.caches[name] = cache
 
+    def create_cache(self, name):
+        cache_config = srf_settings.CACHES[name]
+        cache_class = import_string(cache_config['BACKEND'])
+        return cache_class(alias=name, **cache_config.get('OPTIONS', {}))
+
     def get_cache(self, name):
+        if name not in self.caches:
+            self.add_cache(name, self.create_cache(name))
         return self.caches[name]
 
 
 cache_manager = CacheManager()
-
-cache = cache_manager.get_cache('default')
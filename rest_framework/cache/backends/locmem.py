@@ -9,6 +9,7 @@
 @ChangeHistory:
     datetime action why
     2022/6/8-11:06 [Create] locmem.py
+    2026/10/19-19:10 [Change] delete 未 await _delete，键从未被删除
 """
 import pickle
 import time
@@ -27,8 +28,12 @@ _locks = {}
 class LocMemCache(BaseCache):
     pickle_protocol = pickle.HIGHEST_PROTOCOL
 
-    def __init__(self, name, *args, **kwargs):
+    def __init__(self, name=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        if name is None:
+            name = self.alias
+        else:
+            self.alias = name
         self._cache = _caches.setdefault(name, OrderedDict())
         self._expire_info = _expire_info.setdefault(name, {})
         self._lock = _locks.setdefault(name, Lock())
@@ -49,9 +54,11 @@ class LocMemCache(BaseCache):
         async with self._lock:
             if self._has_expired(key):
                 await self._delete(key)
+                self.record_lookup(False)
                 return default
             pickled = self._cache[key]
             self._cache.move_to_end(key, last=False)
+        self.record_lookup(True)
         return pickle.loads(pickled)
 
     async def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
@@ -122,7 +129,7 @@ class LocMemCache(BaseCache):
     async def delete(self, key, version=None):
         key = self.make_cache_key(key, version=version)
         async with self._lock:
-            return self._delete(key)
+            return await self._delete(key)
 
     async def clear(self):
         async with self._lock:
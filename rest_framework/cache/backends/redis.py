@@ -26,6 +26,7 @@ class RedisCache(BaseCache):
     async def get(self, key, default=None, version=None):
         key = self.make_cache_key(key, version)
         value = await self.client.get(key)
+        self.record_lookup(value is not None)
         return value if value is not None else default
 
     async def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
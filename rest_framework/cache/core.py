@@ -9,22 +9,31 @@
 @ChangeHistory:
     datetime action why
     2022/6/8-17:51 [Create] core.py
+    2026/10/19-19:10 [Change] 在 request.ctx.api_cache 中记录缓存键，供压缩中间件缓存压缩结果
+    2026/10/19-20:10 [Change] 缓存前渲染延迟的响应体
+    2026/10/20-03:10 [Fix] 缓存键包含协商的渲染器与 pretty 参数，不同 Accept 的客户端不再共用响应
 """
 import hashlib
+from collections import namedtuple
 from functools import wraps
 
 from rest_framework.cache.backends import cache
+from rest_framework.response import JsonResponse, get_renderers, select_renderer, wants_pretty
 
+# Stored on `request.ctx.api_cache`, CompressionMiddleware caches the compressed body next to the response
+ApiCacheEntry = namedtuple('ApiCacheEntry', ['backend', 'key', 'timeout', 'hit'])
 
-def mark_key(module, path, method):
+
+def mark_key(module, path, method, *parts):
     path_hash = hashlib.md5(path.encode('utf8')).hexdigest()
-    return '.'.join([module, path_hash, method])
+    return '.'.join([module, path_hash, method, *parts])
 
 
 def api_cache(timeout, cache_backend=None, include_query=False):
     """
     cache the return value of the view, you can use a custom cache_backend.
-    If include_query is True, then the cached key will contain query_string
+    If include_query is True, then the cached key will contain query_string.
+    The key always contains the renderer negotiated from `Accept` and whether the body is indented (`?pretty=1`)
     @param timeout: In seconds
     @param cache_backend: Cache backend is based on BaseCache
     @param include_query: Does it include query_string?
@@ -40,10 +49,18 @@ def api_cache(timeout, cache_backend=None, include_query=False):
                 path = request.raw_url.decode('utf8')
             else:
                 path = request.path
-            key = mark_key(request.endpoint, path, request.method)
-            if await cache_backend.has_key(key):
+            # The rendered body depends on them, as the ETags of GenericAPIView.get_etag_parts do
+            renderer = select_renderer(request, get_renderers())
+            pretty = 'pretty' if wants_pretty(request) else 'compact'
+            key = mark_key(request.endpoint, path, request.method, renderer.media_type, pretty)
+            hit = await cache_backend.has_key(key)
+            request.ctx.api_cache = ApiCacheEntry(cache_backend, key, timeout, hit)
+            if hit:
                 return await cache_backend.get(key)
             rs = await func(view, request, *args, **kwargs)
+            if isinstance(rs, JsonResponse):
+                # Cache the rendered bytes, not the data of a deferred body
+                await rs.prepare()
             await cache_backend.set(key, rs, timeout)
             return rs
 
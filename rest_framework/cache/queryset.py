@@ -0,0 +1,151 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/20-01:00
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    queryset.py
+    查询集结果缓存，以编译后的 SQL(含参数)为键缓存查询结果，模型写入时按表失效
+@ChangeHistory:
+    datetime action why
+    2026/10/20-01:00 [Create] queryset.py
+"""
+import hashlib
+import re
+from functools import wraps
+
+from tortoise import Tortoise
+from tortoise.queryset import QuerySet
+
+from rest_framework.cache.backends.base import bump_version, cache_manager, dumps_text, get_version, loads_text
+from rest_framework.signals import connect_writes
+
+# The keys of the cached results hold a version of every table the query reads, a write changes the versions of its tables
+VERSION_TIMEOUT = 24 * 3600
+# Quoted identifiers of the compiled SQL, "table" (SQLite, PostgreSQL) or `table` (MySQL)
+IDENTIFIER_RE = re.compile(r'["`]([^"`]+)["`]')
+
+# CACHES aliases holding cached querysets, the versions of written tables are changed in all of them
+queryset_cache_aliases = set()
+_known_tables = [None, frozenset()]
+
+
+def get_model_tables(model):
+    """The table of `model` and the through tables of its many-to-many fields"""
+    meta = model._meta
+    return {meta.db_table, *(meta.fields_map[name].through for name in meta.m2m_fields)}
+
+
+def get_known_tables():
+    """The tables of the models registered in Tortoise"""
+    apps = Tortoise.apps
+    if _known_tables[0] is not apps:
+        tables = set()
+        for models in apps.values():
+            for model in models.values():
+                tables.update(get_model_tables(model))
+        _known_tables[:] = [apps, frozenset(tables)]
+    return _known_tables[1]
+
+
+def get_version_key(table):
+    return f"srf_qs_version:{table}"
+
+
+async def invalidate_querysets(model):
+    """Drops the cached results of the queries reading the tables of `model`"""
+    for alias in tuple(queryset_cache_aliases):
+        cache = cache_manager.get_cache(alias)
+        for table in get_model_tables(model):
+            await bump_version(cache, get_version_key(table), VERSION_TIMEOUT)
+
+
+async def on_model_written(model, request, saved, deleted, rebuild):
+    await invalidate_querysets(model)
+
+
+connect_writes(None, on_model_written)
+
+
+class CachedQuery:
+    """
+    Awaitable of a Tortoise query whose result is stored in the CACHES `alias` for `timeout` seconds,
+    keyed by the compiled SQL with its parameters and the versions of the tables it reads.
+    `shape` tells apart the results of queries compiled to the same SQL, e.g. `values_list()` with and without `flat`.
+    """
+
+    def __init__(self, query, alias, timeout, shape=''):
+        self.query = query
+        self.alias = alias
+        self.timeout = timeout
+        self.shape = shape
+        queryset_cache_aliases.add(alias)
+
+    def __await__(self):
+        return self.fetch().__await__()
+
+    def sql(self, **kwargs):
+        return self.query.sql(**kwargs)
+
+    async def get_cache_key(self, cache, sql):
+        tables = sorted(get_known_tables().intersection(IDENTIFIER_RE.findall(sql)))
+        versions = [await get_version(cache, get_version_key(table), VERSION_TIMEOUT) for table in tables]
+        connection = self.query.model._meta.default_connection or ''
+        digest = hashlib.md5('\0'.join([connection, self.shape, sql, *versions]).encode('utf8')).hexdigest()
+        return f"srf_qs:{digest}"
+
+    async def fetch(self):
+        cache = cache_manager.get_cache(self.alias)
+        key = await self.get_cache_key(cache, self.query.sql())
+        cached = await cache.get(key)
+        if cached is not None:
+            return loads_text(cached)
+        # Runs the query compiled by `sql()`, compiling a query twice loses the joins of its filters
+        result = await self.query._execute()
+        await cache.set(key, dumps_text(result), self.timeout)
+        return result
+
+
+class CachedQuerySet(CachedQuery):
+    """
+    QuerySet of `GenericAPIView.queryset_cache`, the querysets chained from it are cached ones as well.
+    Awaiting it, `get_or_none()`/`first()`/`get()`, `count()` (e.g. of the paginator), `values()` and `values_list()`
+    read through the cache. Other queries (`exists()`, `update()`, `delete()`...) run as they are,
+    and so do querysets with `prefetch_related()` since the prefetched tables are not part of their SQL.
+    """
+
+    def __init__(self, queryset, alias, timeout):
+        super().__init__(queryset, alias, timeout, 'single' if queryset._single else 'list')
+
+    def __getattr__(self, name):
+        attr = getattr(self.query, name)
+        if not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def method(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if isinstance(result, QuerySet):
+                return CachedQuerySet(result, self.alias, self.timeout)
+            return result
+
+        return method
+
+    async def __aiter__(self):
+        for item in await self:
+            yield item
+
+    async def fetch(self):
+        if self.query._prefetch_map or self.query._prefetch_queries:
+            return await self.query
+        return await super().fetch()
+
+    def count(self):
+        return CachedQuery(self.query.count(), self.alias, self.timeout, 'count')
+
+    def values(self, *args, **kwargs):
+        return CachedQuery(self.query.values(*args, **kwargs), self.alias, self.timeout, 'values')
+
+    def values_list(self, *fields, flat=False):
+        return CachedQuery(self.query.values_list(*fields, flat=flat), self.alias, self.timeout, f'values_list:{flat}')
@@ -0,0 +1,67 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-19:40
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    conditional.py
+    条件 GET 支持
+    make_etag      由若干部分(视图、查询参数、版本字段值等)计算强 ETag
+    body_etag      由已编码的响应体计算强 ETag
+    etag_matches   请求的 If-None-Match 是否与 ETag 匹配(弱比较)
+    not_modified   304 响应
+@ChangeHistory:
+    datetime action why
+    2026/10/19-19:40 [Create] conditional.py
+"""
+import hashlib
+
+from sanic.response import HTTPResponse
+
+from rest_framework.response import get_renderers
+from rest_framework.status import HttpStatus
+
+__all__ = ('make_etag', 'body_etag', 'parse_etags', 'etag_matches', 'not_modified')
+
+
+def _quote(digest):
+    return f'"{digest}"'
+
+
+def _strong(tag):
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+def make_etag(*parts):
+    """Strong ETag of `parts`, each part is hashed through its `str()`."""
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        hasher.update(str(part).encode())
+        hasher.update(b'\x00')
+    return _quote(hasher.hexdigest())
+
+
+def body_etag(body):
+    return _quote(hashlib.blake2b(body, digest_size=16).hexdigest())
+
+
+def parse_etags(header):
+    """Entity tags of an If-None-Match header with their weak prefix removed, `*` is kept as is."""
+    if not header:
+        return ()
+    return tuple(_strong(tag.strip()) for tag in header.split(',') if tag.strip())
+
+
+def etag_matches(request, etag):
+    """If-None-Match uses the weak comparison, `W/"x"` matches `"x"` (RFC 7232 3.2)."""
+    headers = getattr(request, 'headers', None)
+    tags = parse_etags(headers.get('if-none-match') if headers else None)
+    return '*' in tags or _strong(etag) in tags
+
+
+def not_modified(etag, headers=None):
+    headers = {**(headers or {}), 'ETag': etag}
+    if len(get_renderers()) > 1:
+        headers.setdefault('Vary', 'Accept')
+    return HTTPResponse(status=HttpStatus.HTTP_304_NOT_MODIFIED, headers=headers)
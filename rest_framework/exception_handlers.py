@@ -19,7 +19,7 @@ logger = logging.getLogger()
 
 
 async def catch_api_exc(request, exception):
-    return exception.response
+    return exception.get_response(request)
 
 
 async def catch_serializer_validation_exc(request, exception):
@@ -27,4 +27,4 @@ async def catch_serializer_validation_exc(request, exception):
         'message': 'Request validation error',
         'code': ResponseCode.FAIL_CODE,
         'data': exception.error_detail
-    })
+    }, request=request)
@@ -61,12 +61,15 @@ class APIException(Exception):
 
     @property
     def response(self):
+        return self.get_response()
+
+    def get_response(self, request=None):
         return JsonResponse({
             'code': self.code,
             'message': self.message,
             'data': self.data,
             **self.kwargs
-        }, status=self.status)
+        }, status=self.status, request=request)
 
 
 class PermissionDenied(APIException):
@@ -23,9 +23,10 @@ from sanic.log import logger
 from tortoise.exceptions import DoesNotExist
 
 from settings import TIMEZONE
+from rest_framework import querylog
 from rest_framework.exceptions import ValidationException
 from rest_framework.openapi3.types import Array, Boolean, Date, DateTime, Float, Integer, Schema, String, Time
-from rest_framework.utils import run_awaitable, run_awaitable_val
+from rest_framework.utils import run_awaitable
 from rest_framework.validators import BaseValidator, MaxLengthValidator, MaxValueValidator, MinLengthValidator, MinValueValidator
 
 REGEX_TYPE = type(re.compile(''))
@@ -304,8 +305,10 @@ class Field:
                     instance = getattr(instance, attr)
                     if callable(instance):
                         instance = await run_awaitable(instance)
-                    else:
-                        instance = await run_awaitable_val(instance)
+                    elif inspect.isawaitable(instance):
+                        # Unfetched relations query the database here, name the field in the query log
+                        with querylog.source(self):
+                            instance = await instance
             except (KeyError, AttributeError, DoesNotExist):
                 if self.default is not empty:
                     return self.get_default()
@@ -11,17 +11,120 @@
     datetime action why
     example:
     2021/3/10 17:25 change 'Fix bug'
+    2026/10/19-23:10 [Change] add is_empty_filter
+    2026/10/19-23:59 [Change] search_fields 按视图预编译为过滤计划, 按模型字段类型转换取值, 支持 __in
+    2026/10/20-00:20 [Change] 新增全文检索过滤后端 FullTextSearchFilter(SQLite FTS5 / PostgreSQL tsvector)
+    2026/10/20-00:40 [Change] 新增排序过滤后端 OrderingFilter, 白名单、多列排序、未建索引列的警告或拒绝及主键兜底排序
 """
 
+import datetime
+import decimal
+import logging
+import re
+import time
+import uuid
+import weakref
+from collections import namedtuple
+
+from pypika.terms import ValueWrapper
+from tortoise.expressions import RawSQL
 from tortoise.models import Q
+
 from rest_framework.constant import LOOKUP_SEP
+from rest_framework.exceptions import APIException
 from rest_framework.openapi3.definitions import Parameter
+from rest_framework.signals import connect_writes
+from rest_framework.status import HttpStatus
+
+logger = logging.getLogger(__name__)
+
+# A compiled search field: the ORM lookup, the function converting a query value and the type of the values
+FilterTerm = namedtuple('FilterTerm', ['lookup', 'coerce', 'value_type', 'many'])
+# A compiled ordering field: the ORM field, whether an index leads with it and whether its values are unique
+OrderingTerm = namedtuple('OrderingTerm', ['field', 'indexed', 'unique'])
+
+# Lookups comparing text, their values are not converted to the type of the field
+TEXT_LOOKUPS = {
+    'contains', 'icontains', 'startswith', 'istartswith', 'endswith', 'iendswith', 'iexact', 'search',
+}
+BOOLEAN_VALUES = {
+    '1': True, 'true': True, 'yes': True, 'on': True, 't': True, 'y': True,
+    '0': False, 'false': False, 'no': False, 'off': False, 'f': False, 'n': False,
+}
+
+
+def is_empty_filter(q):
+    """
+    Whether the Q object filters nothing, e.g. the filter of a request without any search field.
+    """
+    return not q.filters and all(is_empty_filter(child) for child in q.children)
+
+
+def to_bool(value):
+    return BOOLEAN_VALUES[value.lower()]
+
+
+def to_datetime(value):
+    """An ISO 8601 datetime, or a unix timestamp as rendered by JSON_DATETIME_FORMAT = 'timestamp'"""
+    try:
+        timestamp = float(value)
+    except ValueError:
+        return datetime.datetime.fromisoformat(value)
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+
+
+VALUE_COERCERS = {
+    bool: to_bool,
+    int: int,
+    float: float,
+    decimal.Decimal: decimal.Decimal,
+    datetime.datetime: to_datetime,
+    datetime.date: datetime.date.fromisoformat,
+    datetime.time: datetime.time.fromisoformat,
+    uuid.UUID: uuid.UUID,
+}
+
+
+def resolve_value_type(model, path):
+    """
+    (python type of the values, lookup suffix) of the ORM lookup `path` on `model`,
+    following the relations, e.g. 'author__age__gte' -> (int, 'gte'). The type is str when it is not known.
+    """
+    parts = path.split(LOOKUP_SEP)
+    field = None
+    for index, part in enumerate(parts):
+        fields_map = model._meta.fields_map if model is not None else {}
+        if part not in fields_map:
+            # Only the last part can be a lookup, a lookup on a relation compares its primary key
+            lookup = part if index == len(parts) - 1 and index else None
+            if lookup is None:
+                return str, None
+            break
+        field = fields_map[part]
+        model = getattr(field, 'related_model', None)
+    else:
+        lookup = None
+    if model is not None:
+        field = model._meta.pk
+    field_type = getattr(field, 'field_type', None)
+    if field_type is bool:
+        return bool, lookup
+    for value_type in VALUE_COERCERS:
+        # Enum fields are int or str enums, datetime is checked before date
+        if value_type is not bool and isinstance(field_type, type) and issubclass(field_type, value_type):
+            return value_type, lookup
+    return str, lookup
 
 
 class ORMAndFilter:
     """
     Query using AND logic.
     This class directly provides ORM filters.
+
+    A search field is `[prefix]<ORM lookup>[:<query parameter>]`, the parameter defaults to the lookup,
+    e.g. '>=price:min_price' filters `price__gte` with `?min_price=`. The search fields are compiled once
+    per view model into a plan, the values are converted to the type of the model field and a request only
+    handles the parameters it carries. An `__in` lookup takes repeated or comma separated values.
     """
 
     lookup_prefixes = {
@@ -34,6 +137,9 @@ class ORMAndFilter:
         '=': 'contains',
         '@': 'icontains',
     }
+    join_type = Q.AND
+    # {(filter class, model, search fields): plan}
+    _plans = {}
 
     def __init__(self, request, view):
         self.view = view
@@ -53,53 +159,80 @@ class ORMAndFilter:
         """
         Filter the incoming queryset based on defined search fields.
         """
-        orm_filters = []
         search_fields = self.get_search_fields()
         if not search_fields:
-            return Q(*orm_filters)
-        orm_filters.extend(Q(**self.construct_orm_filter(search_field)) for search_field in search_fields)
-        return Q(*orm_filters)
+            return Q()
+        plan = self.get_plan(get_view_model(self.view), search_fields)
+        args = self.request.args
+        orm_filters = []
+        for query_name in args:
+            for term in plan.get(query_name, ()):
+                value = self.get_filter_value(query_name, term)
+                if value is not None:
+                    orm_filters.append(Q(**{term.lookup: value}))
+        return Q(*orm_filters, join_type=self.join_type)
 
-    def dismantle_search_field(self, search_field):
+    @classmethod
+    def get_plan(cls, model, search_fields):
+        """{query parameter: (FilterTerm, ...)} of the search fields, compiled once"""
+        key = (cls, model, tuple(search_fields))
+        plan = cls._plans.get(key)
+        if plan is None:
+            plan = cls._plans[key] = cls.compile_plan(model, search_fields)
+        return plan
+
+    @classmethod
+    def compile_plan(cls, model, search_fields):
+        plan = {}
+        for search_field in search_fields:
+            field_name, lookup_suffix = cls.dismantle_search_field(search_field)
+            field_name, _, query_name = field_name.partition(':')
+            orm_lookup = LOOKUP_SEP.join([field_name, lookup_suffix]) if lookup_suffix else field_name
+            value_type, lookup = resolve_value_type(model, orm_lookup)
+            if lookup in TEXT_LOOKUPS:
+                value_type = str
+            elif lookup == 'isnull':
+                value_type = bool
+            term = FilterTerm(orm_lookup, VALUE_COERCERS.get(value_type, str), value_type, lookup == 'in')
+            plan.setdefault(query_name or field_name, []).append(term)
+        return {query_name: tuple(terms) for query_name, terms in plan.items()}
+
+    @classmethod
+    def dismantle_search_field(cls, search_field):
         """
         Disassemble search fields with special characters.
         """
-        for prefix, lookup in self.lookup_prefixes.items():
+        for prefix, lookup in cls.lookup_prefixes.items():
             if search_field.startswith(prefix):
                 return search_field[len(prefix) :], lookup
         return search_field, None
 
-    def construct_orm_filter(self, search_field):
+    def get_filter_value(self, field_name, term):
         """
-        Construct filter parameters suitable for ORM.
+        Get value from request based on field name, converted for the term, a list for `__in`.
+        None when an empty value is given to a field that is not text.
         """
-        field_name, lookup_suffix = self.dismantle_search_field(search_field)
-        query_name = field_name.split(':')[0] if ':' in field_name else field_name
-        args = self.request.args
-
-        if query_name not in args:
-            return {}
+        try:
+            if term.many:
+                values = self.request.args.getlist(field_name)
+                return [term.coerce(value) for value in ','.join(values).split(',') if value]
+            value = self.request.args.get(field_name, '')
+            if not value and term.value_type is not str:
+                return None
+            return term.coerce(value)
+        except (ValueError, KeyError, ArithmeticError):
+            raise APIException(f'Invalid value for the filter {field_name}.', status=HttpStatus.HTTP_400_BAD_REQUEST)
 
-        orm_lookup = LOOKUP_SEP.join([field_name, lookup_suffix]) if lookup_suffix else field_name
-        return {orm_lookup: self.get_filter_value(query_name)}
-
-    def get_filter_value(self, field_name):
-        """
-        Get value from request based on field name.
-        """
-        values = self.request.args.get(field_name, [])
-        return ''.join(values)
-
-    @staticmethod
-    def to_openapi(view):
+    @classmethod
+    def to_openapi(cls, view):
         parameters = []
         search_fields = getattr(view, 'search_fields', None)
         if search_fields is None:
             return parameters
 
-        for search_field in search_fields:
-            _, field_name = search_field.split(':')
-            parameters.append(Parameter.make(field_name, str, 'query', required=False))
+        for query_name, terms in cls.get_plan(get_view_model(view), search_fields).items():
+            value_type = str if terms[0].many or terms[0].value_type not in (bool, int, float) else terms[0].value_type
+            parameters.append(Parameter.make(query_name, value_type, 'query', required=False))
         return parameters
 
 
@@ -109,14 +242,329 @@ class ORMOrFilter(ORMAndFilter):
     This class directly provides ORM filters.
     """
 
+    join_type = Q.OR
+
+
+class FullTextSearchFilter:
+    """
+    Full-text search of `?search=` in the `search_fts_fields` of the view, the matches are ordered by rank.
+    Added to the `filter_backends` of the view, all the words of the search must match.
+
+    SQLite: an FTS5 table `<table>_fts` keyed by the integer primary key, created and filled on first use and
+    kept up to date by the writes of the mixins, ranked with bm25(). Only the `search_max_results` best matches are listed.
+    PostgreSQL: a generated tsvector column with a GIN index, created on first use, ranked with ts_rank().
+    `search_fts_config` is its text search configuration.
+    """
+
+    search_param = 'search'
+    search_max_results = 1000
+
+    def __init__(self, request, view):
+        self.view = view
+        self.request = request
+
+    @classmethod
+    def register_view(cls, view):
+        """Creates the index of the view when it is defined, it is then kept up to date by all the writes of the mixins"""
+        model = get_view_model(view)
+        fields = getattr(view, 'search_fts_fields', None)
+        if model is not None and fields:
+            get_fulltext_index(model, fields, getattr(view, 'search_fts_config', 'simple'))
+
+    def get_search_terms(self):
+        return re.findall(r'\w+', self.request.args.get(self.search_param, ''))
+
+    async def filter_queryset(self, queryset):
+        fields = getattr(self.view, 'search_fts_fields', None)
+        terms = self.get_search_terms()
+        if not fields or not terms:
+            return queryset
+        index = get_fulltext_index(queryset.model, fields, getattr(self.view, 'search_fts_config', 'simple'))
+        return await index.search(queryset, terms, self.search_max_results)
+
+    @classmethod
+    def to_openapi(cls, view):
+        if not getattr(view, 'search_fts_fields', None):
+            return []
+        return [Parameter.make(cls.search_param, str, 'query', required=False)]
+
+
+class FullTextIndex:
+    """
+    The full-text index of the text `fields` of `model`, on SQLite or PostgreSQL, see FullTextSearchFilter.
+    Writes that do not go through the mixins on SQLite need a `rebuild()`.
+    """
+
+    search_column = 'srf_search'
+
+    def __init__(self, model, fields, config='simple'):
+        self.model = model
+        self.fields = tuple(fields)
+        self.config = config
+        # Database clients on which the index is known to exist
+        self._ready = weakref.WeakSet()
+
+    # The names are read from the model meta, which is only complete once the ORM is initialised
     @property
-    def orm_filter(self):
-        """
-        Filter the incoming queryset based on defined search fields.
-        """
-        orm_filters = []
-        search_fields = self.get_search_fields()
-        if not search_fields:
-            return Q(*orm_filters)
-        orm_filters.extend(Q(**self.construct_orm_filter(search_field)) for search_field in search_fields)
-        return Q(*orm_filters, join_type=Q.OR)
+    def table(self):
+        return self.model._meta.db_table
+
+    @property
+    def pk_column(self):
+        return self.model._meta.db_pk_column
+
+    @property
+    def columns(self):
+        projection = self.model._meta.fields_db_projection
+        return tuple(projection.get(field, field) for field in self.fields)
+
+    @property
+    def fts_table(self):
+        return f'{self.table}_fts'
+
+    def quote(self, name):
+        quote_char = self.model._meta.db.query_class._builder().QUOTE_CHAR
+        return f'{quote_char}{name}{quote_char}'
+
+    @staticmethod
+    def literal(value):
+        return ValueWrapper(value).get_sql(secondary_quote_char="'")
+
+    @property
+    def dialect(self):
+        return self.model._meta.db.capabilities.dialect
+
+    async def ensure(self):
+        db = self.model._meta.db
+        # The client of a transaction wraps the client of the connection
+        client = getattr(db, '_parent', db)
+        if client not in self._ready:
+            await self.create(db)
+            self._ready.add(client)
+        return db
+
+    async def create(self, db):
+        quote = self.quote
+        if self.dialect == 'postgres':
+            document = " || ' ' || ".join(f"coalesce({quote(column)}, '')" for column in self.columns)
+            await db.execute_script(
+                f'ALTER TABLE {quote(self.table)} ADD COLUMN IF NOT EXISTS {quote(self.search_column)} tsvector '
+                f'GENERATED ALWAYS AS (to_tsvector({self.literal(self.config)}::regconfig, {document})) STORED; '
+                f'CREATE INDEX IF NOT EXISTS {quote(self.table + "_" + self.search_column)} '
+                f'ON {quote(self.table)} USING GIN ({quote(self.search_column)})'
+            )
+            return
+        if self.dialect != 'sqlite':
+            raise NotImplementedError(f'Full-text search is not supported on {self.dialect}')
+        exists = await db.execute_query_dict("SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", [self.fts_table])
+        if not exists:
+            await db.execute_script(f'CREATE VIRTUAL TABLE {quote(self.fts_table)} USING fts5({", ".join(map(quote, self.columns))})')
+            await self.fill(db)
+
+    async def fill(self, db, pks=None):
+        """Indexes the rows of `pks`, all the rows for None"""
+        quote = self.quote
+        columns = ', '.join(map(quote, self.columns))
+        sql = f'INSERT INTO {quote(self.fts_table)} (rowid, {columns}) SELECT {quote(self.pk_column)}, {columns} FROM {quote(self.table)}'
+        if pks is None:
+            await db.execute_query(sql)
+            return
+        for chunk in chunked(list(pks)):
+            await db.execute_query(f'{sql} WHERE {quote(self.pk_column)} IN ({", ".join("?" * len(chunk))})', chunk)
+
+    async def unindex(self, db, pks):
+        for chunk in chunked(list(pks)):
+            placeholders = ', '.join('?' * len(chunk))
+            await db.execute_query(f'DELETE FROM {self.quote(self.fts_table)} WHERE rowid IN ({placeholders})', chunk)
+
+    async def rebuild(self):
+        db = await self.ensure()
+        if self.dialect == 'sqlite':
+            await db.execute_query(f'DELETE FROM {self.quote(self.fts_table)}')
+            await self.fill(db)
+
+    async def on_write(self, request, saved, deleted, rebuild):
+        """Write listener of the model, the generated column of PostgreSQL is kept up to date by the database"""
+        if self.dialect != 'sqlite':
+            return
+        db = await self.ensure()
+        if rebuild:
+            await self.rebuild()
+            return
+        saved = [instance.pk for instance in saved]
+        await self.unindex(db, saved + list(deleted))
+        await self.fill(db, saved)
+
+    async def search(self, queryset, terms, max_results):
+        """`queryset` filtered on the rows matching all the `terms` and ordered by rank, best first"""
+        db = await self.ensure()
+        quote = self.quote
+        row = f'{quote(self.table)}.{quote(self.pk_column)}'
+        if self.dialect == 'postgres':
+            query = f'plainto_tsquery({self.literal(self.config)}::regconfig, {self.literal(" ".join(terms))})'
+            column = f'{quote(self.table)}.{quote(self.search_column)}'
+            queryset = queryset.annotate(srf_match=RawSQL(f'{column} @@ {query}'), srf_rank=RawSQL(f'ts_rank({column}, {query})'))
+            return queryset.filter(srf_match=True).order_by('-srf_rank', self.model._meta.pk_attr)
+
+        # Each word is an FTS5 string, the words are ANDed
+        match = ' '.join(f'"{term}"' for term in terms)
+        fts = quote(self.fts_table)
+        rows = await db.execute_query_dict(f'SELECT rowid FROM {fts} WHERE {fts} MATCH ? ORDER BY rank LIMIT ?', [match, max_results])
+        # The matches are found with the index first, only them are ranked again to order the queryset
+        rank = RawSQL(f'(SELECT bm25({fts}) FROM {fts} WHERE {fts}.rowid = {row} AND {fts} MATCH {self.literal(match)})')
+        queryset = queryset.filter(pk__in=[row['rowid'] for row in rows]).annotate(srf_rank=rank)
+        return queryset.order_by('srf_rank', self.model._meta.pk_attr)
+
+
+# {(model, fields, config): FullTextIndex}
+fulltext_indexes = {}
+
+
+def get_fulltext_index(model, fields, config='simple'):
+    key = (model, tuple(fields), config)
+    index = fulltext_indexes.get(key)
+    if index is None:
+        index = fulltext_indexes[key] = FullTextIndex(model, fields, config)
+        connect_writes(model, index.on_write)
+    return index
+
+
+def chunked(values, size=500):
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+class OrderingFilter:
+    """
+    Orders the rows by `?ordering=-price,title`, among the `ordering_fields` of the view, `ordering` is the default.
+    The primary key is added as the last column so pages do not overlap, a queryset already ordered
+    (e.g. by the rank of FullTextSearchFilter) is left as is without `?ordering=`.
+
+    A column that no index leads, on a table of more than `unindexed_ordering_threshold` rows, is logged
+    with `unindexed_ordering = 'warn'` or refused with 'refuse', None allows it. The rows are counted
+    at most once per `row_count_ttl` seconds.
+    """
+
+    ordering_param = 'ordering'
+    unindexed_ordering = 'warn'
+    unindexed_ordering_threshold = 10000
+    row_count_ttl = 300
+    # {(model, ordering fields): plan}
+    _plans = {}
+    # {model: (expiry, row count)}
+    _row_counts = {}
+    # (view class, field) already logged
+    _warned = set()
+
+    def __init__(self, request, view):
+        self.view = view
+        self.request = request
+
+    @classmethod
+    def get_plan(cls, model, ordering_fields):
+        """{field: OrderingTerm} of the ordering fields, compiled once"""
+        key = (model, tuple(ordering_fields))
+        plan = cls._plans.get(key)
+        if plan is None:
+            plan = cls._plans[key] = {field: cls.compile_term(model, field) for field in ordering_fields}
+        return plan
+
+    @classmethod
+    def compile_term(cls, model, field):
+        *relations, name = field.split(LOOKUP_SEP)
+        for relation in relations:
+            model = model._meta.fields_map[relation].related_model
+        meta = model._meta
+        model_field = meta.fields_map[name]
+        unique = bool(model_field.pk or model_field.unique) and not relations
+        return OrderingTerm(field, name in get_indexed_fields(model), unique)
+
+    def get_ordering(self, model):
+        """[(field, descending)] of the request, None without `?ordering=`"""
+        value = self.request.args.get(self.ordering_param)
+        if not value:
+            return None
+        plan = self.get_plan(model, getattr(self.view, 'ordering_fields', None) or ())
+        ordering, seen = [], set()
+        for item in value.split(','):
+            item = item.strip()
+            field = item.lstrip('-')
+            if not field or field in seen:
+                continue
+            if field not in plan:
+                allowed = ', '.join(plan) or 'none'
+                raise APIException(f'Can not order by {field}, allowed: {allowed}.', status=HttpStatus.HTTP_400_BAD_REQUEST)
+            seen.add(field)
+            ordering.append((field, item.startswith('-')))
+        return ordering or None
+
+    async def filter_queryset(self, queryset):
+        model = queryset.model
+        ordering = self.get_ordering(model)
+        if ordering is None:
+            if queryset._orderings:
+                return queryset
+            default = getattr(self.view, 'ordering', None) or ()
+            ordering = [(field.lstrip('-'), field.startswith('-')) for field in default]
+        else:
+            await self.check_indexes(model, ordering)
+
+        plan = self.get_plan(model, [field for field, _ in ordering])
+        pk_attr = model._meta.pk_attr
+        if not any(plan[field].unique for field, _ in ordering):
+            # Same direction as the last column, a single index scan can serve both
+            ordering.append((pk_attr, ordering[-1][1] if ordering else False))
+        return queryset.order_by(*(f'-{field}' if descending else field for field, descending in ordering))
+
+    async def check_indexes(self, model, ordering):
+        plan = self.get_plan(model, getattr(self.view, 'ordering_fields', None) or ())
+        unindexed = [field for field, _ in ordering if not plan[field].indexed]
+        if not unindexed or self.unindexed_ordering is None:
+            return
+        if await self.get_row_count(model) <= self.unindexed_ordering_threshold:
+            return
+        if self.unindexed_ordering == 'refuse':
+            raise APIException(
+                f'Can not order by {", ".join(unindexed)}, the column is not indexed.', status=HttpStatus.HTTP_400_BAD_REQUEST
+            )
+        for field in unindexed:
+            key = (type(self.view), field)
+            if key not in self._warned:
+                self._warned.add(key)
+                logger.warning('%s orders %s by %s, which is not indexed', type(self.view).__name__, model.__name__, field)
+
+    async def get_row_count(self, model):
+        expiry, count = self._row_counts.get(model, (0, 0))
+        now = time.monotonic()
+        if expiry <= now:
+            count = await model.all().count()
+            self._row_counts[model] = (now + self.row_count_ttl, count)
+        return count
+
+    @classmethod
+    def to_openapi(cls, view):
+        fields = getattr(view, 'ordering_fields', None)
+        if not fields:
+            return []
+        description = f'Comma separated fields, - for descending: {", ".join(fields)}'
+        return [Parameter.make(cls.ordering_param, str, 'query', required=False, description=description)]
+
+
+def get_indexed_fields(model):
+    """The fields leading an index of `model`: primary key, `index`, `unique`, `unique_together` and `Meta.indexes`"""
+    meta = model._meta
+    columns = {column: field for field, column in meta.fields_db_projection.items()}
+    indexed = {name for name, field in meta.fields_map.items() if field.pk or field.unique or getattr(field, 'index', False)}
+    for group in (*meta.unique_together, *meta.indexes):
+        fields = getattr(group, 'fields', group)
+        if fields:
+            indexed.add(columns.get(fields[0], fields[0]))
+    return indexed
+
+
+def get_view_model(view):
+    """The model of the queryset of the view, or of its model serializer"""
+    queryset = getattr(view, 'queryset', None)
+    if queryset is not None:
+        return getattr(queryset, 'model', None)
+    meta = getattr(getattr(view, 'serializer_class', None), 'Meta', None)
+    return getattr(meta, 'model', None)
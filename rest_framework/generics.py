@@ -1,9 +1,13 @@
 import logging
 import traceback
 
-from rest_framework import mixins
+from rest_framework import mixins, querylog, timing
+from rest_framework.cache.queryset import CachedQuerySet, queryset_cache_aliases
+from rest_framework.conditional import body_etag, etag_matches, make_etag, not_modified
 from rest_framework.exceptions import APIException
 from rest_framework.filters import ORMAndFilter
+from rest_framework.response import get_renderers, select_renderer, wants_pretty
+from rest_framework.settings import srf_settings
 from rest_framework.status import HttpStatus
 from rest_framework.views import APIView
 
@@ -32,10 +36,45 @@ class GenericAPIView(APIView):
     # 过滤器
     filter_class = ORMAndFilter
     search_fields = None
+    # 过滤后端, 依次以 backend(request, view).filter_queryset(queryset) 处理查询集, 如全文检索 FullTextSearchFilter
+    filter_backends = ()
+
+    # 同一形态的 SQL 在一次请求中重复超过该次数时记录 N+1 警告, 默认使用 QUERY_REPEAT_THRESHOLD
+    query_repeat_threshold = None
+
+    # 版本字段(如 updated_at、version)，设置后 retrieve/list 在序列化前由数据库中的版本计算 ETag,
+    # If-None-Match 匹配时直接返回 304; 未设置时 ETag 由渲染后的响应体计算
+    etag_field = None
+
+    # 查询集结果缓存(CACHES 别名)，GET/HEAD 请求的查询集以编译后的 SQL 为键缓存 queryset_cache_timeout 秒,
+    # 包括分页器的 count(); 经 ModelSerializer.save 或 Mixin 写入模型时失效，见 rest_framework.cache.queryset
+    queryset_cache = None
+    queryset_cache_timeout = 30
 
     def __init__(self, *args, **kwargs):
         super().__init__(args, kwargs)
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for backend in cls.filter_backends:
+            register_view = getattr(backend, 'register_view', None)
+            if register_view is not None:
+                register_view(cls)
+        if cls.queryset_cache is not None:
+            queryset_cache_aliases.add(cls.queryset_cache)
+
+    async def dispatch(self, request, *args, **kwargs):
+        """开启 QUERY_LOG_ENABLED 时记录本次请求执行的全部 SQL 到 self.query_log"""
+        if not srf_settings.QUERY_LOG_ENABLED:
+            return await super().dispatch(request, *args, **kwargs)
+        with querylog.QueryLog() as self.query_log:
+            response = await super().dispatch(request, *args, **kwargs)
+        threshold = self.query_repeat_threshold
+        if threshold is None:
+            threshold = srf_settings.QUERY_REPEAT_THRESHOLD
+        self.query_log.warn_repeated(threshold, name=f'{self.__class__.__name__}.{getattr(self, "action", request.method)}')
+        return response
+
     async def get_object(self):
         """
         返回视图显示的对象。
@@ -50,7 +89,8 @@ class GenericAPIView(APIView):
 
         filter_kwargs = {lookup_field: self.kwargs[lookup_field]}
         try:
-            obj = await queryset.get_or_none(**filter_kwargs)
+            with timing.phase('object'):
+                obj = await queryset.get_or_none(**filter_kwargs)
         except Exception as e:
             logger.error(traceback.format_exc())
             raise APIException(f'{",".join(e.args)}.', status=HttpStatus.HTTP_502_BAD_GATEWAY)
@@ -59,7 +99,8 @@ class GenericAPIView(APIView):
                 f'No data found with {lookup_field} -> {self.kwargs[lookup_field]}', status=HttpStatus.HTTP_200_OK)
 
         # May raise a permission denied
-        await self.check_object_permissions(self.request, obj)
+        with timing.phase('permission'):
+            await self.check_object_permissions(self.request, obj)
 
         return obj
 
@@ -69,9 +110,14 @@ class GenericAPIView(APIView):
             "或重写`get_queryset()`方法。"
             % self.__class__.__name__
         )
-        queryset = self.queryset
-        filter_orm = await self.filter_orm()
-        queryset = queryset.filter(filter_orm)
+        with timing.phase('queryset'):
+            queryset = self.queryset
+            filter_orm = await self.filter_orm()
+            queryset = queryset.filter(filter_orm)
+            for backend in self.filter_backends:
+                queryset = await backend(self.request, self).filter_queryset(queryset)
+        if self.queryset_cache is not None and self.request.method in ('GET', 'HEAD'):
+            queryset = CachedQuerySet(queryset, self.queryset_cache, self.queryset_cache_timeout)
         return queryset
 
     async def filter_orm(self):
@@ -137,6 +183,53 @@ class GenericAPIView(APIView):
         assert self.paginator is not None
         return await self.paginator.get_paginated_response(data)
 
+    def get_etag_parts(self):
+        """
+        影响响应内容但不在行数据中的部分: 视图、序列化器、协商的渲染器及查询参数。
+        响应内容随当前用户变化时，应覆盖此方法加入用户标识
+        """
+        request = self.request
+        renderer = select_renderer(request, get_renderers())
+        return (
+            self.__class__.__qualname__,
+            getattr(self, 'action', None),
+            getattr(self.serializer_class, '__qualname__', None),
+            renderer.media_type,
+            wants_pretty(request),
+            getattr(request, 'query_string', ''),
+        )
+
+    async def get_object_etag(self, instance):
+        """由 etag_field 计算的实例 ETag，未设置 etag_field 时返回 None"""
+        if self.etag_field is None or not srf_settings.ETAG_ENABLED:
+            return None
+        return make_etag(*self.get_etag_parts(), instance.pk, getattr(instance, self.etag_field))
+
+    async def get_list_etag(self, queryset):
+        """由列出行的主键及 etag_field 计算的列表 ETag，只查询这两列，未设置 etag_field 时返回 None"""
+        if self.etag_field is None or not srf_settings.ETAG_ENABLED:
+            return None
+        with timing.phase('etag'):
+            rows = await queryset.values_list(queryset.model._meta.pk_attr, self.etag_field)
+            page_parts = self.paginator.get_etag_parts() if self.paginator is not None else ()
+            return make_etag(*self.get_etag_parts(), *page_parts, rows)
+
+    async def conditional_response(self, response, etag=None):
+        """
+        为成功的响应设置 ETag(默认由响应体计算)，与 If-None-Match 匹配时返回不带响应体的 304
+        """
+        if not srf_settings.ETAG_ENABLED or response.status != HttpStatus.HTTP_200_OK:
+            return response
+        if etag is None:
+            await response.prepare()
+            with timing.phase('etag'):
+                etag = body_etag(response.body)
+        response.headers['ETag'] = etag
+        if etag_matches(self.request, etag):
+            vary = response.headers.get('vary')
+            return not_modified(etag, {'Vary': vary} if vary else None)
+        return response
+
 
 class CreateAPIView(mixins.CreateModelMixin,
                     GenericAPIView):
@@ -0,0 +1,126 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/20-02:00
+@DependencyLibrary:[PyJWT[crypto]]
+@MainFunction:None
+@FileDoc:
+    jwks.py
+    JWKS 公钥集合，从本地文件或 URL 加载，按 kid 缓存解析后的公钥，文件或文档变化时重新加载
+@ChangeHistory:
+    datetime action why
+    2026/10/20-02:00 [Create] jwks.py
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import urllib.request
+
+from jwt import PyJWKSet
+from jwt.algorithms import has_crypto
+from jwt.exceptions import PyJWKError, PyJWKSetError
+
+logger = logging.getLogger(__name__)
+
+# {source: JWKSet}
+key_sets = {}
+
+
+def get_key_set(source, **kwargs):
+    """The key set of `source`, shared by the authenticators verifying with it"""
+    if source not in key_sets:
+        key_sets[source] = JWKSet(source, **kwargs)
+    return key_sets[source]
+
+
+class JWKSet:
+    """
+    Public keys of a JWKS document, a local file or an http(s) URL, parsed once and kept by `kid`.
+    A file is read again when its modification time changed, looked at every `check_interval` seconds at most.
+    A URL is fetched again every `refresh_interval` seconds, and for an unknown `kid` every `check_interval` seconds
+    at most. `generation` is incremented whenever the keys change, a failed reload keeps the previous keys.
+    """
+
+    def __init__(self, source, refresh_interval=300, check_interval=5, timeout=10):
+        if not has_crypto:
+            raise ImportError('Verifying with a JWKS requires `cryptography`, install `PyJWT[crypto]`.')
+        self.source = source
+        self.is_url = source.startswith(('http://', 'https://'))
+        self.refresh_interval = refresh_interval
+        self.check_interval = check_interval
+        self.timeout = timeout
+        self.keys = {}
+        self.generation = 0
+        self._digest = None
+        self._mtime = None
+        self._checked = None
+        self._lock = None
+
+    async def refresh(self):
+        """Reloads the keys when the document is due to be looked at again"""
+        interval = self.refresh_interval if self.is_url else self.check_interval
+        if self._checked is None or time.monotonic() - self._checked >= interval:
+            await self.reload()
+
+    async def get_key(self, kid):
+        """The PyJWK of `kid`, the only key of the set for tokens without `kid`, None when it is unknown"""
+        await self.refresh()
+        key = self.find_key(kid)
+        if key is None and self.is_url and time.monotonic() - self._checked >= self.check_interval:
+            # A key rotated in since the last fetch
+            await self.reload()
+            key = self.find_key(kid)
+        return key
+
+    def find_key(self, kid):
+        if kid is None:
+            return next(iter(self.keys.values())) if len(self.keys) == 1 else None
+        return self.keys.get(kid)
+
+    async def reload(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        checked = self._checked
+        async with self._lock:
+            if self._checked != checked:
+                # Reloaded by a concurrent request
+                return
+            try:
+                document = await self.read()
+                if document is not None:
+                    self.load(document)
+            except (OSError, ValueError, PyJWKError, PyJWKSetError) as exc:
+                logger.error('Can not load the JWKS of %s: %r', self.source, exc)
+                # The file is read again at the next check
+                self._mtime = None
+            finally:
+                self._checked = time.monotonic()
+
+    async def read(self):
+        """The JWKS document, None when the file did not change"""
+        if self.is_url:
+            return await asyncio.to_thread(self.fetch)
+        mtime = os.stat(self.source).st_mtime_ns
+        if mtime == self._mtime:
+            return None
+        with open(self.source, 'rb') as file:
+            document = file.read()
+        self._mtime = mtime
+        return document
+
+    def fetch(self):
+        request = urllib.request.Request(self.source, headers={'Accept': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def load(self, document):
+        digest = hashlib.sha256(document).digest()
+        if digest == self._digest:
+            return
+        key_set = PyJWKSet.from_json(document.decode('utf8'))
+        # Encryption keys are not used to verify signatures
+        self.keys = {key.key_id: key for key in key_set.keys if key.public_key_use in (None, 'sig')}
+        self._digest = digest
+        self.generation += 1
@@ -0,0 +1,97 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-14:35
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    __init__.py
+    进程内指标
+    开启 `METRICS_ENABLED` 后自动记录请求数/耗时、各阶段耗时、限流拒绝、缓存命中及 SQL 数量,
+    通过 blueprint_factory() 生成的蓝图以 Prometheus 文本格式暴露
+@ChangeHistory:
+    datetime action why
+    2026/10/19-14:35 [Create] __init__.py
+"""
+from rest_framework.metrics.registry import Counter, Gauge, Histogram, MetricsRegistry, MultiProcessStore
+from rest_framework.settings import srf_settings
+from rest_framework.timing import BaseTimingSink, RequestTimer
+
+__all__ = (
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'MetricsRegistry',
+    'MultiProcessStore',
+    'MetricsTimingSink',
+    'registry',
+    'is_enabled',
+    'snapshot',
+    'render_prometheus',
+    'blueprint_factory',
+)
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter('srf_requests_total', 'Requests handled by SRF views.', ('view', 'action', 'method', 'status'))
+REQUEST_LATENCY = registry.histogram('srf_request_duration_seconds', 'Request latency of SRF views.', ('view', 'action'))
+PHASE_LATENCY = registry.histogram(
+    'srf_request_phase_duration_seconds', 'Duration of request phases (auth, serialize, render...).', ('view', 'action', 'phase')
+)
+DB_QUERIES = registry.counter('srf_db_queries_total', 'SQL statements executed while handling requests.', ('view', 'action'))
+THROTTLE_REJECTIONS = registry.counter('srf_throttle_rejections_total', 'Requests rejected by throttles.', ('view', 'throttle'))
+CACHE_REQUESTS = registry.counter('srf_cache_requests_total', 'Cache lookups by alias and result.', ('alias', 'result'))
+
+
+def is_enabled():
+    return srf_settings.METRICS_ENABLED
+
+
+class MetricsTimingSink(BaseTimingSink):
+    """Feeds finished request timers into the registry, added automatically when `METRICS_ENABLED` is set."""
+
+    def record(self, timer: RequestTimer):
+        view, action = timer.view_name, timer.action or ''
+        status = 500 if timer.status is None else timer.status
+        REQUESTS.inc(view=view, action=action, method=timer.method, status=status)
+        REQUEST_LATENCY.observe(timer.total, view=view, action=action)
+        for phase, duration in timer.phases.items():
+            PHASE_LATENCY.observe(duration, view=view, action=action, phase=phase)
+        if timer.queries:
+            DB_QUERIES.inc(timer.queries, view=view, action=action)
+
+
+def record_throttle_rejection(view, throttle):
+    if is_enabled():
+        THROTTLE_REJECTIONS.inc(view=view.__class__.__name__, throttle=throttle.__class__.__name__)
+
+
+def record_cache_lookup(alias, hit):
+    if is_enabled():
+        CACHE_REQUESTS.inc(alias=alias, result='hit' if hit else 'miss')
+
+
+def get_store():
+    directory = srf_settings.METRICS_MULTIPROCESS_DIR
+    if not directory:
+        return None
+    return MultiProcessStore(directory)
+
+
+def snapshot():
+    """
+    Snapshot of all workers when `METRICS_MULTIPROCESS_DIR` is set, otherwise of the current worker.
+    The current worker writes its own file first so its values are never stale.
+    """
+    store = get_store()
+    if store is None:
+        return registry.collect()
+    store.write(registry.collect())
+    return MetricsRegistry.merge(store.read_all())
+
+
+def render_prometheus():
+    return MetricsRegistry.to_prometheus(snapshot())
+
+
+from .blueprint import blueprint_factory  # noqa
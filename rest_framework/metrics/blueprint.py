@@ -0,0 +1,56 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-15:10
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    blueprint.py
+    指标抓取蓝图
+    app.blueprint(blueprint_factory())  ->  GET /metrics
+@ChangeHistory:
+    datetime action why
+    2026/10/19-15:10 [Create] blueprint.py
+"""
+import asyncio
+
+from sanic.blueprints import Blueprint
+from sanic.response import text
+
+from rest_framework.settings import srf_settings
+
+from . import get_store, registry, render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+async def flush_periodically(store, interval):
+    while True:
+        await asyncio.sleep(interval)
+        store.write(registry.collect())
+
+
+def blueprint_factory(url_prefix='/metrics'):
+    metrics_blueprint = Blueprint('metrics', url_prefix=url_prefix)
+
+    @metrics_blueprint.route('', strict_slashes=True)
+    async def scrape(request):
+        return text(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    @metrics_blueprint.listener('after_server_start')
+    async def start_flush(app, loop):
+        # Other workers only publish their values through the shared directory
+        store = get_store()
+        if store is not None:
+            app.ctx.srf_metrics_flush = loop.create_task(flush_periodically(store, srf_settings.METRICS_FLUSH_INTERVAL))
+
+    @metrics_blueprint.listener('before_server_stop')
+    async def stop_flush(app, loop):
+        task = getattr(app.ctx, 'srf_metrics_flush', None)
+        if task is not None:
+            task.cancel()
+        store = get_store()
+        if store is not None:
+            store.write(registry.collect())
+
+    return metrics_blueprint
@@ -0,0 +1,237 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-14:35
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    registry.py
+    进程内指标存储
+    Counter / Gauge / Histogram   指标类型，每个 worker 在事件循环线程内直接修改自己的字典，无需加锁
+    MetricsRegistry               指标注册表，负责快照、合并与 Prometheus 文本格式输出
+    MultiProcessStore             通过共享目录内的快照文件聚合多个 Sanic worker 的指标
+@ChangeHistory:
+    datetime action why
+    2026/10/19-14:35 [Create] registry.py
+"""
+import bisect
+import glob
+import json
+import os
+
+__all__ = ('Counter', 'Gauge', 'Histogram', 'MetricsRegistry', 'MultiProcessStore')
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _sample_value(self, value):
+        return value
+
+    def collect(self):
+        return {
+            'type': self.type,
+            'help': self.documentation,
+            'labelnames': list(self.labelnames),
+            'samples': [[list(key), self._sample_value(value)] for key, value in self._values.items()],
+        }
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            # [per-bucket counts (the last one is +Inf), sum]
+            entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def collect(self):
+        data = super().collect()
+        data['buckets'] = list(self.buckets)
+        return data
+
+    def _sample_value(self, value):
+        return {'counts': list(value[0]), 'sum': value[1]}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        assert metric.name not in self._metrics, f'Metric `{metric.name}` is already registered.'
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name):
+        return self._metrics[name]
+
+    def collect(self):
+        """Snapshot of this worker, a JSON compatible dict."""
+        return {name: metric.collect() for name, metric in self._metrics.items()}
+
+    @staticmethod
+    def merge(snapshots):
+        """Sum the samples of several snapshots, e.g. of every worker."""
+        merged = {}
+        for snapshot in snapshots:
+            for name, data in snapshot.items():
+                target = merged.get(name)
+                if target is None:
+                    target = merged[name] = {**data, 'samples': {}}
+                samples = target['samples']
+                for labels, value in data['samples']:
+                    key = tuple(labels)
+                    current = samples.get(key)
+                    if current is None:
+                        samples[key] = {'counts': list(value['counts']), 'sum': value['sum']} if isinstance(value, dict) else value
+                    elif isinstance(value, dict):
+                        current['counts'] = [a + b for a, b in zip(current['counts'], value['counts'])]
+                        current['sum'] += value['sum']
+                    else:
+                        samples[key] = current + value
+        for data in merged.values():
+            data['samples'] = [[list(key), value] for key, value in data['samples'].items()]
+        return merged
+
+    @staticmethod
+    def to_prometheus(snapshot):
+        """Render a snapshot in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for name, data in snapshot.items():
+            lines.append(f'# HELP {name} {_escape_help(data["help"])}')
+            lines.append(f'# TYPE {name} {data["type"]}')
+            labelnames = data['labelnames']
+            for labels, value in data['samples']:
+                pairs = list(zip(labelnames, labels))
+                if data['type'] != 'histogram':
+                    lines.append(f'{name}{_format_labels(pairs)} {_format_value(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip([*data['buckets'], '+Inf'], value['counts']):
+                    cumulative += count
+                    le = bound if isinstance(bound, str) else _format_value(bound)
+                    lines.append(f'{name}_bucket{_format_labels([*pairs, ("le", le)])} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(pairs)} {_format_value(value["sum"])}')
+                lines.append(f'{name}_count{_format_labels(pairs)} {cumulative}')
+        lines.append('')
+        return '\n'.join(lines)
+
+
+class MultiProcessStore:
+    """
+    Every worker writes its snapshot into `directory` as `srf-metrics-<pid>.json`,
+    a scrape merges the files of all workers.
+    Files of stopped workers are kept so counters do not go backwards, but their gauges are dropped.
+    """
+
+    file_format = 'srf-metrics-%s.json'
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, snapshot, pid=None):
+        pid = os.getpid() if pid is None else pid
+        path = os.path.join(self.directory, self.file_format % pid)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf8') as file:
+            json.dump(snapshot, file)
+        os.replace(tmp_path, path)
+
+    def read_all(self):
+        snapshots = []
+        prefix, suffix = self.file_format.split('%s')
+        for path in glob.glob(os.path.join(self.directory, self.file_format % '*')):
+            try:
+                with open(path, encoding='utf8') as file:
+                    snapshot = json.load(file)
+            except (OSError, ValueError):
+                continue
+            pid = os.path.basename(path)[len(prefix):-len(suffix)]
+            if not _pid_alive(pid):
+                snapshot = {name: data for name, data in snapshot.items() if data['type'] != 'gauge'}
+            snapshots.append(snapshot)
+        return snapshots
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape_help(text):
+    return text.replace('\\', r'\\').replace('\n', r'\n')
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if value == float('inf'):
+            return '+Inf'
+        return repr(value)
+    return str(value)
@@ -1,5 +1,30 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-19:10
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    middleware.py
+    BaseMiddleware         通过 MIDDLEWARE 设置注册的中间件基类
+    CompressionMiddleware  按 Accept-Encoding 协商 gzip/deflate 压缩响应体，
+                           小于 COMPRESSION_MIN_SIZE 的响应不压缩，大于 COMPRESSION_OFFLOAD_SIZE 的在线程池中压缩，
+                           api_cache 命中时复用缓存的压缩结果
+@ChangeHistory:
+    datetime action why
+    2026/10/19-19:10 [Change] 新增 CompressionMiddleware
+    2026/10/19-19:40 [Change] 压缩后的响应将强 ETag 改为弱 ETag
+"""
+import asyncio
+import gzip
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
 from sanic import Sanic
 
+from rest_framework.response import parse_accept
+from rest_framework.settings import srf_settings
+
 
 class BaseMiddleware:
 
@@ -13,3 +38,100 @@ class BaseMiddleware:
 
     async def handle_response(self, request, response):
         pass
+
+
+def gzip_compress(body, level):
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def deflate_compress(body, level):
+    return zlib.compress(body, level)
+
+
+class CompressionMiddleware(BaseMiddleware):
+    """
+    MIDDLEWARE = ['rest_framework.middleware.CompressionMiddleware']
+
+    Responses that are streamed, already encoded, not compressible by content type
+    or smaller than `COMPRESSION_MIN_SIZE` bytes are sent as they are.
+    """
+
+    encoders = {'gzip': gzip_compress, 'deflate': deflate_compress}
+    compressible_types = ('text/', 'application/json', 'application/javascript', 'application/xml', 'application/msgpack')
+
+    def __init__(self, sanic_app: Sanic):
+        super().__init__(sanic_app)
+        self._executor = None
+        sanic_app.register_listener(self.shutdown, 'after_server_stop')
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=srf_settings.COMPRESSION_WORKERS, thread_name_prefix='srf-compression')
+        return self._executor
+
+    async def shutdown(self, app, loop):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def select_encoding(self, request):
+        header = request.headers.get('accept-encoding')
+        if not header:
+            return None
+        for coding in parse_accept(header):
+            if coding in self.encoders:
+                return coding
+            if coding == '*':
+                return 'gzip'
+        return None
+
+    def should_compress(self, response):
+        body = getattr(response, 'body', None)
+        if not body or len(body) < srf_settings.COMPRESSION_MIN_SIZE:
+            return False
+        if response.status in (204, 206, 304) or 'content-encoding' in response.headers:
+            return False
+        content_type = response.content_type or ''
+        return content_type.startswith(self.compressible_types)
+
+    async def compress(self, body, encoding):
+        encoder, level = self.encoders[encoding], srf_settings.COMPRESSION_LEVEL
+        if len(body) < srf_settings.COMPRESSION_OFFLOAD_SIZE:
+            return encoder(body, level)
+        # zlib releases the GIL while compressing, large bodies do not block the event loop
+        return await asyncio.get_running_loop().run_in_executor(self.executor, encoder, body, level)
+
+    async def get_compressed(self, request, body, encoding):
+        """Compressed body, reused from the `api_cache` entry of the request when its response came from the cache."""
+        cached = getattr(getattr(request, 'ctx', None), 'api_cache', None)
+        if cached is None:
+            return await self.compress(body, encoding)
+        cache_key = f'{cached.key}:{encoding}'
+        if cached.hit:
+            compressed = await cached.backend.get(cache_key)
+            if compressed is not None:
+                return compressed
+        compressed = await self.compress(body, encoding)
+        await cached.backend.set(cache_key, compressed, cached.timeout)
+        if not cached.hit:
+            # The response was rendered again, bodies compressed from the previous one are stale
+            for other in self.encoders:
+                if other != encoding:
+                    await cached.backend.delete(f'{cached.key}:{other}')
+        return compressed
+
+    async def handle_response(self, request, response):
+        if not self.should_compress(response):
+            return
+        vary = response.headers.get('vary')
+        response.headers['vary'] = f'{vary}, Accept-Encoding' if vary else 'Accept-Encoding'
+        encoding = self.select_encoding(request)
+        if encoding is None:
+            return
+        response.body = await self.get_compressed(request, response.body, encoding)
+        response.headers['content-encoding'] = encoding
+        # The encoded bytes differ from the ones a strong ETag was computed from
+        etag = response.headers.get('etag')
+        if etag and not etag.startswith('W/'):
+            response.headers['etag'] = f'W/{etag}'
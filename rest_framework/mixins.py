@@ -11,32 +11,352 @@
     datetime action why
     example:
     2021/3/26 14:43 change 'Fix bug'
+    2026/10/19-19:40 [Change] list/retrieve 支持 ETag 与 If-None-Match(304)
+    2026/10/19-20:40 [Change] 使用 request.post_data 代替已弃用的 request.data
+    2026/10/19-21:10 [Change] CreateModelMixin 支持流式批量创建(stream_upload)
+    2026/10/19-22:10 [Change] 新增 BulkUpdateModelMixin 批量更新
+    2026/10/19-22:30 [Change] perform_update 可通过 serializer.changes 获得变更的字段
+    2026/10/19-22:50 [Change] unique_field 支持乐观模式(由唯一约束报错)与批量操作按批一次 IN 查询检查
+    2026/10/19-23:10 [Change] 新增 BulkDestroyModelMixin 批量删除, destroy 可不返回序列化数据
+    2026/10/19-23:30 [Change] TreeModelMixin 由数据库排序, 支持递归 CTE 查询子树及层数(?parent=&depth=)与流式响应
+    2026/10/19-23:50 [Change] TreeModelMixin 支持缓存构建的树(tree_cache), 由各 Mixin 的写操作增量修补
+    2026/10/20-00:20 [Change] 写操作后通过 signals.model_written 通知监听者(树缓存、全文索引)
+    2026/10/20-01:00 [Change] 未读取主键的批量删除同样通知监听者(rebuild)
+    2026/10/20-03:20 [Fix] unique_violation 要求违反的约束列与 unique_field 完全一致，MySQL 报告的索引名解析为列
 """
 
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from typing import List
-from rest_framework.exceptions import APIException
+
+import orjson
+from pypika import Table
+from tortoise.exceptions import IntegrityError
+
+from rest_framework.cache.backends.base import cache_manager
+from rest_framework.conditional import etag_matches, not_modified
+from rest_framework.exceptions import APIException, ValidationException
+from rest_framework.filters import get_view_model, is_empty_filter
 from rest_framework.paginations import ORMPageNumberPagination
+from rest_framework.response import JSONRenderer, get_renderers, select_renderer, stream_json, wants_pretty
+from rest_framework.serializers import BulkUpdateListSerializer
+from rest_framework.signals import connect_writes, has_write_listeners, model_written
+from rest_framework.status import HttpStatus, ResponseCode
+from rest_framework.utils import IntegrityErrorHandel
+
+__all__ = (
+    "ListModelMixin", "CreateModelMixin", "RetrieveModelMixin", "UpdateModelMixin", "BulkUpdateModelMixin", "DestroyModelMixin",
+    "BulkDestroyModelMixin"
+)
+
+
+def get_column(meta, name):
+    """Database column of the model field or column `name`"""
+    name = getattr(meta.fields_map.get(name), "source_field", None) or name
+    return meta.fields_db_projection.get(name, name)
+
+
+def get_unique_indexes(model):
+    """
+    {index name: columns} of the unique constraints of `model` as Tortoise names them when generating the schema,
+    how MySQL reports a violation: the column of a unique field, `PRIMARY`, and `uid_...` for `Meta.unique_together`.
+    """
+    meta = model._meta
+    indexes = {"PRIMARY": (get_column(meta, meta.pk_attr),)}
+    for name, column in meta.fields_db_projection.items():
+        if meta.fields_map[name].unique:
+            indexes.setdefault(column, (column,))
+    generator = meta.db.schema_generator(meta.db)
+    for fields in meta.unique_together or ():
+        names = [getattr(meta.fields_map.get(field), "source_field", None) or field for field in fields]
+        indexes[generator._generate_index_name("uid", model, names)] = tuple(get_column(meta, name) for name in names)
+    return indexes
 
-__all__ = ("ListModelMixin", "CreateModelMixin", "RetrieveModelMixin", "UpdateModelMixin", "DestroyModelMixin")
+
+# Serializes the reads and writes of a cached tree within the process
+tree_cache_locks = defaultdict(asyncio.Lock)
 
 
 class TreeModelMixin:
+    """
+    List a queryset as a tree, the children of every node are ordered by the database on `order_field`.
+
+    `?parent=<id>` lists the subtree below a node and `?depth=<n>` stops after n levels, the rows are found
+    with a recursive CTE. The children of the last level are not loaded and are `None`, the client loads them
+    lazily with `?parent=<id>&depth=<n>`. With `stream_tree` the JSON response is written node by node.
+
+    With `tree_cache` the encoded tree is kept in that cache and the requests without filters are answered from it.
+    The writes of the mixins on the same model patch the cached tree, it is built again when they can not.
+    """
     parent_field = "parent_id"
     children_field = "children"
     lookup_field = "id"
     order_field = "order"
     order_reverse = False
+    parent_query_param = "parent"
+    depth_query_param = "depth"
+    # Bounds `?depth=` and the recursion below `?parent=` without it
+    max_tree_depth = 100
+    stream_tree = False
+    # Alias in CACHES of the cache keeping the tree, the cached tree is shared by all the requests
+    # and is built from `get_tree_cache_queryset()`, which must not depend on the request
+    tree_cache = None
+    tree_cache_timeout = 300
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.register_tree_cache()
+
+    @classmethod
+    def register_tree_cache(cls, model=None):
+        """Patches the cached tree on the writes on its model, which is taken from `queryset` or the serializer"""
+        model = model or get_view_model(cls)
+        if cls.tree_cache is not None and model is not None:
+            connect_writes(model, cls.patch_tree_cache)
+
+    @classmethod
+    def get_tree_cache_key(cls):
+        return f"srf_tree:{cls.__module__}.{cls.__qualname__}"
 
     async def get(self, request, *args, **kwargs):
         return await self.tree(request, *args, **kwargs)
 
     async def tree(self, request, *args, **kwargs):
-        queryset = await self.get_queryset()
-        serializer = await self.get_serializer(queryset, many=True)
+        parent, depth = self.get_tree_params(request)
+        if self.tree_cache is not None and is_empty_filter(await self.filter_orm()):
+            tree_root = await self.get_cached_tree(parent, depth)
+            if tree_root is not None:
+                return self.tree_response(tree_root)
+        tree_root = await self.build_tree(await self.get_queryset(), parent, depth)
+        if depth is not None:
+            self.cut_tree(tree_root, depth)
+        return self.tree_response(tree_root)
+
+    async def build_tree(self, queryset, parent=None, depth=None):
+        """Roots of the tree of `queryset` below `parent`, `depth` levels deep"""
+        if parent is None and depth is None:
+            nodes = await self.order_tree_queryset(queryset)
+        else:
+            nodes = await queryset.model.raw(self.get_subtree_sql(queryset, parent, depth))
+        serializer = await self.get_serializer(nodes, many=True)
         data_list = await serializer.data
-        return self.success_json_response(data=await self.build_tree_structure(data_list))
+        if self.is_db_ordered(queryset.model):
+            return await self.link_tree_nodes(data_list)
+        return await self.build_tree_structure(data_list)
+
+    async def get_tree_cache_queryset(self):
+        """The rows of the cached tree, `queryset` without the filters of the request"""
+        return self.queryset.all()
+
+    async def get_cached_tree(self, parent=None, depth=None):
+        """
+        The cached tree below `parent`, cut after `depth` levels, the whole tree is built and cached when it is not.
+        None when `parent` is not in the tree.
+        """
+        cache = cache_manager.get_cache(self.tree_cache)
+        key = self.get_tree_cache_key()
+        async with tree_cache_locks[key]:
+            encoded = await cache.get(key)
+            if encoded is None:
+                queryset = await self.get_tree_cache_queryset()
+                self.register_tree_cache(queryset.model)
+                encoded = JSONRenderer().render(await self.build_tree(queryset)).decode()
+                await cache.set(key, encoded, self.tree_cache_timeout)
+        tree_root = orjson.loads(encoded)
+        if parent is not None:
+            node = self.index_tree(tree_root).get(str(parent))
+            if node is None:
+                return None
+            tree_root = node[0][self.children_field]
+        if depth is not None:
+            self.cut_tree(tree_root, depth)
+        return tree_root
 
-    async def build_tree_structure(self, data_list: List[dict]):
+    @classmethod
+    async def patch_tree_cache(cls, request, saved=(), deleted=(), rebuild=False):
+        """Patches the cached tree with `patch_tree`, the tree is dropped when it can not be patched"""
+        cache = cache_manager.get_cache(cls.tree_cache)
+        key = cls.get_tree_cache_key()
+        async with tree_cache_locks[key]:
+            encoded = await cache.get(key)
+            if encoded is None:
+                return
+            view = cls()
+            view.request = request
+            tree_root = orjson.loads(encoded)
+            if rebuild or not await view.patch_tree(tree_root, saved, deleted):
+                await cache.delete(key)
+                return
+            await cache.set(key, JSONRenderer().render(tree_root).decode(), cls.tree_cache_timeout)
+
+    def index_tree(self, tree_root):
+        """{str(lookup value): (node, list of the node and its siblings)} of all the nodes"""
+        index = {}
+        levels = [tree_root]
+        while levels:
+            siblings = levels.pop()
+            for node in siblings:
+                index[str(node[self.lookup_field])] = (node, siblings)
+                if node[self.children_field]:
+                    levels.append(node[self.children_field])
+        return index
+
+    def deletes_subtree(self, model):
+        """Whether deleting a node deletes its children, from the `on_delete` of the parent foreign key"""
+        meta = model._meta
+        for name in meta.fk_fields:
+            field = meta.fields_map[name]
+            if field.source_field == self.parent_field:
+                return field.on_delete == "CASCADE"
+        return False
+
+    def get_tree_sort_key(self, node):
+        fields = (self.lookup_field,) if self.order_field in (None, self.lookup_field) else (self.order_field, self.lookup_field)
+        return tuple(node[field] for field in fields)
+
+    def get_tree_position(self, siblings, node):
+        """Index of `node` in its ordered siblings"""
+        key = self.get_tree_sort_key(node)
+        for position, sibling in enumerate(siblings):
+            sibling_key = self.get_tree_sort_key(sibling)
+            if (sibling_key < key) if self.order_reverse else (sibling_key > key):
+                return position
+        return len(siblings)
+
+    async def patch_tree(self, tree_root, saved=(), deleted=()):
+        """
+        Applies writes to a built tree: the nodes of the `deleted` primary keys are removed with their subtree,
+        the `saved` instances are read and serialized again and placed below their parent, in order.
+        Returns False when the tree can not be patched and must be built again: a deleted node keeping
+        its children, a node leaving the rows of the tree with its children, a cycle.
+        """
+        index = self.index_tree(tree_root)
+        queryset = await self.get_tree_cache_queryset()
+        model = queryset.model
+
+        def forget(node):
+            index.pop(str(node[self.lookup_field]), None)
+            for child in node[self.children_field] or ():
+                forget(child)
+
+        def detach(node, siblings):
+            siblings.pop(next(position for position, sibling in enumerate(siblings) if sibling is node))
+
+        cascade = self.deletes_subtree(model)
+        for pk in deleted:
+            entry = index.get(str(pk))
+            if entry is None:
+                continue
+            if entry[0][self.children_field] and not cascade:
+                return False
+            detach(*entry)
+            forget(entry[0])
+
+        pks = [instance.pk for instance in saved]
+        if not pks:
+            return True
+        # Inside the transaction of the write, when there is one
+        rows = await queryset.filter(pk__in=pks).using_db(model._meta.db)
+        serializer = await self.get_serializer(rows, many=True)
+        items = {str(item[self.lookup_field]): item for item in await serializer.data}
+        for pk in map(str, pks):
+            entry = index.pop(pk, None)
+            children = []
+            if entry is not None:
+                detach(*entry)
+                children = entry[0][self.children_field]
+            elif any(str(root.get(self.parent_field)) == pk for root in tree_root):
+                # Roots whose parent was not in the tree move below the new node
+                return False
+            item = items.get(pk)
+            if item is None:
+                if children:
+                    return False
+                continue
+            item[self.children_field] = children
+            parent_id = item.get(self.parent_field)
+            parent = index.get(str(parent_id)) if parent_id else None
+            if parent is None:
+                siblings = tree_root
+            elif str(parent_id) in self.index_tree(children):
+                # Moved below one of its descendants
+                return False
+            else:
+                siblings = parent[0][self.children_field]
+            try:
+                position = self.get_tree_position(siblings, item)
+            except (KeyError, TypeError):
+                # The ordering is not serialized, or not comparable
+                return False
+            siblings.insert(position, item)
+            index[pk] = (item, siblings)
+        return True
+
+    def get_tree_params(self, request):
+        """(parent, depth) of the query string, None when they are not given"""
+        parent = request.args.get(self.parent_query_param)
+        depth = request.args.get(self.depth_query_param)
+        try:
+            if parent is not None:
+                parent = self.queryset.model._meta.pk.to_python_value(parent)
+            if depth is not None:
+                depth = int(depth)
+                if not 0 < depth <= self.max_tree_depth:
+                    raise ValueError(depth)
+        except (TypeError, ValueError):
+            raise APIException("Invalid tree parent or depth.", status=HttpStatus.HTTP_400_BAD_REQUEST)
+        return parent, depth
+
+    def is_db_ordered(self, model):
+        return self.order_field is None or self.order_field in model._meta.fields_map
+
+    def get_tree_ordering(self, model):
+        """order_by() arguments of the nodes"""
+        pk_attr = model._meta.pk_attr
+        fields = (pk_attr,) if self.order_field in (None, pk_attr) else (self.order_field, pk_attr)
+        return tuple(f"-{field}" if self.order_reverse else field for field in fields)
+
+    async def order_tree_queryset(self, queryset):
+        if not self.is_db_ordered(queryset.model):
+            return queryset
+        return queryset.order_by(*self.get_tree_ordering(queryset.model))
+
+    def get_subtree_sql(self, queryset, parent=None, depth=None):
+        """
+        SELECT of the rows of `queryset` in the subtree below `parent` (below the roots for None), `depth` levels deep,
+        ordered by `order_field`. The subtree is walked with a recursive CTE over the whole table.
+        """
+        model = queryset.model
+        meta = model._meta
+        quote_char = meta.db.query_class._builder().QUOTE_CHAR
+
+        def sql(term):
+            return term.get_sql(quote_char=quote_char, secondary_quote_char="'", with_namespace=True)
+
+        def quote(name):
+            return f"{quote_char}{name}{quote_char}"
+
+        table, tree, scoped = Table(meta.db_table), Table("srf_tree"), Table("srf_scoped")
+        pk, parent_column = meta.db_pk_column, get_column(meta, self.parent_field)
+        anchor = table.field(parent_column).isnull() if parent is None else table.field(parent_column) == meta.pk.to_db_value(parent, None)
+        limit = depth or self.max_tree_depth
+        ordering = ", ".join(
+            f"{sql(scoped.field(get_column(meta, field.lstrip('-'))))} {'DESC' if field.startswith('-') else 'ASC'}"
+            for field in self.get_tree_ordering(model)
+        )
+        return (
+            f"WITH RECURSIVE {quote('srf_tree')} ({quote(pk)}, {quote('srf_depth')}) AS ("
+            f"SELECT {sql(table.field(pk))}, 1 FROM {quote(meta.db_table)} WHERE {sql(anchor)} "
+            f"UNION ALL SELECT {sql(table.field(pk))}, {sql(tree.srf_depth)} + 1 FROM {quote(meta.db_table)} "
+            f"JOIN {quote('srf_tree')} ON {sql(table.field(parent_column) == tree.field(pk))} "
+            f"WHERE {sql(tree.srf_depth)} < {int(limit)}) "
+            f"SELECT {quote('srf_scoped')}.* FROM ({queryset.sql()}) AS {quote('srf_scoped')} "
+            f"JOIN {quote('srf_tree')} ON {sql(scoped.field(pk) == tree.field(pk))} ORDER BY {ordering}"
+        )
+
+    async def link_tree_nodes(self, data_list: List[dict]):
+        """Links the nodes to their parent, in the order of `data_list`, and returns the roots"""
         # Create a dictionary to store references with id as key and item as value
         item_dict = {item[self.lookup_field]: item for item in data_list}
         for item in item_dict.values():
@@ -53,16 +373,52 @@ class TreeModelMixin:
                 parent_item[self.children_field].append(item)
             else:
                 tree_root.append(item)
+        return tree_root
+
+    async def build_tree_structure(self, data_list: List[dict]):
+        tree_root = await self.link_tree_nodes(data_list)
 
         if self.order_field:
             # If an order field is specified, sort the children of each node
-            for item in item_dict.values():
+            for item in data_list:
                 item[self.children_field] = sorted(
                     item[self.children_field], key=lambda x: x[self.order_field], reverse=self.order_reverse
                 )
 
         return tree_root
 
+    def cut_tree(self, tree_root, depth):
+        """Marks the children of the nodes `depth` levels deep as not loaded"""
+        level = tree_root
+        for _ in range(depth - 1):
+            level = [child for item in level for child in item[self.children_field]]
+        for item in level:
+            item[self.children_field] = None
+
+    def iter_tree_json(self, nodes, renderer):
+        """Encoded fragments of a list of nodes, a node is encoded without its children"""
+        children_key = renderer.render(self.children_field)
+        yield b"["
+        for index, node in enumerate(nodes):
+            if index:
+                yield b","
+            children = node.get(self.children_field)
+            if not children:
+                yield renderer.render(node)
+                continue
+            head = renderer.render({key: value for key, value in node.items() if key != self.children_field})
+            yield head[:-1] + (b"," if len(head) > 2 else b"") + children_key + b":"
+            yield from self.iter_tree_json(children, renderer)
+            yield b"}"
+        yield b"]"
+
+    def tree_response(self, tree_root):
+        renderer = select_renderer(self.request, get_renderers())
+        if not self.stream_tree or not isinstance(renderer, JSONRenderer) or wants_pretty(self.request):
+            return self.success_json_response(data=tree_root)
+        body = {"data": tree_root, "message": "Request succeeded.", "code": ResponseCode.SUCCESS_CODE}
+        return stream_json(body, ("data",), self.iter_tree_json(tree_root, renderer))
+
 
 class ListModelMixin:
     """
@@ -78,12 +434,16 @@ class ListModelMixin:
         queryset = await self.get_queryset()
 
         page = await self.paginate_queryset(queryset)
+        etag = await self.get_list_etag(queryset if page is None else page)
+        if etag is not None and etag_matches(request, etag):
+            return not_modified(etag)
+
         if page is not None:
             serializer = await self.get_serializer(page, many=True)
-            return await self.get_paginated_response(await serializer.data)
+            return await self.conditional_response(await self.get_paginated_response(await serializer.data), etag)
 
         serializer = await self.get_serializer(queryset, many=True)
-        return self.success_json_response(data=await serializer.data)
+        return await self.conditional_response(self.success_json_response(data=await serializer.data), etag)
 
 
 class CreateModelMixin:
@@ -92,31 +452,70 @@ class CreateModelMixin:
     """
     unique_field = ()
     unique_error_msg = "The value {rt_msg} already exists."
+    # Write without the `exists()` query of `is_unique`, the unique constraints of `unique_field` in the database
+    # must exist, their IntegrityError is answered with `unique_error_msg`
+    unique_optimistic = False
+    # The body is a JSON array, created while it is received in batches of stream_batch_size (BULK_BATCH_SIZE)
+    stream_upload = False
+    stream_batch_size = None
+
+    @classmethod
+    def is_stream_action(cls, action):
+        return (action == "create" and cls.stream_upload) or super().is_stream_action(action)
 
     async def post(self, request, *args, **kwargs):
         return await self.create(request, *args, **kwargs)
 
     async def create(self, request, *args, **kwargs):
-        serializer = await self.get_serializer(data=request.data)
+        if self.stream_upload:
+            return await self.stream_create(request, *args, **kwargs)
+        serializer = await self.get_serializer(data=request.post_data)
         await serializer.is_valid(raise_exception=True)
-        await self.is_unique(serializer.validated_data)
-        await self.perform_create(serializer)
+        if self.unique_optimistic:
+            async with self.unique_violation(serializer.validated_data):
+                await self.perform_create(serializer)
+        else:
+            await self.is_unique(serializer.validated_data)
+            await self.perform_create(serializer)
+        await model_written(type(serializer.instance), request, saved=[serializer.instance])
         return self.success_json_response(data=await serializer.data)
 
-    async def is_unique(self, data, update_obj=None):
-        if not isinstance(self.unique_field, (list, tuple)) or not self.unique_field:
-            return None
-
+    def get_unique_fields(self):
+        """The fields of `unique_field`, their values are checked together"""
+        if not isinstance(self.unique_field, (list, tuple)):
+            return ()
+        fields = []
+        for field in self.unique_field:
+            fields.extend(field if isinstance(field, (list, tuple)) else (field,))
+        return tuple(fields)
+
+    def _unique_value(self, data, field, instance=None):
+        # Partial updates fall back on the current value of the instance, creates on the default of the field
+        if field in data:
+            return data[field]
+        if instance is not None:
+            return getattr(instance, field)
+        default = getattr(self.queryset.model._meta.fields_map.get(field), "default", None)
+        return default() if callable(default) else default
+
+    def _unique_lookup(self, data, instance=None):
         kws = {}
         rt_msg = ""
         for field in self.unique_field:
             if isinstance(field, (list, tuple)):
                 for i in field:
-                    kws[i] = data[i]
-                    rt_msg += f" {i}:{data[i]} "
+                    kws[i] = self._unique_value(data, i, instance)
+                    rt_msg += f" {i}:{kws[i]} "
             else:
-                kws[field] = data[field]
-                rt_msg += f" {field}:{data[field]}"
+                kws[field] = self._unique_value(data, field, instance)
+                rt_msg += f" {field}:{kws[field]}"
+        return kws, rt_msg
+
+    async def is_unique(self, data, update_obj=None):
+        if not isinstance(self.unique_field, (list, tuple)) or not self.unique_field:
+            return None
+
+        kws, rt_msg = self._unique_lookup(data, update_obj)
 
         checked = False
         if update_obj:
@@ -130,9 +529,92 @@ class CreateModelMixin:
                 raise APIException(self.unique_error_msg.format(rt_msg=rt_msg))
         return None
 
+    def get_unique_columns(self):
+        """Database columns of `unique_field`"""
+        meta = self.queryset.model._meta
+        columns = set()
+        for field in self.get_unique_fields():
+            columns.add(get_column(meta, field))
+        return columns
+
+    @asynccontextmanager
+    async def unique_violation(self, data=None, instance=None):
+        """
+        Answers the IntegrityError of a unique constraint on `unique_field` raised by the write in the block
+        with `unique_error_msg`, like `is_unique` does, naming the fields instead of the values without `data`.
+        Other integrity errors are raised as they are.
+        """
+        try:
+            yield
+        except IntegrityError as exc:
+            error = IntegrityErrorHandel(exc)
+            columns = self.get_unique_columns()
+            if not columns or not error.is_unique_violation:
+                raise
+            violated = error.fields
+            if not violated and error.index_name is not None:
+                violated = get_unique_indexes(self.queryset.model).get(error.index_name, ())
+            # Backends naming neither the columns nor a known index are trusted to report the constraint of `unique_field`
+            if violated and set(violated) != columns:
+                raise
+            if data is None:
+                rt_msg = " " + ", ".join(self.get_unique_fields())
+            else:
+                rt_msg = self._unique_lookup(data, instance)[1]
+            raise APIException(self.unique_error_msg.format(rt_msg=rt_msg)) from exc
+
+    async def check_unique_batch(self, rows, instances=None):
+        """
+        Checks `unique_field` for a batch of validated rows with a single `IN` query instead of one `exists()`
+        query per row. `instances` are the instances the rows update, if any, their stored values are left out.
+        A row taking the values of a stored row or of an earlier row of the batch gets {field: [unique_error_msg]}
+        for the fields of `unique_field`. Returns {index of the row: errors}.
+        """
+        fields = self.get_unique_fields()
+        if not fields or not rows:
+            return {}
+        instances = instances or [None] * len(rows)
+        lookups = [self._unique_lookup(row, instance) for row, instance in zip(rows, instances)]
+        keys = [tuple(kws.values()) for kws, _ in lookups]
+        # A superset of the matching rows when there are several fields, compared on the whole key below
+        filters = {f"{field}__in": list({key[i] for key in keys if key[i] is not None}) for i, field in enumerate(fields)}
+        model = self.queryset.model
+        # On the model rather than the queryset, for the connection of the transaction of `stream_create`
+        stored = await model.filter(**filters).values_list(model._meta.pk_attr, *fields)
+        # The rows being updated are compared with their new values, in the batch
+        updated = {instance.pk for instance in instances if instance is not None}
+        taken = {tuple(values[1:]) for values in stored if values[0] not in updated}
+
+        errors = {}
+        for index, (key, (_, rt_msg)) in enumerate(zip(keys, lookups)):
+            # NULLs never collide in a unique constraint
+            if None in key:
+                continue
+            if key in taken:
+                errors[index] = {field: [self.unique_error_msg.format(rt_msg=rt_msg)] for field in fields}
+            taken.add(key)
+        return errors
+
     async def perform_create(self, serializer):
         return await serializer.save()
 
+    async def stream_create(self, request, *args, **kwargs):
+        """
+        Bulk create from a streamed JSON array, memory is bounded by the batch size instead of the upload size.
+        `unique_field` is checked per batch with `check_unique_batch`, or left to the database constraints
+        with `unique_optimistic`. Responds with the number of created items.
+        """
+        serializer = await self.get_serializer(many=True)
+        count = await self.perform_stream_create(serializer, request.iter_json_array())
+        if count:
+            await model_written(serializer.child.Meta.model, request, rebuild=True)
+        return self.success_json_response(data={"count": count})
+
+    async def perform_stream_create(self, serializer, items):
+        check_batch = None if self.unique_optimistic or not self.get_unique_fields() else self.check_unique_batch
+        async with self.unique_violation():
+            return await serializer.stream_create(items, batch_size=self.stream_batch_size, check_batch=check_batch)
+
 
 class RetrieveModelMixin:
     detail = True
@@ -142,8 +624,12 @@ class RetrieveModelMixin:
 
     async def retrieve(self, request, *args, **kwargs):
         instance = await self.get_object()
+        etag = await self.get_object_etag(instance)
+        if etag is not None and etag_matches(request, etag):
+            return not_modified(etag)
+
         serializer = await self.get_serializer(instance)
-        return self.success_json_response(data=await serializer.data)
+        return await self.conditional_response(self.success_json_response(data=await serializer.data), etag)
 
 
 class UpdateModelMixin:
@@ -156,14 +642,21 @@ class UpdateModelMixin:
     async def update(self, request, *args, **kwargs):
         partial = kwargs.pop("partial", False)
         instance = await self.get_object()
-        serializer = await self.get_serializer(instance, data=request.data, partial=partial)
+        serializer = await self.get_serializer(instance, data=request.post_data, partial=partial)
         await serializer.is_valid(raise_exception=True)
-        if hasattr(self, "unique_field") and hasattr(self, "is_unique"):
-            await self.is_unique(serializer.validated_data, instance)
-        await self.perform_update(serializer)
+        if getattr(self, "unique_optimistic", False):
+            async with self.unique_violation(serializer.validated_data, instance):
+                await self.perform_update(serializer)
+        else:
+            if hasattr(self, "unique_field") and hasattr(self, "is_unique"):
+                await self.is_unique(serializer.validated_data, instance)
+            await self.perform_update(serializer)
+        if getattr(serializer, "changes", True):
+            await model_written(type(instance), request, saved=[instance])
         return self.success_json_response(data=await serializer.data)
 
     async def perform_update(self, serializer):
+        """`serializer.changes` holds {column: (current value, new value)}, only these columns are written"""
         return await serializer.save()
 
     async def partial_update(self, request, *args, **kwargs):
@@ -171,16 +664,112 @@ class UpdateModelMixin:
         return await self.update(request, *args, **kwargs)
 
 
+class BulkUpdateModelMixin:
+    """
+    Update many instances in one request, PUT/PATCH a JSON array of items carrying their `lookup_field` to the list route.
+    The items are looked up in `get_queryset()` with one query and written with `bulk_update`,
+    the validation errors of all the items are returned at once. Combined with `CreateModelMixin`,
+    `unique_field` is checked for all the items with `check_unique_batch`.
+    """
+    bulk_update_serializer_class = BulkUpdateListSerializer
+
+    async def bulk_update(self, request, *args, **kwargs):
+        partial = kwargs.pop("partial", False)
+        queryset = await self.get_queryset()
+        serializer = await self.get_bulk_update_serializer(queryset, data=request.post_data, partial=partial)
+        await serializer.is_valid(raise_exception=True)
+        await self.check_objects_permissions(request, serializer.matched)
+        if getattr(self, "unique_optimistic", False):
+            async with self.unique_violation():
+                await self.perform_bulk_update(serializer)
+        else:
+            if hasattr(self, "check_unique_batch"):
+                errors = await self.check_unique_batch(serializer.validated_data, serializer.matched)
+                if errors:
+                    raise ValidationException([errors.get(index, {}) for index in range(len(serializer.validated_data))])
+            await self.perform_bulk_update(serializer)
+        await model_written(queryset.model, request, saved=serializer.matched)
+        return self.success_json_response(data=await serializer.data)
+
+    async def partial_bulk_update(self, request, *args, **kwargs):
+        kwargs["partial"] = True
+        return await self.bulk_update(request, *args, **kwargs)
+
+    async def get_bulk_update_serializer(self, *args, **kwargs):
+        child = await self.get_serializer(*args, **kwargs)
+        return self.bulk_update_serializer_class(*args, child=child, context=child._context, lookup_field=self.lookup_field, **kwargs)
+
+    async def perform_bulk_update(self, serializer):
+        return await serializer.save()
+
+
 class DestroyModelMixin:
+    # Respond with the serialized instance, without it the instance is not serialized
+    destroy_return_data = True
+
     async def delete(self, request, *args, **kwargs):
         return await self.destroy(request, *args, **kwargs)
 
     async def destroy(self, request, *args, **kwargs):
         instance = await self.get_object()
-        serializer = await self.get_serializer(instance)
-        data = await serializer.data
+        data = None
+        if self.destroy_return_data:
+            serializer = await self.get_serializer(instance)
+            data = await serializer.data
+        pk = instance.pk
         await self.perform_destroy(instance)
+        await model_written(type(instance), request, deleted=[pk])
         return self.success_json_response(data=data)
 
     async def perform_destroy(self, instance):
         await instance.delete()
+
+
+class BulkDestroyModelMixin:
+    """
+    Delete many instances in one request with a single `DELETE ... WHERE`, DELETE to the list route.
+    The body is a JSON array of `lookup_field` values, without a body the rows matched by `filter_class`
+    in the query string are deleted, a request matching neither is refused.
+    The rows are only fetched when a permission checks objects, once for all of them with `check_objects_permissions`,
+    their primary keys are read first when the model has write listeners (`rest_framework.signals`).
+    Responds with {"count": deleted rows}, and their primary keys as "ids" with `bulk_destroy_return_ids`.
+    """
+    bulk_destroy_return_ids = False
+
+    async def bulk_destroy(self, request, *args, **kwargs):
+        queryset = await self.get_bulk_destroy_queryset(request)
+        ids = None
+        if self.checks_object_permissions():
+            instances = await queryset
+            await self.check_objects_permissions(request, instances)
+            ids = [instance.pk for instance in instances]
+        elif self.bulk_destroy_return_ids or has_write_listeners(queryset.model):
+            # The write listeners of the model, e.g. cached trees, are given the deleted rows
+            ids = await queryset.values_list(queryset.model._meta.pk_attr, flat=True)
+        if ids is not None:
+            # Only the rows that were checked or reported are deleted
+            queryset = queryset.model.filter(pk__in=ids)
+        count = await self.perform_bulk_destroy(queryset)
+        if ids:
+            await model_written(queryset.model, request, deleted=ids)
+        elif ids is None and count:
+            await model_written(queryset.model, request, rebuild=True)
+        data = {"count": count}
+        if self.bulk_destroy_return_ids:
+            data["ids"] = ids
+        return self.success_json_response(data=data)
+
+    async def get_bulk_destroy_queryset(self, request):
+        lookups = request.post_data
+        if isinstance(lookups, list):
+            if not lookups or not all(isinstance(value, (str, int)) for value in lookups):
+                raise APIException("A list of lookup values is expected.", status=HttpStatus.HTTP_400_BAD_REQUEST)
+            queryset = await self.get_queryset()
+            return queryset.filter(**{f"{self.lookup_field}__in": lookups})
+        if lookups or is_empty_filter(await self.filter_orm()):
+            raise APIException("A list of lookup values or a filter is expected.", status=HttpStatus.HTTP_400_BAD_REQUEST)
+        return await self.get_queryset()
+
+    async def perform_bulk_destroy(self, queryset):
+        """Deletes the rows of `queryset` and returns their count"""
+        return await queryset.delete()
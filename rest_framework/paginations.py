@@ -11,10 +11,12 @@
     datetime action why
     example:
     2021/3/11 17:37 change 'Fix bug'
+    2026/10/19-19:40 [Change] get_etag_parts: 列表 ETag 需要的分页元数据
 """
 
 from math import ceil
 
+from rest_framework import timing
 from rest_framework.exceptions import APIException
 
 # from srf.openapi.openapi import Parameter, Parameters
@@ -42,6 +44,10 @@ class BasePagination:
     async def get_paginated_response(self, data):
         pass
 
+    def get_etag_parts(self):
+        """Page metadata that is rendered but not derivable from the rows of the page, part of list ETags."""
+        return ()
+
 
 class ORMPageNumberPagination(BasePagination):
     page_size = 20
@@ -99,13 +105,17 @@ class ORMPageNumberPagination(BasePagination):
 
     async def paginate_queryset(self, queryset, request, view=None):
         """Return queryset"""
-        self.__total_count = await self.get_total_count(queryset)
+        with timing.phase('count'):
+            self.__total_count = await self.get_total_count(queryset)
         self.__page = self.get_query_page(request)
         self.__page_size = self.get_query_page_size(request)
         self.__total_pages = await self.get_total_pages()
         offset = (self.__page - 1) * self.__page_size
         return queryset.limit(self.__page_size).offset(offset)
 
+    def get_etag_parts(self):
+        return self.__page, self.__page_size, self.__total_count
+
     async def get_paginated_response(self, data):
         return JsonResponse(
             {
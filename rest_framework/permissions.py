@@ -11,12 +11,19 @@
     datetime action why
     example:
     2021/4/25 16:51 change 'Fix bug'
+    2026/10/19-23:10 [Change] 新增 has_objects_permission 批量检查对象权限
+    2026/10/20-01:40 [Change] 缓存用户权限集合(版本失效)，ViewMapPermission 按视图类预编译权限映射并补上缺失的 await
 """
 
 from tortoise import fields
 
+from rest_framework.cache.backends.base import bump_version, cache_manager, dumps_text, get_version, loads_text
 from rest_framework.constant import ALL_METHOD, BoolEnum
 from rest_framework.exceptions import APIException, PermissionDenied
+from rest_framework.settings import srf_settings
+
+PERMISSIONS_VERSION_KEY = 'srf_perms_version'
+PERMISSIONS_VERSION_TIMEOUT = 24 * 3600
 
 
 class BasePermission:
@@ -26,23 +33,93 @@ class BasePermission:
     async def has_object_permission(self, request, view, obj):
         pass
 
+    async def has_objects_permission(self, request, view, objs):
+        """
+        批量操作时检查一组对象, 默认逐个调用 has_object_permission,
+        可重写为一次查询检查全部对象
+        """
+        for obj in objs:
+            await self.has_object_permission(request, view, obj)
+
 
 class UserModelMixin:
     async def has_permissions(self, codes):
         raise NotImplementedError()
 
+    async def get_permissions(self):
+        """
+        All the permission codes of the user, which are then resolved once and checked in memory,
+        see `get_user_permissions()`. None checks the codes with `has_permissions()` on every request.
+        """
+        return None
+
     is_superuser = fields.IntEnumField(
         BoolEnum, default=BoolEnum.FALSE, description="是否为超级用户"
     )
 
 
+def get_permissions_key(version, user_pk):
+    return f"srf_perms:{version}:{user_pk}"
+
+
+async def get_user_permissions(request):
+    """
+    The permission codes of `request.user` as a frozenset, from its `get_permissions()` once per request and
+    kept in the CACHES `PERMISSION_CACHE` for `PERMISSION_CACHE_TIMEOUT` seconds, see `invalidate_permissions()`.
+    None when the user does not list its permissions.
+    """
+    if hasattr(request.ctx, 'srf_permissions'):
+        return request.ctx.srf_permissions
+    user = request.user
+    get_permissions = getattr(user, 'get_permissions', None)
+    user_pk = getattr(user, 'pk', None)
+    permissions = cache = key = None
+    if get_permissions is not None and srf_settings.PERMISSION_CACHE is not None and user_pk is not None:
+        cache = cache_manager.get_cache(srf_settings.PERMISSION_CACHE)
+        key = get_permissions_key(await get_version(cache, PERMISSIONS_VERSION_KEY, PERMISSIONS_VERSION_TIMEOUT), user_pk)
+        cached = await cache.get(key)
+        if cached is not None:
+            permissions = loads_text(cached)
+    if permissions is None and get_permissions is not None:
+        codes = await get_permissions()
+        if codes is not None:
+            permissions = frozenset(codes)
+            if cache is not None:
+                await cache.set(key, dumps_text(permissions), srf_settings.PERMISSION_CACHE_TIMEOUT)
+    request.ctx.srf_permissions = permissions
+    return permissions
+
+
+async def invalidate_permissions(user_pk=None):
+    """
+    Drops the cached permissions of a user, after a change of its roles,
+    or of all the users without `user_pk`, e.g. after a change of the permissions of a role
+    """
+    if srf_settings.PERMISSION_CACHE is None:
+        return
+    cache = cache_manager.get_cache(srf_settings.PERMISSION_CACHE)
+    if user_pk is None:
+        await bump_version(cache, PERMISSIONS_VERSION_KEY, PERMISSIONS_VERSION_TIMEOUT)
+    else:
+        version = await get_version(cache, PERMISSIONS_VERSION_KEY, PERMISSIONS_VERSION_TIMEOUT)
+        await cache.delete(get_permissions_key(version, user_pk))
+
+
+async def user_has_permissions(request, codes):
+    """Whether `request.user` has all the `codes`, checked in the set of `get_user_permissions()` when it has one"""
+    permissions = await get_user_permissions(request)
+    if permissions is None:
+        return await request.user.has_permissions(list(codes))
+    return permissions.issuperset(codes)
+
+
 class CodePermission(BasePermission):
     async def has_permission(self, request, view):
         permission_code = getattr(view, "permission_code", None)
         if permission_code is None:
             return False
 
-        if not await request.user.has_permissions([permission_code]):
+        if not await user_has_permissions(request, (permission_code,)):
             raise PermissionDenied()
         return True
 
@@ -63,24 +140,27 @@ class ViewMapPermission(BasePermission):
 
     Note, request.user must need `has_permissions(codes)` method
     """
+    # {(permission class, view class): {method: frozenset of the codes required, `all` included}}
+    compiled_maps = {}
 
     def get_permission_map(self, view):
-        permission_map = self.permission_map
-        if hasattr(view, "permission_map"):
-            permission_map.update(view.permission_map)
+        """The permission map of the view merged into `permission_map`, compiled once per view class"""
+        key = (type(self), type(view))
+        permission_map = self.compiled_maps.get(key)
+        if permission_map is None:
+            declared = self.permission_map
+            declared.update(getattr(view, "permission_map", {}))
+            required = frozenset(declared.get("all", ()))
+            permission_map = {method: frozenset(codes) | required for method, codes in declared.items()}
+            self.compiled_maps[key] = permission_map
         return permission_map
 
     async def has_permission(self, request, view):
         permission_map = self.get_permission_map(view)
-        all_permissions = permission_map.get("all")
-        method = request.method.lower()
-        method_permission = permission_map.get(method)
-        permissions = (*method_permission, *all_permissions)
-        if not request.user.has_permissions(permissions):
+        permissions = permission_map.get(request.method.lower(), permission_map["all"])
+        if permissions and not await user_has_permissions(request, permissions):
             raise PermissionDenied()
-
-    async def has_object_permission(self, request, view, obj):
-        pass
+        return True
 
     @property
     def permission_map(self):
@@ -101,7 +181,7 @@ def verify_prem(permissions: list, exception: APIException = None):
 
     def set_fun(func):
         async def call_fun(view, request, *args, **kwargs):
-            if not await request.user.has_permissions(permissions):
+            if not await user_has_permissions(request, permissions):
                 raise exception
             return await func(view, request, *args, **kwargs)
 
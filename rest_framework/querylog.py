@@ -0,0 +1,237 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-14:20
+@DependencyLibrary:[tortoise-orm]
+@MainFunction:None
+@FileDoc:
+    querylog.py
+    Tortoise ORM SQL 执行钩子
+    install            包装已加载的数据库客户端的 execute_* 方法
+    add_listener       注册监听器，每条 SQL 执行完成后以 (sql, values, duration) 调用
+    QueryLog           请求级 SQL 记录，统计并计时每条 SQL，检测 N+1 查询
+    assert_num_queries 测试辅助，断言代码块内执行的 SQL 数量
+@ChangeHistory:
+    datetime action why
+    2026/10/19-14:20 [Create] querylog.py
+    2026/10/19-16:05 [Change] 请求级 QueryLog、N+1 检测与 assert_num_queries
+"""
+import functools
+import logging
+import re
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+__all__ = ('install', 'add_listener', 'remove_listener', 'QueryLog', 'source', 'normalize_sql', 'assert_num_queries')
+
+logger = logging.getLogger(__name__)
+
+EXECUTE_METHODS = ('execute_insert', 'execute_many', 'execute_query', 'execute_query_dict', 'execute_script')
+
+_listeners = []
+# A client method that delegates to another wrapped method must only be reported once
+_executing: ContextVar = ContextVar('srf_query_executing', default=False)
+_current_log: ContextVar = ContextVar('srf_query_log', default=None)
+_current_source: ContextVar = ContextVar('srf_query_source', default=None)
+
+QueryRecord = namedtuple('QueryRecord', ['sql', 'values', 'duration', 'source'])
+
+_SQL_STRING = re.compile(r"'(?:[^']|'')*'")
+_SQL_PLACEHOLDER = re.compile(r'\$\d+|%s|\?')
+_SQL_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SQL_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_SQL_SPACES = re.compile(r'\s+')
+
+
+def add_listener(listener):
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _wrap(method):
+    @functools.wraps(method)
+    async def wrapper(self, query, *args, **kwargs):
+        if not _listeners or _executing.get():
+            return await method(self, query, *args, **kwargs)
+        token = _executing.set(True)
+        started = time.perf_counter()
+        try:
+            return await method(self, query, *args, **kwargs)
+        finally:
+            duration = time.perf_counter() - started
+            _executing.reset(token)
+            values = args[0] if args else kwargs.get('values')
+            for listener in _listeners:
+                listener(query, values, duration)
+
+    wrapper._srf_wrapped = True
+    return wrapper
+
+
+def _client_classes(cls=BaseDBAsyncClient):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _client_classes(subclass)
+
+
+def install():
+    """
+    Wrap the execute methods of every loaded database client class.
+    Clients are imported by `Tortoise.init`, so call this afterwards; it is idempotent
+    and can be called again when another backend has been loaded.
+    """
+    for cls in _client_classes():
+        for name in EXECUTE_METHODS:
+            method = cls.__dict__.get(name)
+            if method is None or getattr(method, '_srf_wrapped', False):
+                continue
+            setattr(cls, name, _wrap(method))
+
+
+def normalize_sql(sql):
+    """
+    Reduce a statement to its shape, literals and placeholders become `?` and IN lists collapse.
+        SELECT * FROM "book" WHERE "author_id"=3 AND "id" IN (1,2)  ->  SELECT * FROM "book" WHERE "author_id"=? AND "id" IN (...)
+    """
+    sql = _SQL_STRING.sub('?', sql)
+    sql = _SQL_PLACEHOLDER.sub('?', sql)
+    sql = _SQL_NUMBER.sub('?', sql)
+    sql = _SQL_IN_LIST.sub('IN (...)', sql)
+    return _SQL_SPACES.sub(' ', sql).strip()
+
+
+def field_label(field):
+    """`SerializerName.field_name` of a bound serializer field."""
+    parent = getattr(field, 'parent', None)
+    field_name = getattr(field, 'field_name', None)
+    if parent is None or not field_name:
+        return field.__class__.__name__
+    return f'{parent.__class__.__name__}.{field_name}'
+
+
+class _NullSource:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SOURCE = _NullSource()
+
+
+class _Source:
+    __slots__ = ('field', 'token')
+
+    def __init__(self, field):
+        self.field = field
+        self.token = None
+
+    def __enter__(self):
+        self.token = _current_source.set(field_label(self.field))
+        return self
+
+    def __exit__(self, *exc_info):
+        _current_source.reset(self.token)
+        return False
+
+
+def source(field):
+    """Attribute the queries run inside the block to a serializer field, only while a QueryLog is active."""
+    if _current_log.get() is None:
+        return NULL_SOURCE
+    return _Source(field)
+
+
+def _record(sql, values, duration):
+    log = _current_log.get()
+    if log is None:
+        return
+    record = QueryRecord(sql, values, duration, _current_source.get())
+    while log is not None:
+        log.queries.append(record)
+        log = log.parent
+
+
+class QueryLog:
+    """
+    Records every SQL statement executed inside the block, nested logs also report to their parents.
+
+    example:
+        with QueryLog() as log:
+            await Book.all()
+        len(log), log.duration, log.repeated(10)
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.parent = None
+        self._token = None
+
+    def __enter__(self):
+        install()
+        add_listener(_record)
+        self.parent = _current_log.get()
+        self._token = _current_log.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _current_log.reset(self._token)
+        return False
+
+    def __len__(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(record.duration for record in self.queries)
+
+    def repeated(self, threshold):
+        """
+        Statement shapes executed more than `threshold` times.
+
+        Returns:
+            list: [(shape, count, sources)] ordered by count, sources being the serializer fields that issued them.
+        """
+        shapes = {}
+        for record in self.queries:
+            shape = normalize_sql(record.sql)
+            count, sources = shapes.get(shape, (0, []))
+            if record.source is not None and record.source not in sources:
+                sources.append(record.source)
+            shapes[shape] = (count + 1, sources)
+        repeated = [(shape, count, sources) for shape, (count, sources) in shapes.items() if count > threshold]
+        return sorted(repeated, key=lambda item: item[1], reverse=True)
+
+    def warn_repeated(self, threshold, name=''):
+        """Log a warning for every statement shape repeated more than `threshold` times (possible N+1)."""
+        for shape, count, sources in self.repeated(threshold):
+            fields = ', '.join(sources) or 'unknown'
+            logger.warning('Possible N+1 query in %s: %d x `%s`, issued by serializer field %s', name, count, shape, fields)
+
+
+@contextmanager
+def assert_num_queries(num):
+    """
+    Fail when the block does not execute exactly `num` SQL statements.
+
+    example:
+        with assert_num_queries(2):
+            await serializer.data
+    """
+    with QueryLog() as log:
+        yield log
+    if len(log) != num:
+        executed = '\n'.join(f'{index}. {record.sql}' for index, record in enumerate(log.queries, 1))
+        raise AssertionError(f'{len(log)} queries executed, {num} expected. Captured queries were:\n{executed}')
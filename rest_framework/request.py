@@ -11,21 +11,175 @@
     datetime action why
     example:
     2021/3/11 15:46 change 'Fix bug'
+    2026/10/19-20:40 [Change] post_data 每个请求只解析一次，按 Content-Type 选择解析器，限制请求体大小及 JSON 嵌套深度
+    2026/10/19-21:10 [Change] 增加 JSONArrayParser 与 iter_body/iter_json_array，流式接收请求体并逐个解析 JSON 数组元素
+    2026/10/20-02:20 [Fix] 数字的小数或指数部分被分块截断时等待下一块，不再误报缺少分隔符
+    2026/10/20-03:00 [Fix] 未完成的数组元素在接收内容翻倍后才重新解析，并以 REQUEST_MAX_JSON_ELEMENT_SIZE 限制其大小
 """
 
-from sanic.exceptions import InvalidUsage
+import codecs
+import json
+import re
+import warnings
+
+import orjson
 from sanic.request import Request as SanicRequest
 
+from rest_framework.exceptions import APIException
+from rest_framework.settings import srf_settings
+from rest_framework.status import HttpStatus
+
+FORM_MEDIA_TYPES = ('application/x-www-form-urlencoded', 'multipart/form-data')
+
+_STRUCTURE_BYTES = b'[]{}"'
+_NOT_STRUCTURE = bytes(byte for byte in range(256) if byte not in _STRUCTURE_BYTES)
+_OBJECTS_AS_ARRAYS = bytes.maketrans(b'{}', b'[]')
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DELIMITER = re.compile(r'[ \t\n\r]*,[ \t\n\r]*')
+
+
+def json_depth_exceeds(body: bytes, max_depth: int) -> bool:
+    """
+    Whether the arrays and objects of a JSON document nest deeper than `max_depth`, without decoding it.
+    Only brackets and quotes are kept, strings are dropped, then every pass removes one level of `[]` pairs.
+    """
+    if b'\\' in body:
+        # Escaped backslashes first, `\\"` ends a string while `\"` does not
+        body = body.replace(b'\\\\', b'').replace(b'\\"', b'')
+    # Adjacent quotes only ever merge or empty strings, what is left outside of the strings is unchanged
+    structure = body.translate(None, _NOT_STRUCTURE).replace(b'""', b'')
+    # Quotes alternate between opening and closing a string, every other part is outside of them
+    brackets = b''.join(structure.split(b'"')[::2]).translate(_OBJECTS_AS_ARRAYS)
+    for _ in range(max_depth):
+        if not brackets:
+            return False
+        # replace() does not rescan what it produced, a pass removes exactly the innermost level
+        reduced = brackets.replace(b'[]', b'')
+        if len(reduced) == len(brackets):
+            # Unbalanced brackets, the decoder reports the document as invalid
+            return False
+        brackets = reduced
+    return bool(brackets)
+
+
+class JSONElementTooLarge(ValueError):
+    """An element of a streamed JSON array longer than the `max_element_size` of its parser"""
+
+
+class JSONArrayParser:
+    """
+    Incremental parser of a JSON array, the body is fed as it is received and the complete elements are returned.
+    Only the element being received is buffered, up to `max_element_size` characters when it is set,
+    `ValueError` is raised for anything but an array.
+    An element that failed to scan is scanned again once the received text doubled, not on every chunk,
+    so that a large or malformed element costs linear time in its length.
+    """
+
+    _START, _FIRST, _VALUE, _SEPARATOR, _END = range(5)
+
+    def __init__(self, max_depth=None, max_element_size=None):
+        # Elements are nested in the array itself
+        self.max_depth = None if max_depth is None else max_depth - 1
+        self.max_element_size = max_element_size
+        self._decode = codecs.getincrementaldecoder('utf-8')().decode
+        self._scan = json.JSONDecoder().raw_decode
+        self._buffer = ''
+        # Text received since the last parse, joined once it is parsed
+        self._chunks = []
+        self._size = 0
+        self._retry_size = 0
+        self._state = self._START
+
+    def feed(self, chunk: bytes) -> list:
+        """Elements completed by `chunk`"""
+        text = self._decode(chunk)
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._size < self._retry_size and (self.max_element_size is None or self._size <= self.max_element_size):
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> list:
+        """Elements left at the end of the body, which must close the array"""
+        self._chunks.append(self._decode(b'', True))
+        items = self._parse(final=True)
+        if self._state != self._END:
+            raise ValueError('Expected a JSON array' if self._state == self._START else 'Unterminated JSON array')
+        return items
+
+    def _parse(self, final):
+        buffer, items, pos = self._buffer + ''.join(self._chunks), [], 0
+        self._chunks.clear()
+        self._retry_size = 0
+        scan, delimiter = self._scan, _DELIMITER.match
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if self._state == self._START:
+                if char != '[':
+                    raise ValueError('Expected a JSON array')
+                self._state, pos = self._FIRST, pos + 1
+            elif self._state == self._SEPARATOR or (self._state == self._FIRST and char == ']'):
+                if char not in ',]':
+                    raise ValueError("Expecting ',' delimiter")
+                self._state, pos = self._VALUE if char == ',' else self._END, pos + 1
+            elif self._state == self._END:
+                raise ValueError('Extra data after the JSON array')
+            else:
+                start, waiting = pos, False
+                while True:
+                    try:
+                        value, end = scan(buffer, pos)
+                    except json.JSONDecodeError:
+                        if final:
+                            raise
+                        # Most likely the element continues in the next chunks, scanned again once they doubled it
+                        self._retry_size = 2 * (len(buffer) - pos)
+                        waiting = True
+                        break
+                    except RecursionError:
+                        raise ValueError('JSON body is nested too deeply.')
+                    self._check_element_size(end - pos)
+                    # Straight on to the next element, the common case
+                    match = delimiter(buffer, end)
+                    if match is None and not final:
+                        # A number may continue in the next chunk, `1.` and `1.5e` are scanned as `1` and `1.5`
+                        after = _WHITESPACE.match(buffer, end).end()
+                        if after == len(buffer) or buffer[after] != ']':
+                            waiting = True
+                            break
+                    items.append(value)
+                    if match is None:
+                        self._state, pos = self._SEPARATOR, end
+                        break
+                    self._state, pos = self._VALUE, match.end()
+                # Checked once for the run of elements, it reduces level by level like a single element
+                if self.max_depth is not None and pos > start and json_depth_exceeds(buffer[start:pos].encode(), self.max_depth):
+                    raise ValueError(f'JSON body is nested deeper than {self.max_depth + 1} levels.')
+                if waiting:
+                    break
+        self._buffer = buffer[pos:]
+        self._size = len(self._buffer)
+        self._check_element_size(self._size)
+        return items
+
+    def _check_element_size(self, size):
+        if self.max_element_size is not None and size > self.max_element_size:
+            raise JSONElementTooLarge(f'JSON array element exceeds {self.max_element_size} characters.')
+
 
 class SRFRequest(SanicRequest):
     def __init__(self, *args, **kwargs):
         super(SRFRequest, self).__init__(*args, **kwargs)
         self.user = None
+        self._post_data = None
 
     @property
     def data(self):
-        Warning(" .data is deprecated, please use .post_data, .data will be removed in V1.7")
-        return self._build_data()
+        warnings.warn(".data is deprecated, please use .post_data, .data will be removed in V1.7", DeprecationWarning, stacklevel=2)
+        return self.post_data
 
     @property
     def get_data(self):
@@ -33,7 +187,49 @@ class SRFRequest(SanicRequest):
 
     @property
     def post_data(self):
-        return self._build_data()
+        """The parsed body, parsed once per request"""
+        if self._post_data is None:
+            self._post_data = self._build_data()
+        return self._post_data
+
+    async def iter_body(self):
+        """
+        The body chunk by chunk as it is received, on routes registered with `stream=True`,
+        otherwise the body Sanic already read in one chunk.
+        Streamed bodies are limited by REQUEST_MAX_BODY_SIZE or, when it is None, by Sanic's REQUEST_MAX_SIZE.
+        """
+        max_size = srf_settings.REQUEST_MAX_BODY_SIZE
+        if self.stream is None or not self.stream.request_body:
+            if self.body:
+                self._check_body_size(len(self.body), max_size)
+                yield self.body
+            return
+        if max_size is None:
+            max_size = self.app.config.REQUEST_MAX_SIZE
+        received = 0
+        async for chunk in self.stream:
+            received += len(chunk)
+            self._check_body_size(received, max_size)
+            yield chunk
+
+    async def iter_json_array(self):
+        """
+        The elements of a JSON array body, parsed as the body is received.
+        An element longer than REQUEST_MAX_JSON_ELEMENT_SIZE characters is answered with 413.
+        """
+        parser = JSONArrayParser(srf_settings.REQUEST_MAX_JSON_DEPTH, srf_settings.REQUEST_MAX_JSON_ELEMENT_SIZE)
+        try:
+            async for chunk in self.iter_body():
+                for item in parser.feed(chunk):
+                    yield item
+            items = parser.close()
+        except JSONElementTooLarge as exc:
+            raise APIException(str(exc), status=HttpStatus.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        except ValueError as exc:
+            # UnicodeDecodeError and JSONDecodeError included
+            raise APIException(f'JSON parse error - {exc}', status=HttpStatus.HTTP_400_BAD_REQUEST)
+        for item in items:
+            yield item
 
     # def _build_args(self):
     #     args = self.args
@@ -45,9 +241,32 @@ class SRFRequest(SanicRequest):
     #     return args
 
     def _build_data(self):
+        """
+        Form bodies are parsed by Sanic, every other body as JSON.
+        Bodies larger than REQUEST_MAX_BODY_SIZE and JSON nested deeper than REQUEST_MAX_JSON_DEPTH are rejected before decoding.
+        """
+        body = self.body
+        if not body:
+            return {}
+        self._check_body_size(len(body), srf_settings.REQUEST_MAX_BODY_SIZE)
+        content_type = self.headers.get('content-type', '').split(';', 1)[0].strip().lower()
+        if content_type in FORM_MEDIA_TYPES:
+            return self.form
+        return self._parse_json(body)
+
+    @staticmethod
+    def _check_body_size(size, max_size):
+        if max_size is not None and size > max_size:
+            raise APIException(f'Request body exceeds {max_size} bytes.', status=HttpStatus.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def _parse_json(self, body):
+        max_depth = srf_settings.REQUEST_MAX_JSON_DEPTH
+        if max_depth is not None and json_depth_exceeds(body, max_depth):
+            raise APIException(f'JSON body is nested deeper than {max_depth} levels.', status=HttpStatus.HTTP_400_BAD_REQUEST)
         try:
-            data = self.json
-        except InvalidUsage as exc:
-            data = self.form
-        data = {} if data is None else data
-        return data
+            data = orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
+            raise APIException(f'JSON parse error - {exc}', status=HttpStatus.HTTP_400_BAD_REQUEST)
+        # Sanic's `.json` reuses it
+        self.parsed_json = data
+        return {} if data is None else data
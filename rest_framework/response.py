@@ -9,14 +9,53 @@
 @ChangeHistory:
     datetime action why
     2022/6/6-10:53 [Create] response.py
+    2026/10/19-18:40 [Change] 可插拔渲染器: 默认紧凑 JSON、?pretty=1、按 Accept 协商 JSON/MessagePack
+    2026/10/19-20:10 [Change] 大响应体延迟到渲染线程池中分块编码，避免阻塞事件循环
+    2026/10/19-23:30 [Change] 新增 stream_json 分块写出的流式 JSON 响应
+    2026/10/20-02:50 [Change] 新增 reset_current_request，视图不再直接操作 _current_request
 """
+import asyncio
 import datetime
 import decimal
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from typing import Dict, Optional, Union
 
 import orjson
 from sanic.compat import Header
-from sanic.response import BaseHTTPResponse
+from sanic.response import BaseHTTPResponse, ResponseStream
+
+from rest_framework import timing
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+__all__ = (
+    'JsonResponse',
+    'BaseRenderer',
+    'JSONRenderer',
+    'MsgPackRenderer',
+    'get_renderers',
+    'select_renderer',
+    'current_request',
+    'set_current_request',
+    'reset_current_request',
+    'stream_json',
+)
+
+_current_request: ContextVar = ContextVar('srf_request', default=None)
+_renderers = None
+_render_executor = None
+
+# Stands in for the rows of a chunked body, unique per process so that no data can contain it
+_ROWS_MARKER = f'srf-rows-{uuid.uuid4().hex}'
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 def _default(obj):
@@ -24,7 +63,7 @@ def _default(obj):
         if obj != obj:
             return None
         return int(obj.timestamp())
-    elif isinstance(obj, datetime.date):
+    elif isinstance(obj, (datetime.date, datetime.time)):
         return obj.isoformat()
     elif isinstance(obj, decimal.Decimal):
         return float(obj)
@@ -38,29 +77,336 @@ def _default(obj):
         raise TypeError(f"Unsupported json dump type: {type(obj)}")
 
 
+def _iso_default(obj):
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    return _default(obj)
+
+
+def current_request():
+    """The request handled by the current APIView.dispatch, or None outside of it."""
+    return _current_request.get()
+
+
+def set_current_request(request):
+    """Returns a token for `reset_current_request`."""
+    return _current_request.set(request)
+
+
+def reset_current_request(token):
+    """Restores the request current before the `set_current_request` that returned `token`."""
+    _current_request.reset(token)
+
+
+def timestamp_datetimes():
+    from rest_framework.settings import srf_settings
+
+    return srf_settings.JSON_DATETIME_FORMAT == 'timestamp'
+
+
+class BaseRenderer:
+    """
+    Encodes a response body, selected by `select_renderer` from the `Accept` header.
+    media_types are the types it answers to, the first one is used as the response content type.
+    """
+
+    media_types = ()
+
+    @property
+    def media_type(self):
+        return self.media_types[0]
+
+    def render(self, data, pretty=False) -> bytes:
+        raise NotImplementedError('.render() must be overridden')
+
+    def render_chunked(self, data, pretty=False, chunk_rows=1000) -> bytes:
+        """
+        Called from the render thread pool for large bodies. Renderers that hold the GIL while encoding
+        should encode the rows in chunks, the event loop thread can only take the GIL back between two calls.
+        """
+        return self.render(data, pretty=pretty)
+
+
+class JSONRenderer(BaseRenderer):
+    """
+    orjson renderer, compact unless `JSON_PRETTY` is set or the request asks for `?pretty=1`.
+    datetime is rendered as a unix timestamp when `JSON_DATETIME_FORMAT` is 'timestamp' (default),
+    or natively by orjson as RFC 3339 when it is 'iso'; date, time and dataclasses are always native.
+    """
+
+    media_types = ('application/json',)
+
+    def get_option(self, pretty=False):
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if timestamp_datetimes():
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def render(self, data, pretty=False, dumps=None):
+        dumps = dumps or orjson.dumps
+        return dumps(data, default=_default, option=self.get_option(pretty))
+
+    def render_chunked(self, data, pretty=False, chunk_rows=1000):
+        # Indentation depends on the nesting level, pretty bodies are rendered in one piece
+        path = None if pretty else find_rows(data)
+        if path is None:
+            return self.render(data, pretty=pretty)
+        rows, outer = _replace_rows(data, path, _ROWS_MARKER)
+        head, tail = self.render(outer).split(self.render(_ROWS_MARKER), 1)
+        parts = [head, b'[']
+        for start in range(0, len(rows), chunk_rows):
+            if start:
+                parts.append(b',')
+            parts.append(self.render(rows[start:start + chunk_rows])[1:-1])
+        parts.append(b']')
+        parts.append(tail)
+        return b''.join(parts)
+
+
+class MsgPackRenderer(BaseRenderer):
+    """MessagePack renderer, requires the optional `msgpack` package."""
+
+    media_types = ('application/msgpack', 'application/x-msgpack')
+
+    def __init__(self):
+        assert msgpack is not None, '`MsgPackRenderer` requires the `msgpack` package, install it with `pip install msgpack`.'
+
+    def render(self, data, pretty=False):
+        default = _default if timestamp_datetimes() else _iso_default
+        return msgpack.packb(data, default=default, use_bin_type=True)
+
+
+def estimate_size(data, depth=4):
+    """Rough number of values in `data`, rows × fields for lists of dicts, only the first row of a list is looked at."""
+    if isinstance(data, dict):
+        if depth <= 0:
+            return len(data)
+        return sum(estimate_size(value, depth - 1) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        if not data or depth <= 0:
+            return len(data)
+        return len(data) * max(1, estimate_size(data[0], depth - 1))
+    return 1
+
+
+def find_rows(data, depth=3):
+    """Key path to the longest list nested in the dicts of `data`, `()` for a list and None when there is none."""
+    if isinstance(data, list):
+        return ()
+    found, longest = None, -1
+    if isinstance(data, dict) and depth > 0:
+        for key, value in data.items():
+            path = find_rows(value, depth - 1)
+            if path is None:
+                continue
+            rows = value
+            for part in path:
+                rows = rows[part]
+            if len(rows) > longest:
+                found, longest = (key, *path), len(rows)
+    return found
+
+
+def _replace_rows(data, path, marker):
+    """Returns the list at `path` and a copy of the dicts along `path` with the list replaced by `marker`."""
+    if not path:
+        return data, marker
+    outer = dict(data)
+    rows, outer[path[0]] = _replace_rows(data[path[0]], path[1:], marker)
+    return rows, outer
+
+
+def get_render_executor():
+    global _render_executor
+    if _render_executor is None:
+        from rest_framework.settings import srf_settings
+
+        _render_executor = ThreadPoolExecutor(max_workers=srf_settings.RENDER_WORKERS, thread_name_prefix='srf-render')
+    return _render_executor
+
+
+def should_defer(body):
+    """Bodies of at least `RENDER_OFFLOAD_THRESHOLD` estimated values are rendered in the render thread pool."""
+    from rest_framework.settings import srf_settings
+
+    threshold = srf_settings.RENDER_OFFLOAD_THRESHOLD
+    return threshold is not None and estimate_size(body) >= threshold
+
+
+def stream_json(body, path, parts, status=200, headers=None):
+    """
+    Streams `body` as compact JSON, the value at the key path `path` is written from `parts`, an iterable
+    of the encoded fragments of that value, in writes of about STREAM_CHUNK_SIZE bytes.
+    The encoded body is never held in memory as a whole.
+    """
+    renderer = JSONRenderer()
+    _, outer = _replace_rows(body, path, _ROWS_MARKER)
+    head, tail = renderer.render(outer).split(renderer.render(_ROWS_MARKER), 1)
+
+    async def streaming_fn(response):
+        buffer = bytearray(head)
+        for part in parts:
+            buffer += part
+            if len(buffer) >= STREAM_CHUNK_SIZE:
+                await response.write(bytes(buffer))
+                buffer.clear()
+        buffer += tail
+        await response.write(bytes(buffer))
+
+    return ResponseStream(streaming_fn, status=status, headers=headers, content_type=renderer.media_type)
+
+
+def get_renderers():
+    global _renderers
+    if _renderers is None:
+        from rest_framework.settings import srf_settings
+
+        _renderers = [renderer_class() for renderer_class in srf_settings.RENDERER_CLASSES]
+    return _renderers
+
+
+def parse_accept(header):
+    """
+    Media ranges of an `Accept` header ordered by preference, ranges with q=0 are dropped.
+        'application/msgpack;q=0.9, application/json' -> ['application/json', 'application/msgpack']
+    """
+    ranges = []
+    for index, item in enumerate(header.split(',')):
+        media_range, *params = item.strip().split(';')
+        media_range = media_range.strip().lower()
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            # Equal qualities keep the header order, specific types before wildcards
+            ranges.append((-quality, media_range.count('*'), index, media_range))
+    return [media_range for *_, media_range in sorted(ranges)]
+
+
+def _matches(media_range, media_type):
+    if media_range in ('*/*', '*'):
+        return True
+    main_type, _, sub_type = media_range.partition('/')
+    if sub_type == '*':
+        return media_type.startswith(f'{main_type}/')
+    return media_range == media_type
+
+
+def select_renderer(request, renderers):
+    """
+    The first renderer accepting the most preferred media range of the request,
+    the first renderer when the request has no `Accept` header or nothing matches.
+    """
+    headers = getattr(request, 'headers', None)
+    header = headers.get('accept') if headers else None
+    if not header or len(renderers) == 1:
+        return renderers[0]
+    for media_range in parse_accept(header):
+        for renderer in renderers:
+            if any(_matches(media_range, media_type) for media_type in renderer.media_types):
+                return renderer
+    return renderers[0]
+
+
+def wants_pretty(request):
+    from rest_framework.settings import srf_settings
+
+    if srf_settings.JSON_PRETTY:
+        return True
+    args = getattr(request, 'args', None)
+    return bool(args) and str(args.get('pretty', '')).lower() in TRUE_VALUES
+
+
 class JsonResponse(BaseHTTPResponse):
-    __slots__ = ("body", "status", "content_type", "headers", "_cookies")
+    """
+    Response whose body is encoded by the renderer negotiated for the request,
+    the request defaults to the one handled by the current view.
+
+    Inside APIView.dispatch, bodies estimated above `RENDER_OFFLOAD_THRESHOLD` values are not rendered here:
+    dispatch awaits `prepare()`, which renders them in chunks in the render thread pool.
+    Reading `body` before that renders it on the spot.
+    """
+
+    __slots__ = ("_body", "_pending", "status", "content_type", "headers", "_cookies")
 
     def __init__(
             self,
             body: dict = None,
             status: int = 200,
             headers: Optional[Union[Header, Dict[str, str]]] = None,
-            content_type: Optional[str] = "application/json",
-            dumps=None
+            content_type: Optional[str] = None,
+            dumps=None,
+            request=None,
     ):
         super().__init__()
-        if not dumps:
-            dumps = orjson.dumps
         if body is None:
             body = {}
-        self.content_type: Optional[str] = content_type
-        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
-        self.body = self._encode_body(dumps(body, default=_default, option=option))
+        if request is None:
+            request = current_request()
+        renderers = get_renderers()
+        renderer = select_renderer(request, renderers)
+        pretty = wants_pretty(request)
+        if dumps is None and _current_request.get() is not None and should_defer(body):
+            self._pending = (renderer, body, pretty)
+        else:
+            with timing.phase('render'):
+                if dumps is not None:
+                    # A custom dumps always renders JSON, called as orjson.dumps with the `default` and `option`
+                    # of JSONRenderer: compact unless pretty, datetimes following `JSON_DATETIME_FORMAT`
+                    renderer = JSONRenderer()
+                    rendered = renderer.render(body, pretty=pretty, dumps=dumps)
+                else:
+                    rendered = renderer.render(body, pretty=pretty)
+                self.body = self._encode_body(rendered)
+        self.content_type: Optional[str] = content_type or renderer.media_type
         self.status = status
         self.headers = Header(headers or {})
+        if len(renderers) > 1:
+            self.headers['Vary'] = 'Accept'
         self._cookies = None
 
+    @property
+    def body(self):
+        if self._pending is not None:
+            renderer, data, pretty = self._pending
+            with timing.phase('render'):
+                self.body = self._encode_body(renderer.render(data, pretty=pretty))
+        return self._body
+
+    @body.setter
+    def body(self, value):
+        self._pending = None
+        self._body = value
+
+    @property
+    def deferred(self):
+        """True until a body deferred to the render thread pool is rendered."""
+        return self._pending is not None
+
+    async def prepare(self):
+        """Render a deferred body in the render thread pool, no-op otherwise."""
+        if self._pending is None:
+            return self
+        from rest_framework.settings import srf_settings
+
+        renderer, data, pretty = self._pending
+        loop = asyncio.get_running_loop()
+        with timing.phase('render'):
+            rendered = await loop.run_in_executor(
+                get_render_executor(), renderer.render_chunked, data, pretty, srf_settings.RENDER_CHUNK_ROWS
+            )
+        self.body = self._encode_body(rendered)
+        return self
+
     async def eof(self):
         await self.send("", True)
 
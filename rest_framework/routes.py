@@ -50,7 +50,8 @@ class ViewSetRouter(BaseRoute):
         # List route.
         Route(
             url=r"{prefix}{trailing_slash}",
-            mapping={"get": "list", "post": "create"},
+            mapping={"get": "list", "post": "create", "put": "bulk_update", "patch": "partial_bulk_update",
+                     "delete": "bulk_destroy"},
             name="{basename}-list",
             detail=False,
             initkwargs={"suffix": "List"},
@@ -10,23 +10,28 @@
 """
 
 import copy
-from functools import lru_cache
 import inspect
 import traceback
 from collections import OrderedDict
 from typing import Any, Mapping
 
+from pypika import Table
 from tortoise import fields as tortoise_fields
+from tortoise.exceptions import IntegrityError, ValidationError as ORMValidationError
 from tortoise.fields.relational import ReverseRelation
 from tortoise.queryset import ValuesListQuery, ValuesQuery
+from tortoise.transactions import in_transaction
 
+from rest_framework import querylog, timing
+from rest_framework.cache.queryset import invalidate_querysets
 from rest_framework.constant import ALL_FIELDS, LIST_SERIALIZER_KWARGS
 from rest_framework.converter import DEFAULT_NESTED_DEPTH, ModelConverter
 from rest_framework.exceptions import ValidationException
 from rest_framework.fields import Field, SkipField, empty
 from rest_framework.helpers import BindingDict
 from rest_framework.openapi3.types import Array, Object, Schema
-from rest_framework.utils import run_awaitable, run_awaitable_val
+from rest_framework.settings import srf_settings
+from rest_framework.utils import IntegrityErrorHandel, run_awaitable, run_awaitable_val
 
 
 def set_value(dictionary: dict, keys: list, value: Any) -> None:
@@ -44,6 +49,15 @@ def set_value(dictionary: dict, keys: list, value: Any) -> None:
     dictionary[keys[-1]] = value
 
 
+def is_unique_violation(exc) -> bool:
+    return isinstance(exc, IntegrityError) and IntegrityErrorHandel(exc).is_unique_violation
+
+
+def auto_now_fields(model) -> tuple:
+    """Fields of `model` set to the current time on every save, an UPDATE writes them with the changed columns"""
+    return tuple(name for name, field in model._meta.fields_map.items() if getattr(field, 'auto_now', False))
+
+
 class BaseSerializer(Field):
     """Serializer
     .instance ->
@@ -180,7 +194,8 @@ class BaseSerializer(Field):
             'serialized `.data` representation.'
         )
         if not hasattr(self, '_data'):
-            self._data = await self.internal_to_external(self.instance)
+            with timing.phase('serialize'):
+                self._data = await self.internal_to_external(self.instance)
         return self._data
 
     @property
@@ -228,16 +243,18 @@ class Serializer(BaseSerializer, metaclass=SerializerMetaclass):
     default_error_messages = {'invalid': 'Invalid data. Expected a dictionary, but got {datatype}.'}
 
     @property
-    @lru_cache()
     def fields(self):
         """
         {field_name: field_instance}.
-        Fields are dynamically loaded to avoid unexpected errors during import.
+        Fields are dynamically loaded to avoid unexpected errors during import,
+        and cached on the instance so they are released together with the serializer.
         """
-        fields = BindingDict(self)
-        for key, value in self.get_fields().items():
-            fields[key] = value
-        return fields
+        if not hasattr(self, '_fields'):
+            fields = BindingDict(self)
+            for key, value in self.get_fields().items():
+                fields[key] = value
+            self._fields = fields
+        return self._fields
 
     @property
     def _writable_fields(self):
@@ -366,12 +383,14 @@ class ListSerializer(BaseSerializer):
         """
         if not inspect.isawaitable(data):
             iterable = data
-        elif isinstance(data, (ValuesQuery, ValuesListQuery)):
-            iterable = await data
-        elif isinstance(data, ReverseRelation):
-            iterable = data.related_objects if data._fetched else await data.all()
         else:
-            iterable = await data.all()
+            with querylog.source(self):
+                if isinstance(data, (ValuesQuery, ValuesListQuery)):
+                    iterable = await data
+                elif isinstance(data, ReverseRelation):
+                    iterable = data.related_objects if data._fetched else await data.all()
+                else:
+                    iterable = await data.all()
 
         return [await self.child.internal_to_external(item) for item in iterable]
 
@@ -427,10 +446,76 @@ class ListSerializer(BaseSerializer):
 
     async def create(self, validated_data):
         """
-        Create instances from validated data
+        Create instances from validated data,
+        in bulk INSERTs when the child sets `Meta.bulk_create`, see `ModelSerializer.bulk_create()`
         """
+        if getattr(getattr(self.child, 'Meta', None), 'bulk_create', False):
+            return await self.child.bulk_create(validated_data)
         return [await self.child.create(attrs) for attrs in validated_data]
 
+    async def stream_create(self, items, batch_size=None, check_batch=None, **kwargs):
+        """
+        Validates and creates the items of an async iterable as they arrive, e.g. `request.iter_json_array()`,
+        so that only one batch of `batch_size` (BULK_BATCH_SIZE) rows is held in memory.
+
+        Batches are created in one transaction, with the child's `bulk_create()` when it has one since the
+        instances are not returned, `.create()` otherwise. An invalid item stops the writes and,
+        once every item has been validated, rolls the batches already written back and raises the
+        per-index errors like `.is_valid()` does. The list level `.validate()` and validators are not run,
+        the list is never built. Returns the number of items created.
+
+        `check_batch(rows)` is awaited before each batch is written and returns the errors of the invalid rows
+        as {index in the batch: error detail}, e.g. `CreateModelMixin.check_unique_batch`.
+        """
+        assert self.instance is None, '`stream_create()` only creates instances.'
+        batch_size = batch_size or srf_settings.BULK_BATCH_SIZE
+        batch, errors, count = [], {}, 0
+        async with self._transaction():
+            async for item in items:
+                try:
+                    value = await self.child.run_validation(item)
+                except ValidationException as exc:
+                    errors[count] = exc.error_detail
+                    batch.clear()
+                else:
+                    if not errors:
+                        batch.append({**value, **kwargs})
+                count += 1
+                if len(batch) >= batch_size:
+                    await self._flush_batch(batch, count - len(batch), batch_size, check_batch, errors)
+                    batch = []
+            if batch:
+                await self._flush_batch(batch, count - len(batch), batch_size, check_batch, errors)
+            if errors:
+                raise ValidationException([errors.get(index, {}) for index in range(count)])
+            if not count and not self.allow_null:
+                raise self.raise_error('null')
+        model = self._child_model()
+        if count and model is not None:
+            await invalidate_querysets(model)
+        return count
+
+    async def _flush_batch(self, batch, offset, batch_size, check_batch, errors):
+        if check_batch is not None:
+            for index, detail in (await check_batch(batch)).items():
+                errors[offset + index] = detail
+            if errors:
+                return None
+        return await self._create_batch(batch, batch_size)
+
+    async def _create_batch(self, batch, batch_size):
+        bulk_create = getattr(self.child, 'bulk_create', None)
+        if bulk_create is not None:
+            return await bulk_create(batch, batch_size=batch_size)
+        return await self.create(batch)
+
+    def _child_model(self):
+        return getattr(getattr(self.child, 'Meta', None), 'model', None)
+
+    def _transaction(self):
+        model = self._child_model()
+        return in_transaction(model._meta.default_connection if model is not None else None)
+
     async def save(self, **kwargs):
         """
         Save instances
@@ -453,6 +538,9 @@ class ListSerializer(BaseSerializer):
             self.instance = await self.update(self.instance, validated_data)
             assert self.instance is not None, '`update()` did not return an object instance.'
 
+        model = self._child_model()
+        if model is not None:
+            await invalidate_querysets(model)
         return self.instance
 
     def to_openapi(self) -> Schema:
@@ -461,6 +549,142 @@ class ListSerializer(BaseSerializer):
         return Array(items=child_schema)
 
 
+class BulkUpdateListSerializer(ListSerializer):
+    """
+    Updates many instances from a list of items carrying their `lookup_field` (the model's primary key by default).
+    `instance` is the queryset (or the list of instances) the items are looked up in with a single `__in` query,
+    items outside of it are reported as errors with the other per-index validation errors.
+
+    class Meta:
+        list_serializer_class = BulkUpdateListSerializer
+
+    serializer = BookSerializer(queryset, data=items, many=True, partial=True)
+    """
+
+    default_error_messages = {
+        **ListSerializer.default_error_messages,
+        'required': 'This field is required.',
+        'not_exist': 'This value `{value}` is not valid',
+        'duplicate': 'The value `{value}` is updated more than once.',
+    }
+
+    def __init__(self, *args, **kwargs):
+        self.lookup_field = kwargs.pop('lookup_field', None)
+        super().__init__(*args, **kwargs)
+
+    @property
+    def model(self):
+        return self.child.Meta.model
+
+    def get_lookup_key(self):
+        """Key of the lookup value in the items"""
+        if self.lookup_field in (None, 'pk'):
+            return self.model._meta.pk_attr
+        return self.lookup_field
+
+    def to_lookup_value(self, value):
+        """
+        The lookup value of an item as the lookup field holds it, e.g. `"1"` -> `1` for an int primary key,
+        None when it can not be one. Booleans are not lookup values although `int` accepts them.
+        """
+        if isinstance(value, bool) or not isinstance(value, (str, int)):
+            return None
+        field = self.model._meta.fields_map.get(self.get_lookup_key())
+        if field is None:
+            return value
+        try:
+            return field.to_python_value(value)
+        except (TypeError, ValueError, AttributeError, ORMValidationError):
+            return None
+
+    async def get_instances(self, values):
+        """{lookup value: instance} of `values`, fetched with one query"""
+        lookup_key = self.get_lookup_key()
+        if isinstance(self.instance, (list, tuple)):
+            return {getattr(instance, lookup_key): instance for instance in self.instance if getattr(instance, lookup_key) in values}
+        queryset = self.model.all() if self.instance is None else self.instance
+        with querylog.source(self):
+            instances = await queryset.filter(**{f'{lookup_key}__in': list(values)})
+        return {getattr(instance, lookup_key): instance for instance in instances}
+
+    def _item_error(self, key, error_key, **kwargs):
+        try:
+            self.raise_error(error_key, **kwargs)
+        except ValidationException as exc:
+            return {key: exc.error_detail}
+
+    async def external_to_internal(self, data: Any) -> Any:
+        """Validates the items against their instance, `self.matched` keeps the instance of every validated item."""
+        if not isinstance(data, list):
+            raise self.raise_error('not_a_list', input_type=type(data).__name__)
+        if not self.allow_null and not data:
+            raise self.raise_error('null')
+
+        lookup_key = self.get_lookup_key()
+        values = [item.get(lookup_key) if isinstance(item, Mapping) else None for item in data]
+        # Lookup values come from the client, they are queried and matched as the field holds them
+        keys = [self.to_lookup_value(value) for value in values]
+        instances = await self.get_instances({key for key in keys if key is not None})
+
+        ret, errors, matched, seen = [], [], [], set()
+        queryset = self.child.instance
+        try:
+            for item, value, key in zip(data, values, keys):
+                instance = None if key is None else instances.get(key)
+                if value is None:
+                    errors.append(self._item_error(lookup_key, 'required'))
+                    continue
+                if instance is None:
+                    errors.append(self._item_error(lookup_key, 'not_exist', value=value))
+                    continue
+                if key in seen:
+                    errors.append(self._item_error(lookup_key, 'duplicate', value=value))
+                    continue
+                seen.add(key)
+                # Field validators such as the unique ones compare against the instance being updated
+                self.child.instance = instance
+                try:
+                    validated = await self.child.run_validation(item)
+                except ValidationException as exc:
+                    errors.append(exc.error_detail)
+                else:
+                    ret.append(validated)
+                    matched.append(instance)
+                    errors.append({})
+        finally:
+            self.child.instance = queryset
+        if any(errors):
+            raise ValidationException(errors)
+        self.matched = matched
+        return ret
+
+    async def update(self, instance, validated_data):
+        """
+        Applies the changed values to the matched instances and writes them with `bulk_update`, one call per distinct
+        set of changed columns, `BULK_BATCH_SIZE` rows per UPDATE, in one transaction. Items without changes are not
+        written. Returns the matched instances.
+        """
+        meta = self.model._meta
+        assert not meta.m2m_fields & {field for attrs in validated_data for field in attrs}, (
+            '`BulkUpdateListSerializer` does not update many-to-many fields.'
+        )
+        auto_now = auto_now_fields(self.model)
+        groups = OrderedDict()
+        for obj, attrs in zip(self.matched, validated_data):
+            changes = self.child.get_changes(obj, attrs)
+            if not changes:
+                continue
+            for column, (_, value) in changes.items():
+                setattr(obj, column, value)
+            changed = tuple(changes)
+            groups.setdefault(changed + tuple(name for name in auto_now if name not in changed), []).append(obj)
+
+        async with in_transaction(meta.default_connection) as connection:
+            for fields, objs in groups.items():
+                await self.model.bulk_update(objs, fields=fields, batch_size=srf_settings.BULK_BATCH_SIZE, using_db=connection)
+        return list(self.matched)
+
+
 class ModelSerializer(Serializer):
     """
     class Meta:
@@ -471,10 +695,17 @@ class ModelSerializer(Serializer):
         exclude = ()  # 冲突，不能与fields共存
         read_only_fields = ()  # 字段与write_only_fields冲突
         write_only_fields = ()  # 字段与read_only_fields冲突
+        bulk_create = False  # many=True 时使用 bulk_create() 批量创建
     """
 
     @property
     def fields(self):
+        # Building the fields walks the model meta and deep-copies the declared fields, do it once per instance
+        if not hasattr(self, '_fields'):
+            self._fields = self.build_fields()
+        return self._fields
+
+    def build_fields(self):
         assert hasattr(self, 'Meta'), 'The {serializer_class} class has no "Meta" attribute.'.format(
             serializer_class=self.__class__.__name__
         )
@@ -584,6 +815,13 @@ class ModelSerializer(Serializer):
             else:
                 return {'read_only': False, 'write_only': False}
 
+    async def save(self, **kwargs):
+        """Saves the instance and drops the cached querysets of the model, unless an update changed nothing"""
+        instance = await super().save(**kwargs)
+        if getattr(self, '_changes', True):
+            await invalidate_querysets(self.Meta.model)
+        return instance
+
     async def create(self, validated_data):
         """
         根据验证后的数据进行创建，
@@ -596,7 +834,10 @@ class ModelSerializer(Serializer):
         # 在执行create方法时出现错误，你可以重写create方法来解决这个异常
         try:
             instance = await ModelClass.create(**validated_data)
-        except Exception:
+        except Exception as exc:
+            # Unique violations reach the caller as they are, see `CreateModelMixin.unique_optimistic`
+            if is_unique_violation(exc):
+                raise
             tb = traceback.format_exc()
             msg = (
                 'There is an error in executing the `%s.create()` method. '
@@ -607,6 +848,66 @@ class ModelSerializer(Serializer):
         # TODO: 对 instance 的M2M进行绑定
         return instance
 
+    async def bulk_create(self, validated_data, batch_size=None):
+        """
+        Creates the instances of a list of validated data with Tortoise `bulk_create`, `batch_size` (BULK_BATCH_SIZE)
+        rows per INSERT, in one transaction. Many-to-many values (instances or primary keys) are linked in a second
+        pass, one INSERT into the through table per relation and batch.
+
+        `bulk_create` does not read back the primary keys generated by the database, rows with many-to-many values
+        are inserted one by one to get theirs and the other instances are returned without it.
+        """
+        ModelClass = self.Meta.model
+        batch_size = batch_size or srf_settings.BULK_BATCH_SIZE
+        m2m_fields = ModelClass._meta.m2m_fields
+        instances, bulk, links = [], [], []
+        for attrs in validated_data:
+            m2m = {field: attrs[field] for field in m2m_fields if attrs.get(field)}
+            instance = ModelClass(**{field: value for field, value in attrs.items() if field not in m2m_fields})
+            instances.append(instance)
+            if m2m:
+                links.append((instance, m2m))
+            if not m2m or instance.pk is not None:
+                bulk.append(instance)
+
+        async with in_transaction(ModelClass._meta.default_connection) as connection:
+            try:
+                await ModelClass.bulk_create(bulk, batch_size=batch_size, using_db=connection)
+                for instance, _ in links:
+                    if instance.pk is None:
+                        await instance.save(using_db=connection)
+                await self._bulk_link(links, batch_size, connection)
+            except Exception as exc:
+                if is_unique_violation(exc):
+                    raise
+                tb = traceback.format_exc()
+                msg = (
+                    'There is an error in executing the `%s.bulk_create()` method. '
+                    'You can rewrite the `%s.bulk_create()` method to solve this exception.'
+                    '\nOriginal exception was:\n %s' % (ModelClass.__name__, self.__class__.__name__, tb)
+                )
+                raise ValueError(msg)
+        return instances
+
+    async def _bulk_link(self, links, batch_size, connection):
+        meta = self.Meta.model._meta
+        for name in meta.m2m_fields:
+            field = meta.fields_map[name]
+            related_pk = field.related_model._meta.pk
+            pairs = list(
+                {
+                    (related_pk.to_db_value(getattr(related, 'pk', related), None), meta.pk.to_db_value(instance.pk, instance))
+                    for instance, m2m in links
+                    for related in m2m.get(name, ())
+                }
+            )
+            through = Table(field.through)
+            for start in range(0, len(pairs), batch_size):
+                query = connection.query_class.into(through).columns(field.forward_key, field.backward_key)
+                for pair in pairs[start:start + batch_size]:
+                    query = query.insert(*pair)
+                await connection.execute_query(str(query))
+
     async def update(self, instance, validated_data):
         """
         一个完整的 Update() 是允许嵌套的 validated_data 值，在值中需要拆离 一对多及多对多的关系
@@ -621,12 +922,18 @@ class ModelSerializer(Serializer):
         """
 
         ModelClass = self.Meta.model
+        # Only the changed columns are written, nothing at all when no value changed
+        self._changes = self.get_changes(instance, validated_data)
         try:
 
             for field, value in validated_data.items():
                 setattr(instance, field, value)
-            await instance.save()
-        except Exception:
+            if self._changes:
+                update_fields = [*self._changes, *(name for name in auto_now_fields(ModelClass) if name not in self._changes)]
+                await instance.save(update_fields=update_fields)
+        except Exception as exc:
+            if is_unique_violation(exc):
+                raise
             tb = traceback.format_exc()
             msg = (
                 'There is an error in executing the `%s.update()` method. '
@@ -637,6 +944,35 @@ class ModelSerializer(Serializer):
         # TODO: 对 instance 的M2M进行绑定
         return instance
 
+    def get_changes(self, instance, validated_data):
+        """
+        {column: (current value, new value)} of the columns of `instance` that `validated_data` changes.
+        Relations are compared through their `<name>_id` column, many-to-many and non-model values are left out.
+        """
+        meta = self.Meta.model._meta
+        relations = meta.fk_fields | meta.o2o_fields
+        changes = {}
+        for field, value in validated_data.items():
+            if field in relations:
+                field, value = meta.fields_map[field].source_field, getattr(value, 'pk', value)
+            elif field not in meta.fields_db_projection or meta.fields_map[field].pk:
+                continue
+            current = getattr(instance, field)
+            if current != value:
+                changes[field] = (current, value)
+        return changes
+
+    @property
+    def changes(self):
+        """
+        The changes `.save()` writes to `self.instance`, e.g. for `perform_update()` hooks,
+        available once `.is_valid()` passed and, after `.save()`, including its keyword arguments.
+        """
+        if not hasattr(self, '_changes'):
+            assert self.instance is not None, '`.changes` is only available when updating an instance.'
+            self._changes = self.get_changes(self.instance, self.validated_data)
+        return self._changes
+
     #
 
     def _get_model_relational_fields(self, model_fields):
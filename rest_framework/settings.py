@@ -108,6 +108,9 @@ DEFAULT_SETTINGS = {
     "OPENAPI_SERVERS": [],
     'DEFAULT_AUTHENTICATION_CLASSES': (),
     'DEFAULT_PERMISSION_CLASSES': (),
+    # CACHES alias of the permission codes of the users (UserModelMixin.get_permissions), None resolves them per request
+    'PERMISSION_CACHE': None,
+    'PERMISSION_CACHE_TIMEOUT': 300,
     'VIEW_TRANSACTION': False,
     'APP_MODULES': [],
     'MIDDLEWARE': [],
@@ -118,9 +121,49 @@ DEFAULT_SETTINGS = {
     "THROTTLE_CACHES_ENGINE_NAME": "default",  # 缓存
     'DEFAULT_THROTTLE_CLASSES': (),
     'DEFAULT_THROTTLE_RATES': ('15/min', '100/hour'),
+    # timing
+    'TIMING_ENABLED': False,
+    'TIMING_SERVER_HEADER': False,
+    'TIMING_SINKS': (),
+    # metrics
+    'METRICS_ENABLED': False,
+    'METRICS_MULTIPROCESS_DIR': None,
+    'METRICS_FLUSH_INTERVAL': 5,
+    # query log
+    'QUERY_LOG_ENABLED': False,
+    'QUERY_REPEAT_THRESHOLD': 10,
+    # renderers
+    'RENDERER_CLASSES': ('rest_framework.response.JSONRenderer',),
+    'JSON_PRETTY': False,
+    'JSON_DATETIME_FORMAT': 'timestamp',  # timestamp | iso
+    # bodies of at least this many estimated values (rows × fields) are rendered in a thread pool, None disables it
+    'RENDER_OFFLOAD_THRESHOLD': 50000,
+    'RENDER_WORKERS': 2,
+    'RENDER_CHUNK_ROWS': 1000,
+    # request parsing, None disables the limit (Sanic's REQUEST_MAX_SIZE still applies)
+    'REQUEST_MAX_BODY_SIZE': None,
+    'REQUEST_MAX_JSON_DEPTH': 64,
+    # characters of one element of a streamed JSON array (request.iter_json_array), None disables the limit
+    'REQUEST_MAX_JSON_ELEMENT_SIZE': 1024 * 1024,
+    # rows written per batch by streamed bulk uploads (ListSerializer.stream_create)
+    'BULK_BATCH_SIZE': 500,
+    # conditional GET: ETag / If-None-Match on list and retrieve
+    'ETAG_ENABLED': True,
+    # compression (rest_framework.middleware.CompressionMiddleware)
+    'COMPRESSION_MIN_SIZE': 1024,
+    'COMPRESSION_OFFLOAD_SIZE': 128 * 1024,
+    'COMPRESSION_LEVEL': 6,
+    'COMPRESSION_WORKERS': 2,
 }
 
-IMPORT_STRINGS = ['DEFAULT_AUTHENTICATION_CLASSES', 'DEFAULT_PERMISSION_CLASSES', 'DEFAULT_THROTTLE_CLASSES', 'MIDDLEWARE']
+IMPORT_STRINGS = [
+    'DEFAULT_AUTHENTICATION_CLASSES',
+    'DEFAULT_PERMISSION_CLASSES',
+    'DEFAULT_THROTTLE_CLASSES',
+    'MIDDLEWARE',
+    'TIMING_SINKS',
+    'RENDERER_CLASSES',
+]
 
 
 class Settings:
@@ -0,0 +1,49 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/20-00:20
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    signals.py
+    模型写操作的监听，Mixin 完成写操作后通知监听者(树缓存、全文索引等)
+@ChangeHistory:
+    datetime action why
+    2026/10/20-00:20 [Create] signals.py
+    2026/10/20-01:00 [Change] 支持监听全部模型的写操作(查询集缓存)
+"""
+from collections import defaultdict
+
+# {model: [async listener(request, saved, deleted, rebuild)]},
+# the listeners of None listen to the writes of all the models and are given the model first
+write_listeners = defaultdict(list)
+
+
+def connect_writes(model, listener):
+    """
+    Calls `listener` after the writes of the mixins on `model`, once however often it is connected.
+    With `model` None it is called after the writes on every model as `listener(model, request, saved, deleted, rebuild)`.
+    """
+    if listener not in write_listeners[model]:
+        write_listeners[model].append(listener)
+
+
+def disconnect_writes(model, listener):
+    if listener in write_listeners.get(model, ()):
+        write_listeners[model].remove(listener)
+
+
+def has_write_listeners(model):
+    """Whether listeners of `model` itself are connected, the listeners of all the models are not counted"""
+    return bool(write_listeners.get(model))
+
+
+async def model_written(model, request, saved=(), deleted=(), rebuild=False):
+    """
+    Notifies the listeners of `model` of a write: the `saved` instances were created or updated and the rows
+    of the `deleted` primary keys were deleted. `rebuild` when the written rows are not known.
+    """
+    for listener in tuple(write_listeners.get(model, ())):
+        await listener(request, saved, deleted, rebuild)
+    for listener in tuple(write_listeners.get(None, ())):
+        await listener(model, request, saved, deleted, rebuild)
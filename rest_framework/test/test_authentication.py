@@ -0,0 +1,168 @@
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import jwt
+from tortoise import Tortoise, fields, models
+
+from rest_framework.authentication import BaseTokenAuthenticate, ClaimsCache, TokenDenyList
+from rest_framework.cache.backends.base import cache_manager
+from rest_framework.exceptions import AuthenticationDenied
+from rest_framework.signals import model_written
+
+
+# HMAC keys shorter than the digest are warned about by PyJWT
+SECRET = 'secret' * 6
+
+
+class AuthUser(models.Model):
+    name = fields.CharField(max_length=32)
+
+
+class CountingAuthenticate(BaseTokenAuthenticate):
+    def __init__(self):
+        self.decodes = 0
+
+    def decode_token(self, token, token_secret):
+        self.decodes += 1
+        return super().decode_token(token, token_secret)
+
+
+class UserAuthenticate(CountingAuthenticate):
+    user_cache = 'default'
+    user_model = AuthUser
+
+    def __init__(self):
+        super().__init__()
+        self.loads = 0
+
+    async def load_user(self, token_info):
+        self.loads += 1
+        return await AuthUser.get_or_none(id=token_info['user_id'])
+
+
+def make_request(token, secret=SECRET):
+    app = SimpleNamespace(config=SimpleNamespace(TOKEN_SECRET=secret))
+    return SimpleNamespace(headers={'Authorization': f'Bearer {token}'}, app=app)
+
+
+def make_token(secret=SECRET, algorithm='HS256', **claims):
+    return jwt.encode({'user_id': 1, 'exp': int(time.time()) + 100, **claims}, secret, algorithm=algorithm)
+
+
+class TestClaimsCache(unittest.TestCase):
+    def test_expires_at_exp(self):
+        cache = ClaimsCache()
+        exp = time.time() + 100
+        cache.set('token', {'exp': exp})
+        self.assertEqual(cache.get('token'), {'exp': exp})
+        with mock.patch('rest_framework.authentication.time.time', return_value=exp):
+            self.assertIsNone(cache.get('token'))
+        self.assertEqual(len(cache), 0)
+        # Claims without `exp` are kept until evicted
+        cache.set('forever', {})
+        self.assertEqual(cache.get('forever'), {})
+
+    def test_least_recently_used_evicted(self):
+        cache = ClaimsCache(2)
+        cache.set('a', {'user_id': 1})
+        cache.set('b', {'user_id': 2})
+        cache.get('a')
+        cache.set('c', {'user_id': 3})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), {'user_id': 1})
+
+        disabled = ClaimsCache(0)
+        disabled.set('a', {})
+        self.assertIsNone(disabled.get('a'))
+
+
+class TestTokenClaims(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        CountingAuthenticate.claims_cache.clear()
+        self.authenticator = CountingAuthenticate()
+
+    async def test_verified_once(self):
+        token = make_token()
+        for _ in range(3):
+            self.assertEqual((await self.authenticator.get_token_claims(make_request(token), token))['user_id'], 1)
+        self.assertEqual(self.authenticator.decodes, 1)
+        # The claims handed out are copies of the cached ones
+        claims = await self.authenticator.get_token_claims(make_request(token), token)
+        claims['user_id'] = 2
+        self.assertEqual((await self.authenticator.get_token_claims(make_request(token), token))['user_id'], 1)
+
+        token = make_token(exp=int(time.time()) - 1)
+        with self.assertRaises(AuthenticationDenied) as context:
+            await self.authenticator.get_token_claims(make_request(token), token)
+        self.assertEqual(context.exception.message, 'Login timeout.')
+        self.assertEqual(len(CountingAuthenticate.claims_cache), 1)
+
+    async def test_secret_and_algorithms_in_the_key(self):
+        token = make_token()
+        await self.authenticator.get_token_claims(make_request(token), token)
+        with self.assertRaises(AuthenticationDenied) as context:
+            await self.authenticator.get_token_claims(make_request(token, secret='rotated' * 6), token)
+        self.assertEqual(context.exception.message, 'Invalid Token.')
+
+        self.authenticator.algorithms = ('HS512',)
+        with self.assertRaises(AuthenticationDenied):
+            await self.authenticator.get_token_claims(make_request(token), token)
+        self.assertEqual(self.authenticator.decodes, 3)
+
+    async def test_revoked_while_cached(self):
+        for deny_list in (TokenDenyList(), TokenDenyList('default')):
+            with self.subTest(alias=deny_list.alias):
+                self.authenticator.deny_list = deny_list
+                token = make_token(jti=f'jti-{deny_list.alias}')
+                await self.authenticator.authenticate(make_request(token), None)
+                await deny_list.revoke(token)
+                with self.assertRaises(AuthenticationDenied) as context:
+                    await self.authenticator.authenticate(make_request(token), None)
+                self.assertEqual(context.exception.message, 'Token has been revoked.')
+                # Refused without verifying the token again
+                self.assertEqual(self.authenticator.decodes, 1)
+                CountingAuthenticate.claims_cache.clear()
+                self.authenticator.decodes = 0
+
+        # Tokens without `jti` are revoked by their digest
+        deny_list = TokenDenyList()
+        token = make_token()
+        await deny_list.revoke(token)
+        self.assertTrue(await deny_list.is_revoked(token, {}))
+        self.assertFalse(await deny_list.is_revoked(make_token(user_id=2), {}))
+
+
+class TestUserCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        await cache_manager.get_cache('default').clear()
+        self.user = await AuthUser.create(name='ann')
+        self.authenticator = UserAuthenticate()
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def authenticate(self):
+        request = make_request(make_token(user_id=self.user.pk))
+        await self.authenticator.authenticate(request, None)
+        return request.user
+
+    async def test_written_user_invalidated(self):
+        self.assertEqual((await self.authenticate()).name, 'ann')
+        self.assertEqual((await self.authenticate()).name, 'ann')
+        self.assertEqual(self.authenticator.loads, 1)
+
+        self.user.name = 'bob'
+        await self.user.save()
+        # Saved by one of the mixins
+        await model_written(AuthUser, None, saved=[self.user])
+        self.assertEqual((await self.authenticate()).name, 'bob')
+        self.assertEqual(self.authenticator.loads, 2)
+
+        await UserAuthenticate.invalidate_user(self.user.pk)
+        await self.authenticate()
+        self.assertEqual(self.authenticator.loads, 3)
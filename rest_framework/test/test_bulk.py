@@ -0,0 +1,337 @@
+import unittest
+
+import orjson
+from sanic import Sanic
+from tortoise import Tortoise, fields, models
+
+from rest_framework.exception_handlers import catch_serializer_validation_exc
+from rest_framework.exceptions import PermissionDenied, ValidationException
+from rest_framework.mixins import BulkDestroyModelMixin, BulkUpdateModelMixin, CreateModelMixin, DestroyModelMixin
+from rest_framework.permissions import BasePermission
+from rest_framework.querylog import assert_num_queries
+from rest_framework.request import SRFRequest
+from rest_framework.serializers import BulkUpdateListSerializer, ModelSerializer
+from rest_framework.viewsets import GenericViewSet
+
+
+class BulkTag(models.Model):
+    name = fields.CharField(max_length=32)
+
+
+class BulkBook(models.Model):
+    title = fields.CharField(max_length=32)
+    pages = fields.IntField(default=0)
+    tags = fields.ManyToManyField('models.BulkTag', related_name='books')
+    updated_at = fields.DatetimeField(auto_now=True)
+
+
+class BookSerializer(ModelSerializer):
+    class Meta:
+        model = BulkBook
+        fields = ('id', 'title', 'pages')
+
+
+class BulkBookSerializer(ModelSerializer):
+    class Meta:
+        model = BulkBook
+        fields = ('id', 'title', 'pages')
+        bulk_create = True
+
+
+async def aiter(items):
+    for item in items:
+        yield item
+
+
+class TestStreamCreate(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def test_batches(self):
+        serializer = BookSerializer(many=True)
+        batches = []
+        bulk_create = serializer.child.bulk_create
+
+        async def record(validated_data, batch_size=None):
+            batches.append(len(validated_data))
+            return await bulk_create(validated_data, batch_size)
+
+        serializer.child.bulk_create = record
+        items = ({'title': f'book {index}'} for index in range(7))
+        self.assertEqual(await serializer.stream_create(aiter(items), batch_size=3, pages=10), 7)
+        self.assertEqual(batches, [3, 3, 1])
+        self.assertEqual(await BulkBook.filter(pages=10).count(), 7)
+
+    async def test_errors_roll_back(self):
+        items = [{'title': 'first'}] * 3 + [{'pages': 1}, {'title': 'ok'}, {'title': 'x' * 40}]
+        with self.assertRaises(ValidationException) as captured:
+            await BookSerializer(many=True).stream_create(aiter(items), batch_size=2)
+        errors = captured.exception.error_detail
+        self.assertEqual(len(errors), 6)
+        self.assertEqual(errors[:3], [{}, {}, {}])
+        self.assertIn('title', errors[3])
+        self.assertIn('title', errors[5])
+        self.assertEqual(await BulkBook.all().count(), 0)
+
+    async def test_empty(self):
+        with self.assertRaises(ValidationException):
+            await BookSerializer(many=True).stream_create(aiter([]))
+        self.assertEqual(await BookSerializer(many=True, allow_null=True).stream_create(aiter([])), 0)
+
+
+class TestBulkCreate(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def test_list_serializer_uses_bulk_create(self):
+        data = [{'title': f'book {index}', 'pages': index} for index in range(5)]
+        serializer = BulkBookSerializer(data=data, many=True)
+        await serializer.is_valid(raise_exception=True)
+        with assert_num_queries(2):
+            instances = await BulkBookSerializer(many=True).child.bulk_create(serializer.validated_data, batch_size=3)
+        self.assertEqual([instance.title for instance in instances], [item['title'] for item in data])
+
+        await serializer.save()
+        self.assertEqual(await BulkBook.all().count(), 10)
+
+    async def test_many_to_many(self):
+        tags = [await BulkTag.create(name=name) for name in ('a', 'b', 'c')]
+        data = [
+            {'title': 'none', 'tags': []},
+            {'title': 'ab', 'tags': tags[:2]},
+            {'title': 'c', 'tags': [tags[2].pk]},
+        ]
+        instances = await BulkBookSerializer().bulk_create(data, batch_size=1)
+        self.assertIsNotNone(instances[1].pk)
+        books = {book.title: book for book in await BulkBook.all().prefetch_related('tags')}
+        self.assertEqual({tag.name for tag in books['ab'].tags}, {'a', 'b'})
+        self.assertEqual([tag.name for tag in books['c'].tags], ['c'])
+        self.assertEqual(list(books['none'].tags), [])
+
+    async def test_rolls_back(self):
+        with self.assertRaises(ValueError):
+            await BulkBookSerializer().bulk_create([{'title': 'ok'}, {'title': 'bad', 'tags': [1000]}])
+        self.assertEqual(await BulkBook.all().count(), 0)
+
+
+class UpdateBookSerializer(ModelSerializer):
+    class Meta:
+        model = BulkBook
+        fields = ('id', 'title', 'pages')
+        list_serializer_class = BulkUpdateListSerializer
+
+
+class TestBulkUpdate(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        await BulkBook.bulk_create([BulkBook(title=f'book {index}', pages=index) for index in range(1, 6)])
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def test_update(self):
+        before = {book.id: book.updated_at for book in await BulkBook.all()}
+        data = [{'id': 1, 'title': 'one'}, {'id': 2, 'pages': 20}, {'id': 3, 'title': 'three'}, {'id': 4, 'pages': 4}]
+        serializer = UpdateBookSerializer(BulkBook.all(), data=data, many=True, partial=True)
+        # One SELECT for the items, one UPDATE per set of changed columns, item 4 is unchanged
+        with assert_num_queries(3):
+            await serializer.is_valid(raise_exception=True)
+            await serializer.save()
+        self.assertEqual([item['id'] for item in await serializer.data], [1, 2, 3, 4])
+
+        books = {book.id: book for book in await BulkBook.all()}
+        self.assertEqual((books[1].title, books[1].pages), ('one', 1))
+        self.assertEqual((books[2].title, books[2].pages), ('book 2', 20))
+        self.assertEqual(books[3].title, 'three')
+        self.assertGreater(books[1].updated_at, before[1])
+        self.assertEqual(books[4].updated_at, before[4])
+
+    async def test_errors(self):
+        data = [{'id': 1, 'title': 'ok'}, {'title': 'no id'}, {'id': 99}, {'id': 1}, {'id': 2, 'title': 'x' * 40}]
+        serializer = UpdateBookSerializer(BulkBook.filter(id__lt=5), data=data, many=True, partial=True)
+        self.assertFalse(await serializer.is_valid())
+        errors = serializer.errors
+        self.assertEqual(errors[0], {})
+        self.assertIn('id', errors[1])
+        self.assertIn('id', errors[2])
+        self.assertIn('id', errors[3])
+        self.assertIn('title', errors[4])
+        self.assertEqual((await BulkBook.get(id=1)).title, 'book 1')
+
+    async def test_lookup_values_as_the_field_holds_them(self):
+        data = [{'id': '1', 'title': 'one'}, {'id': 2, 'title': 'two'}]
+        serializer = UpdateBookSerializer(BulkBook.all(), data=data, many=True, partial=True)
+        await serializer.is_valid(raise_exception=True)
+        await serializer.save()
+        self.assertEqual([book.title for book in await BulkBook.filter(id__in=[1, 2]).order_by('id')], ['one', 'two'])
+
+        data = [{'id': True, 'title': 'bool'}, {'id': 'x'}, {'id': 1.0}, {'id': '3'}, {'id': 3}]
+        serializer = UpdateBookSerializer(BulkBook.all(), data=data, many=True, partial=True)
+        self.assertFalse(await serializer.is_valid())
+        errors = serializer.errors
+        for index in range(3):
+            self.assertIn('not valid', str(errors[index]['id']))
+        self.assertEqual(errors[3], {})
+        self.assertIn('more than once', str(errors[4]['id']))
+        self.assertEqual((await BulkBook.get(id=1)).title, 'one')
+
+
+class BookUpdateViewSet(BulkUpdateModelMixin, GenericViewSet):
+    serializer_class = BookSerializer
+
+
+class TestBulkUpdateView(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        await BulkBook.bulk_create([BulkBook(title=f'book {index}', pages=index) for index in range(3)])
+        self.app = Sanic('bulk_update_test', request_class=SRFRequest, configure_logging=False)
+        self.app.error_handler.add(ValidationException, catch_serializer_validation_exc)
+        BookUpdateViewSet.queryset = BulkBook.all()
+        view = BookUpdateViewSet.as_view({'put': 'bulk_update', 'patch': 'partial_bulk_update'})
+        self.app.add_route(view, '/books', methods=['PUT', 'PATCH'])
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def test_partial_bulk_update(self):
+        _, response = await self.app.asgi_client.patch('/books', json=[{'id': 1, 'pages': 10}, {'id': 2, 'title': 'two'}])
+        self.assertEqual(response.status, 200, response.text)
+        self.assertEqual([item['id'] for item in response.json['data']], [1, 2])
+        self.assertEqual((await BulkBook.get(id=1)).pages, 10)
+        self.assertEqual((await BulkBook.get(id=2)).title, 'two')
+
+        _, response = await self.app.asgi_client.put('/books', json=[{'id': 1, 'title': 'one'}])
+        self.assertIn('pages', response.json['data'][0])
+
+
+class BookViewSet(CreateModelMixin, BulkUpdateModelMixin, GenericViewSet):
+    serializer_class = BookSerializer
+    stream_upload = True
+    stream_batch_size = 2
+
+
+class TestStreamUpload(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        self.app = Sanic('bulk_test', request_class=SRFRequest, configure_logging=False)
+        BookViewSet.queryset = BulkBook.all()
+        view = BookViewSet.as_view({'post': 'create', 'put': 'bulk_update'})
+        self.app.add_route(view, '/books', methods=['POST', 'PUT'])
+        self.app.error_handler.add(ValidationException, catch_serializer_validation_exc)
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def test_streamed_body(self):
+        self.assertTrue(BookViewSet.as_view({'post': 'create'}).is_stream)
+        self.assertFalse(hasattr(BookViewSet.as_view({'get': 'list'}), 'is_stream'))
+
+        body = orjson.dumps([{'title': f'book {index}', 'pages': index} for index in range(5)])
+        _, response = await self.app.asgi_client.post('/books', content=body)
+        self.assertEqual(response.status, 200, response.text)
+        self.assertEqual(response.json['data'], {'count': 5})
+        self.assertEqual(await BulkBook.all().count(), 5)
+
+        _, response = await self.app.asgi_client.post('/books', content=b'[{"title": "a"}, {"pages": 1}]')
+        self.assertEqual(response.json['data'][0], {})
+        self.assertIn('title', response.json['data'][1])
+        self.assertEqual(await BulkBook.all().count(), 5)
+
+        _, response = await self.app.asgi_client.post('/books', content=b'{"title": "a"}')
+        self.assertEqual(response.status, 400)
+
+    async def test_body_of_other_actions(self):
+        await BulkBook.bulk_create([BulkBook(title=f'book {index}', pages=index) for index in range(2)])
+        # The route streams `create`, the body of `bulk_update` is read before handling it
+        _, response = await self.app.asgi_client.put('/books', json=[{'id': 1, 'title': 'one', 'pages': 10}])
+        self.assertEqual(response.status, 200, response.text)
+        self.assertEqual([item['id'] for item in response.json['data']], [1])
+        self.assertEqual((await BulkBook.get(id=1)).pages, 10)
+
+
+class PagesPermission(BasePermission):
+    async def has_object_permission(self, request, view, obj):
+        if obj.pages >= 100:
+            raise PermissionDenied()
+
+
+class BookDestroyViewSet(DestroyModelMixin, BulkDestroyModelMixin, GenericViewSet):
+    serializer_class = BookSerializer
+    search_fields = ('<=pages',)
+    destroy_return_data = False
+
+
+class IdsDestroyViewSet(BookDestroyViewSet):
+    bulk_destroy_return_ids = True
+
+
+class CheckedDestroyViewSet(BookDestroyViewSet):
+    permission_classes = (PagesPermission,)
+
+
+class TestBulkDestroy(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        await BulkBook.bulk_create([BulkBook(title=f'book {index}', pages=index) for index in range(1, 11)])
+        self.app = Sanic('bulk_destroy_test', request_class=SRFRequest, configure_logging=False)
+        for prefix, viewset in (('books', BookDestroyViewSet), ('ids', IdsDestroyViewSet), ('checked', CheckedDestroyViewSet)):
+            viewset.queryset = BulkBook.all()
+            self.app.add_route(viewset.as_view({'delete': 'bulk_destroy'}), f'/{prefix}', methods=['DELETE'])
+        self.app.add_route(BookDestroyViewSet.as_view({'delete': 'destroy'}), '/books/<pk:int>', methods=['DELETE'])
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def delete(self, uri, content=b''):
+        # httpx does not send a body with .delete()
+        return await self.app.asgi_client.request('DELETE', uri, content=content)
+
+    async def test_lookups(self):
+        with assert_num_queries(1):
+            _, response = await self.delete('/books', content=b'[1, 2, 3, 99]')
+        self.assertEqual(response.json['data'], {'count': 3}, response.text)
+        self.assertEqual(await BulkBook.filter(id__in=[1, 2, 3]).count(), 0)
+
+        _, response = await self.delete('/ids', content=b'[4, 5, 99]')
+        self.assertEqual(response.json['data'], {'count': 2, 'ids': [4, 5]})
+
+    async def test_filter(self):
+        _, response = await self.app.asgi_client.delete('/books', params={'pages': 4})
+        self.assertEqual(response.json['data'], {'count': 4}, response.text)
+        self.assertEqual(await BulkBook.filter(pages__lte=4).count(), 0)
+
+    async def test_refused(self):
+        for content in (b'', b'[]', b'[[1]]', b'{"id": 1}'):
+            with self.subTest(content=content):
+                _, response = await self.delete('/books', content=content)
+                self.assertEqual(response.status, 400)
+        self.assertEqual(await BulkBook.all().count(), 10)
+
+    async def test_object_permissions(self):
+        await BulkBook.filter(id=2).update(pages=100)
+        # One SELECT to check the rows, nothing is deleted when one of them is denied
+        with assert_num_queries(1):
+            _, response = await self.delete('/checked', content=b'[1, 2]')
+        self.assertEqual(response.status, 403)
+        self.assertEqual(await BulkBook.all().count(), 10)
+
+        _, response = await self.delete('/checked', content=b'[1, 3]')
+        self.assertEqual(response.json['data'], {'count': 2})
+
+    async def test_destroy_without_data(self):
+        _, response = await self.app.asgi_client.delete('/books/1')
+        self.assertEqual(response.status, 200, response.text)
+        self.assertEqual(response.json['data'], {})
+        self.assertFalse(await BulkBook.exists(id=1))
@@ -0,0 +1,131 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from tortoise import Tortoise, fields, models
+
+from rest_framework.conditional import body_etag, etag_matches, make_etag, parse_etags
+from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.querylog import assert_num_queries
+from rest_framework.serializers import ModelSerializer
+from rest_framework.settings import srf_settings
+
+
+class EtagArticle(models.Model):
+    title = fields.CharField(max_length=32)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+
+class ArticleSerializer(ModelSerializer):
+    class Meta:
+        model = EtagArticle
+        fields = ('id', 'title')
+
+
+class ArticleListView(ListAPIView):
+    serializer_class = ArticleSerializer
+
+
+class VersionedArticleListView(ArticleListView):
+    etag_field = 'updated_at'
+
+
+class ArticleView(RetrieveAPIView):
+    serializer_class = ArticleSerializer
+
+
+class VersionedArticleView(ArticleView):
+    etag_field = 'updated_at'
+
+
+def make_request(if_none_match=None, query_string='', **args):
+    headers = {'if-none-match': if_none_match} if if_none_match else {}
+    return SimpleNamespace(method='GET', headers=headers, args=args, query_string=query_string)
+
+
+class TestEtags(unittest.TestCase):
+    def test_make_etag(self):
+        self.assertEqual(make_etag('a', 1), make_etag('a', 1))
+        self.assertNotEqual(make_etag('a', 1), make_etag('a1'))
+        self.assertRegex(body_etag(b'{}'), r'^"[0-9a-f]{32}"$')
+
+    def test_if_none_match(self):
+        etag = make_etag('a')
+        self.assertEqual(parse_etags(f'"x", W/{etag}'), ('"x"', etag))
+        self.assertTrue(etag_matches(make_request(f'"x", W/{etag}'), etag))
+        self.assertTrue(etag_matches(make_request('*'), etag))
+        self.assertTrue(etag_matches(make_request(etag), f'W/{etag}'))
+        self.assertFalse(etag_matches(make_request('"x"'), etag))
+        self.assertFalse(etag_matches(make_request(), etag))
+
+
+class TestConditionalGet(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        for index in range(3):
+            await EtagArticle.create(title=f'article {index}')
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+        srf_settings.__dict__.pop('ETAG_ENABLED', None)
+
+    async def request(self, view_class, request, **kwargs):
+        view = view_class()
+        view.queryset = EtagArticle.all().order_by('id')
+        view.request, view.kwargs, view.action = request, kwargs, 'retrieve' if kwargs else 'list'
+        return await view.dispatch(request, **kwargs)
+
+    async def test_body_etag(self):
+        response = await self.request(ArticleListView, make_request())
+        etag = response.headers['etag']
+        self.assertEqual(etag, body_etag(response.body))
+
+        response = await self.request(ArticleListView, make_request(etag))
+        self.assertEqual(response.status, 304)
+        self.assertFalse(response.body)
+        self.assertEqual(response.headers['etag'], etag)
+
+        await EtagArticle.filter(id=1).update(title='changed')
+        response = await self.request(ArticleListView, make_request(etag))
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.headers['etag'], etag)
+
+    async def test_disabled(self):
+        srf_settings.ETAG_ENABLED = False
+        response = await self.request(VersionedArticleView, make_request('*'), pk=1)
+        self.assertEqual(response.status, 200)
+        self.assertNotIn('etag', response.headers)
+
+    async def test_versioned_retrieve_skips_serialization(self):
+        response = await self.request(VersionedArticleView, make_request(), pk=1)
+        etag = response.headers['etag']
+
+        with mock.patch.object(VersionedArticleView, 'get_serializer', side_effect=AssertionError('serialized')):
+            with assert_num_queries(1):
+                response = await self.request(VersionedArticleView, make_request(etag), pk=1)
+        self.assertEqual(response.status, 304)
+
+        article = await EtagArticle.get(id=1)
+        article.title = 'changed'
+        await article.save()
+        response = await self.request(VersionedArticleView, make_request(etag), pk=1)
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.headers['etag'], etag)
+
+    async def test_versioned_list(self):
+        response = await self.request(VersionedArticleListView, make_request(query_string='page=1', page='1'))
+        etag = response.headers['etag']
+
+        with mock.patch.object(VersionedArticleListView, 'get_serializer', side_effect=AssertionError('serialized')):
+            response = await self.request(VersionedArticleListView, make_request(etag, query_string='page=1', page='1'))
+        self.assertEqual(response.status, 304)
+
+        # Same rows, another representation
+        response = await self.request(VersionedArticleListView, make_request(etag, query_string='page=1&pretty=1', page='1', pretty='1'))
+        self.assertEqual(response.status, 200)
+
+        # A new row changes the total count of the first page
+        await EtagArticle.create(title='new')
+        response = await self.request(VersionedArticleListView, make_request(etag, query_string='page=1', page='1'))
+        self.assertEqual(response.status, 200)
@@ -0,0 +1,230 @@
+import datetime
+import unittest
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from sanic import Sanic
+from sanic.request import RequestParameters
+from tortoise import Tortoise, fields, models
+
+from rest_framework.exceptions import APIException
+from rest_framework.filters import (
+    FullTextSearchFilter, OrderingFilter, ORMAndFilter, ORMOrFilter, get_fulltext_index, get_indexed_fields, is_empty_filter
+)
+from rest_framework.mixins import BulkDestroyModelMixin, CreateModelMixin, DestroyModelMixin, ListModelMixin, UpdateModelMixin
+from rest_framework.request import SRFRequest
+from rest_framework.serializers import ModelSerializer
+from rest_framework.viewsets import GenericViewSet
+
+
+class FilterAuthor(models.Model):
+    name = fields.CharField(max_length=32)
+
+
+class FilterBook(models.Model):
+    title = fields.CharField(max_length=32)
+    summary = fields.TextField(default='')
+    pages = fields.IntField(default=0, db_index=True)
+    published = fields.BooleanField(default=False)
+    released_at = fields.DatetimeField(null=True)
+    author = fields.ForeignKeyField('models.FilterAuthor', related_name='books', null=True)
+
+    class Meta:
+        unique_together = (('released_at', 'title'),)
+
+
+class BookView:
+    queryset = SimpleNamespace(model=FilterBook)
+    search_fields = ('@title', '>=pages:min_pages', 'published', 'released_at__gte:since', 'id__in:ids', 'author', 'author__name')
+
+
+class SearchBookSerializer(ModelSerializer):
+    class Meta:
+        model = FilterBook
+        fields = ('id', 'title', 'summary', 'pages')
+
+
+class SearchBookViewSet(ListModelMixin, CreateModelMixin, UpdateModelMixin, DestroyModelMixin, BulkDestroyModelMixin, GenericViewSet):
+    serializer_class = SearchBookSerializer
+    pagination_class = None
+    filter_backends = (FullTextSearchFilter,)
+    search_fts_fields = ('title', 'summary')
+    search_fields = ('>=pages:min_pages',)
+
+
+def make_filter(query_string, filter_class=ORMAndFilter, view=BookView):
+    request = SimpleNamespace(args=RequestParameters(parse_qs(query_string, keep_blank_values=True)))
+    return filter_class(request, view)
+
+
+class TestFilterPlan(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        author = await FilterAuthor.create(name='ann')
+        await FilterBook.create(title='Python', pages=300, published=True, author=author)
+        await FilterBook.create(title='Go', pages=100)
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    def test_compiled_once(self):
+        plan = ORMAndFilter.get_plan(FilterBook, BookView.search_fields)
+        self.assertIs(ORMAndFilter.get_plan(FilterBook, list(BookView.search_fields)), plan)
+        self.assertEqual(set(plan), {'title', 'min_pages', 'published', 'since', 'ids', 'author', 'author__name'})
+        self.assertEqual(plan['min_pages'][0].lookup, 'pages__gte')
+
+    def test_typed_values(self):
+        q = make_filter('title=py&min_pages=200&published=no&since=2026-01-01T00:00:00&author=1&author__name=ann').orm_filter
+        values = {key: value for child in q.children for key, value in child.filters.items()}
+        self.assertEqual(values, {
+            'title__icontains': 'py',
+            'pages__gte': 200,
+            'published': False,
+            'released_at__gte': datetime.datetime(2026, 1, 1),
+            'author': 1,
+            'author__name': 'ann',
+        })
+        since = make_filter('since=0').orm_filter.children[0].filters['released_at__gte']
+        self.assertEqual(since, datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc))
+
+    def test_absent_and_empty_values(self):
+        self.assertTrue(is_empty_filter(make_filter('other=1').orm_filter))
+        # Empty values only filter text
+        q = make_filter('min_pages=&title=').orm_filter
+        self.assertEqual([child.filters for child in q.children], [{'title__icontains': ''}])
+
+    def test_in(self):
+        q = make_filter('ids=1,2&ids=3').orm_filter
+        self.assertEqual(q.children[0].filters, {'id__in': [1, 2, 3]})
+
+    def test_invalid_value(self):
+        for query_string in ('min_pages=x', 'published=maybe', 'since=yesterday', 'ids=1,x'):
+            with self.subTest(query_string=query_string):
+                with self.assertRaises(APIException) as captured:
+                    make_filter(query_string).orm_filter
+                self.assertEqual(captured.exception.status, 400)
+
+    async def test_query(self):
+        books = FilterBook.all().order_by('id')
+        self.assertEqual(await books.filter(make_filter('min_pages=200&published=1').orm_filter).values_list('title', flat=True), ['Python'])
+        q = make_filter('min_pages=200&title=go', ORMOrFilter).orm_filter
+        self.assertEqual(await books.filter(q).values_list('title', flat=True), ['Python', 'Go'])
+
+    def test_to_openapi(self):
+        parameters = {parameter.fields['name']: parameter for parameter in ORMAndFilter.to_openapi(BookView)}
+        self.assertEqual(set(parameters), {'title', 'min_pages', 'published', 'since', 'ids', 'author', 'author__name'})
+
+
+class TestFullTextSearch(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        await FilterBook.create(title='Python tips', summary='fast code', pages=300)
+        await FilterBook.create(title='Go', summary='python, python and python rocks', pages=100)
+        await FilterBook.create(title='Rust', summary='safe code', pages=200)
+        self.app = Sanic('fts_test', request_class=SRFRequest, configure_logging=False)
+        SearchBookViewSet.queryset = FilterBook.all()
+        self.app.add_route(SearchBookViewSet.as_view({'get': 'list', 'post': 'create', 'delete': 'bulk_destroy'}), '/books', methods=['GET', 'POST', 'DELETE'])
+        view = SearchBookViewSet.as_view({'patch': 'partial_update', 'delete': 'destroy'})
+        self.app.add_route(view, '/books/<pk:int>', methods=['PATCH', 'DELETE'])
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def search(self, search, **params):
+        _, response = await self.app.asgi_client.get('/books', params={'search': search, **params})
+        self.assertEqual(response.status, 200, response.text)
+        return [book['title'] for book in response.json['data']]
+
+    async def test_search(self):
+        # Ranked, the summary of Go repeats the word
+        self.assertEqual(await self.search('python'), ['Go', 'Python tips'])
+        self.assertEqual(await self.search('PYTHON rocks'), ['Go'])
+        self.assertEqual(await self.search('code', min_pages=250), ['Python tips'])
+        self.assertEqual(await self.search('"python" OR -x*'), [])
+        self.assertEqual(len(await self.search('')), 3)
+
+    async def test_index_follows_writes(self):
+        _, response = await self.app.asgi_client.post('/books', json={'title': 'Elixir', 'summary': 'fast actors'})
+        self.assertEqual(response.status, 200, response.text)
+        elixir = response.json['data']['id']
+        self.assertEqual(await self.search('fast'), ['Elixir', 'Python tips'])
+
+        await self.app.asgi_client.patch(f'/books/{elixir}', json={'summary': 'actors'})
+        self.assertEqual(await self.search('fast'), ['Python tips'])
+
+        await self.app.asgi_client.delete(f'/books/{elixir}')
+        self.assertEqual(await self.search('actors'), [])
+        await self.app.asgi_client.request('DELETE', '/books', content=b'[1]')
+        self.assertEqual(await self.search('python'), ['Go'])
+
+    async def test_rebuild(self):
+        index = get_fulltext_index(FilterBook, SearchBookViewSet.search_fts_fields)
+        await self.search('python')
+        # Written without the mixins
+        await FilterBook.filter(title='Rust').update(summary='python bindings')
+        self.assertEqual(await self.search('bindings'), [])
+        await index.rebuild()
+        self.assertEqual(await self.search('bindings'), ['Rust'])
+
+
+class OrderingView:
+    ordering_fields = ('title', 'pages', 'released_at', 'author__name')
+    ordering = ('-pages',)
+
+
+class RefusingOrderingFilter(OrderingFilter):
+    unindexed_ordering = 'refuse'
+    unindexed_ordering_threshold = 2
+
+
+class TestOrderingFilter(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        for title, pages in (('b', 100), ('a', 100), ('c', 300), ('a', 200)):
+            await FilterBook.create(title=title, pages=pages)
+        OrderingFilter._row_counts.clear()
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def order(self, query_string, filter_class=OrderingFilter, queryset=None):
+        queryset = await make_filter(query_string, filter_class, OrderingView).filter_queryset(queryset or FilterBook.all())
+        return queryset._orderings, await queryset.values_list('id', flat=True)
+
+    def test_indexed_fields(self):
+        self.assertEqual(get_indexed_fields(FilterBook), {'id', 'pages', 'released_at'})
+        plan = OrderingFilter.get_plan(FilterBook, OrderingView.ordering_fields)
+        self.assertEqual([(term.indexed, term.unique) for term in plan.values()], [(False, False), (True, False), (True, False), (False, False)])
+
+    async def test_ordering(self):
+        orderings, ids = await self.order('ordering=title,-pages')
+        self.assertEqual([(field, order.value) for field, order in orderings], [('title', 'ASC'), ('pages', 'DESC'), ('id', 'DESC')])
+        self.assertEqual(ids, [4, 2, 1, 3])
+        # The default ordering, with the primary key in the same direction
+        _, ids = await self.order('')
+        self.assertEqual(ids, [3, 4, 2, 1])
+        # An ordered queryset is left as is without ?ordering=
+        _, ids = await self.order('', queryset=FilterBook.all().order_by('title', 'id'))
+        self.assertEqual(ids, [2, 4, 1, 3])
+
+    async def test_not_allowed(self):
+        for query_string in ('ordering=summary', 'ordering=-id'):
+            with self.subTest(query_string=query_string):
+                with self.assertRaises(APIException) as captured:
+                    await self.order(query_string)
+                self.assertEqual(captured.exception.status, 400)
+
+    async def test_unindexed(self):
+        with self.assertRaises(APIException):
+            await self.order('ordering=title', RefusingOrderingFilter)
+        _, ids = await self.order('ordering=pages', RefusingOrderingFilter)
+        self.assertEqual(ids, [1, 2, 4, 3])
+
+        with self.assertLogs('rest_framework.filters', 'WARNING') as logs:
+            await self.order('ordering=author__name', type('WarningOrderingFilter', (OrderingFilter,), {'unindexed_ordering_threshold': 2}))
+        self.assertIn('author__name', logs.output[0])
+        # Below the threshold
+        await self.order('ordering=title', type('SmallOrderingFilter', (RefusingOrderingFilter,), {'unindexed_ordering_threshold': 10}))
@@ -0,0 +1,179 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import unittest
+
+import jwt
+from jwt.algorithms import has_crypto
+
+from rest_framework import jwks
+from rest_framework.authentication import JWKSTokenAuthenticate
+from rest_framework.exceptions import AuthenticationDenied
+from rest_framework.jwks import JWKSet
+
+if has_crypto:
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+    from cryptography.hazmat.primitives import serialization
+    from jwt.algorithms import ECAlgorithm, OKPAlgorithm, RSAAlgorithm
+
+
+def make_jwk(kid, algorithm):
+    if algorithm == 'RS256':
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    elif algorithm == 'ES256':
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        jwk = ECAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+        jwk = OKPAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    return private_key, {**jwk, 'kid': kid, 'alg': algorithm, 'use': 'sig'}
+
+
+def b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def sign_hs256(payload, secret, kid):
+    """HS256 token signed with `secret`, PyJWT refuses to encode one with a PEM key"""
+    signing_input = '.'.join(
+        b64encode(json.dumps(part).encode()) for part in ({'alg': 'HS256', 'typ': 'JWT', 'kid': kid}, payload)
+    )
+    signature = hmac.new(secret, signing_input.encode(), hashlib.sha256).digest()
+    return f'{signing_input}.{b64encode(signature)}'
+
+
+class CountingAuthenticate(JWKSTokenAuthenticate):
+    def __init__(self):
+        self.decodes = 0
+
+    def decode_token(self, token, token_secret):
+        self.decodes += 1
+        return super().decode_token(token, token_secret)
+
+
+class RS256Authenticate(CountingAuthenticate):
+    algorithms = ('RS256',)
+
+
+class JWKSFileMixin:
+    """A key of every algorithm written to a JWKS file"""
+
+    def setUp(self):
+        self.keys = {algorithm: make_jwk(algorithm.lower(), algorithm) for algorithm in ('RS256', 'ES256', 'EdDSA')}
+        self.path = os.path.join(tempfile.mkdtemp(), 'jwks.json')
+        self.write(*self.keys.values())
+        self.key_set = JWKSet(self.path, check_interval=0)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write(self, *keys, mtime=None):
+        with open(self.path, 'w') as file:
+            json.dump({'keys': [jwk for _, jwk in keys]}, file)
+        if mtime is not None:
+            os.utime(self.path, ns=(mtime, mtime))
+
+
+@unittest.skipUnless(has_crypto, 'PyJWT[crypto] is not installed')
+class TestJWKSet(JWKSFileMixin, unittest.IsolatedAsyncioTestCase):
+    async def test_verifies_with_the_key_of_the_kid(self):
+        for algorithm, (private_key, jwk) in self.keys.items():
+            with self.subTest(algorithm=algorithm):
+                token = jwt.encode({'sub': 'a'}, private_key, algorithm=algorithm, headers={'kid': jwk['kid']})
+                key = await self.key_set.get_key(jwk['kid'])
+                self.assertEqual(key.algorithm_name, algorithm)
+                self.assertEqual(jwt.decode(token, key.key, algorithms=[key.algorithm_name])['sub'], 'a')
+        self.assertIsNone(await self.key_set.get_key('unknown'))
+        # Without a kid the only key of a set is used
+        self.assertIsNone(await self.key_set.get_key(None))
+
+    async def test_reloaded_on_change(self):
+        key = await self.key_set.get_key('rs256')
+        self.assertEqual(self.key_set.generation, 1)
+        # Unchanged, the parsed keys are kept
+        self.assertIs(await self.key_set.get_key('rs256'), key)
+        self.assertEqual(self.key_set.generation, 1)
+
+        self.write(self.keys['ES256'], mtime=os.stat(self.path).st_mtime_ns + 10 ** 9)
+        self.assertIsNone(await self.key_set.get_key('rs256'))
+        self.assertEqual(self.key_set.generation, 2)
+        self.assertIsNotNone(await self.key_set.get_key(None))
+
+        # A broken document keeps the previous keys
+        with open(self.path, 'w') as file:
+            file.write('{')
+        with self.assertLogs('rest_framework.jwks', 'ERROR'):
+            self.assertIsNotNone(await self.key_set.get_key('es256'))
+
+
+@unittest.skipUnless(has_crypto, 'PyJWT[crypto] is not installed')
+class TestJWKSTokenAuthenticate(JWKSFileMixin, unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        super().setUp()
+        # Shared with the authenticators, checking the file on every request
+        jwks.key_sets[self.path] = self.key_set
+        CountingAuthenticate.jwks_source = RS256Authenticate.jwks_source = self.path
+        CountingAuthenticate.claims_cache.clear()
+        RS256Authenticate.claims_cache.clear()
+
+    def tearDown(self):
+        jwks.key_sets.pop(self.path)
+        super().tearDown()
+
+    def encode(self, algorithm, kid=None, **claims):
+        private_key, jwk = self.keys[algorithm]
+        headers = {'kid': jwk['kid'] if kid is None else kid}
+        return jwt.encode({'user_id': 1, **claims}, private_key, algorithm=algorithm, headers=headers)
+
+    async def assert_denied(self, authenticator, token):
+        with self.assertRaises(AuthenticationDenied) as context:
+            await authenticator.get_token_claims(None, token)
+        self.assertEqual(context.exception.message, 'Invalid Token.')
+
+    async def test_verified_with_the_key_of_the_kid(self):
+        authenticator = CountingAuthenticate()
+        for algorithm in self.keys:
+            with self.subTest(algorithm=algorithm):
+                token = self.encode(algorithm)
+                self.assertEqual((await authenticator.get_token_claims(None, token))['user_id'], 1)
+                self.assertEqual((await authenticator.get_token_claims(None, token))['user_id'], 1)
+        self.assertEqual(authenticator.decodes, 3)
+
+        # Signed with the key of another kid, or with a kid missing from the set
+        await self.assert_denied(authenticator, self.encode('RS256', kid='es256'))
+        await self.assert_denied(authenticator, self.encode('RS256', kid='unknown'))
+        await self.assert_denied(authenticator, 'not a token')
+
+    async def test_algorithm_pinning(self):
+        authenticator = RS256Authenticate()
+        self.assertEqual((await authenticator.get_token_claims(None, self.encode('RS256')))['user_id'], 1)
+        # A valid signature with a key of an algorithm outside `algorithms`
+        await self.assert_denied(authenticator, self.encode('ES256'))
+        self.assertEqual(authenticator.decodes, 1)
+
+        # The public key used as an HMAC secret
+        public_key = self.keys['RS256'][0].public_key()
+        for encoding in (serialization.Encoding.PEM, serialization.Encoding.DER):
+            secret = public_key.public_bytes(encoding, serialization.PublicFormat.SubjectPublicKeyInfo)
+            await self.assert_denied(authenticator, sign_hs256({'user_id': 2}, secret, 'rs256'))
+            await self.assert_denied(CountingAuthenticate(), sign_hs256({'user_id': 2}, secret, 'rs256'))
+
+    async def test_verified_again_after_a_refresh(self):
+        authenticator = CountingAuthenticate()
+        token = self.encode('ES256')
+        await authenticator.get_token_claims(None, token)
+        await authenticator.get_token_claims(None, token)
+        self.assertEqual(authenticator.decodes, 1)
+
+        mtime = os.stat(self.path).st_mtime_ns
+        self.write(*self.keys.values(), make_jwk('new', 'RS256'), mtime=mtime + 10 ** 9)
+        await authenticator.get_token_claims(None, token)
+        self.assertEqual((authenticator.decodes, self.key_set.generation), (2, 2))
+
+        # Removed from the set, the cached claims of its tokens are not used anymore
+        self.write(self.keys['RS256'], mtime=mtime + 2 * 10 ** 9)
+        await self.assert_denied(authenticator, token)
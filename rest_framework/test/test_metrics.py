@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from tortoise import Tortoise, fields, models
+
+from rest_framework import metrics, timing
+from rest_framework.metrics import MetricsRegistry, MultiProcessStore
+from rest_framework.settings import srf_settings
+from rest_framework.views import APIView
+
+
+class MetricsBook(models.Model):
+    title = fields.CharField(max_length=32)
+
+
+class BookCountView(APIView):
+    async def get(self, request, *args, **kwargs):
+        return self.success_json_response(data={'count': await MetricsBook.all().count()})
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.counter = self.registry.counter('test_total', 'Test counter.', ('view',))
+        self.histogram = self.registry.histogram('test_seconds', 'Test histogram.', ('view',), buckets=(0.1, 1.0))
+
+    def test_prometheus_format(self):
+        self.counter.inc(view='Book')
+        self.counter.inc(2, view='Book')
+        self.histogram.observe(0.05, view='Book')
+        self.histogram.observe(0.5, view='Book')
+        self.histogram.observe(5, view='Book')
+        text = MetricsRegistry.to_prometheus(self.registry.collect())
+
+        self.assertIn('# TYPE test_total counter', text)
+        self.assertIn('test_total{view="Book"} 3', text)
+        self.assertIn('test_seconds_bucket{view="Book",le="0.1"} 1', text)
+        self.assertIn('test_seconds_bucket{view="Book",le="1.0"} 2', text)
+        self.assertIn('test_seconds_bucket{view="Book",le="+Inf"} 3', text)
+        self.assertIn('test_seconds_sum{view="Book"} 5.55', text)
+        self.assertIn('test_seconds_count{view="Book"} 3', text)
+
+    def test_label_escaping(self):
+        self.counter.inc(view='a"b\\c')
+        text = MetricsRegistry.to_prometheus(self.registry.collect())
+        self.assertIn('test_total{view="a\\"b\\\\c"} 1', text)
+
+    def test_merge_workers(self):
+        self.counter.inc(view='Book')
+        self.histogram.observe(0.5, view='Book')
+        with tempfile.TemporaryDirectory() as directory:
+            store = MultiProcessStore(directory)
+            store.write(self.registry.collect(), pid=1)
+            store.write(self.registry.collect())
+            merged = MetricsRegistry.merge(store.read_all())
+
+        self.assertEqual(merged['test_total']['samples'], [[['Book'], 2]])
+        self.assertEqual(merged['test_seconds']['samples'][0][1]['counts'], [0, 2, 0])
+
+
+class TestRequestMetrics(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        srf_settings.METRICS_ENABLED = True
+        timing._sinks = None
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+        srf_settings.__dict__.pop('METRICS_ENABLED', None)
+        timing._sinks = None
+
+    async def test_request_is_recorded(self):
+        before = metrics.DB_QUERIES._values.get(('BookCountView', ''), 0)
+        response = await BookCountView().dispatch(SimpleNamespace(method='GET'))
+        self.assertEqual(response.status, 200)
+
+        self.assertEqual(metrics.REQUESTS._values[('BookCountView', '', 'GET', '200')], 1)
+        self.assertEqual(metrics.DB_QUERIES._values[('BookCountView', '')], before + 1)
+        text = metrics.render_prometheus()
+        self.assertIn('srf_request_phase_duration_seconds_count{view="BookCountView",action="",phase="db"} 1', text)
@@ -0,0 +1,122 @@
+import gzip
+import threading
+import unittest
+import zlib
+from types import SimpleNamespace
+from unittest import mock
+
+from sanic import Sanic
+from sanic.response import HTTPResponse
+
+from rest_framework.cache.backends.locmem import LocMemCache
+from rest_framework.cache.core import ApiCacheEntry
+from rest_framework.middleware import CompressionMiddleware, gzip_compress
+from rest_framework.settings import srf_settings
+
+BODY = b'{"data":[' + b','.join(b'{"id":%d,"title":"Book %d"}' % (i, i) for i in range(200)) + b']}'
+
+
+def make_request(accept_encoding=None, api_cache=None):
+    headers = {'accept-encoding': accept_encoding} if accept_encoding else {}
+    ctx = SimpleNamespace()
+    if api_cache is not None:
+        ctx.api_cache = api_cache
+    return SimpleNamespace(headers=headers, ctx=ctx)
+
+
+def make_response(body=BODY, content_type='application/json', status=200):
+    return HTTPResponse(body, status=status, content_type=content_type)
+
+
+class TestCompressionMiddleware(unittest.IsolatedAsyncioTestCase):
+    app_count = 0
+
+    def setUp(self):
+        TestCompressionMiddleware.app_count += 1
+        self.middleware = CompressionMiddleware(Sanic(f'compression_test_{self.app_count}'))
+
+    async def asyncTearDown(self):
+        await self.middleware.shutdown(None, None)
+        for name in ('COMPRESSION_MIN_SIZE', 'COMPRESSION_OFFLOAD_SIZE'):
+            srf_settings.__dict__.pop(name, None)
+
+    async def test_negotiates_encoding(self):
+        response = make_response()
+        await self.middleware.handle_response(make_request('gzip, deflate'), response)
+        self.assertEqual(response.headers['content-encoding'], 'gzip')
+        self.assertEqual(response.headers['vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(response.body), BODY)
+
+        response = make_response()
+        await self.middleware.handle_response(make_request('br, gzip;q=0.5, deflate'), response)
+        self.assertEqual(response.headers['content-encoding'], 'deflate')
+        self.assertEqual(zlib.decompress(response.body), BODY)
+
+        response = make_response()
+        await self.middleware.handle_response(make_request('br, gzip;q=0'), response)
+        self.assertNotIn('content-encoding', response.headers)
+        self.assertEqual(response.headers['vary'], 'Accept-Encoding')
+        self.assertEqual(response.body, BODY)
+
+    async def test_skips_responses(self):
+        cases = (
+            make_response(body=b'{"data":[]}'),
+            make_response(content_type='image/png'),
+            make_response(status=304),
+        )
+        for response in cases:
+            await self.middleware.handle_response(make_request('gzip'), response)
+            self.assertNotIn('content-encoding', response.headers)
+            self.assertNotIn('vary', response.headers)
+
+        srf_settings.COMPRESSION_MIN_SIZE = 0
+        response = make_response(body=b'{"data":[]}')
+        await self.middleware.handle_response(make_request('gzip'), response)
+        self.assertEqual(response.headers['content-encoding'], 'gzip')
+
+    async def test_appends_vary(self):
+        response = make_response()
+        response.headers['vary'] = 'Accept'
+        await self.middleware.handle_response(make_request('gzip'), response)
+        self.assertEqual(response.headers['vary'], 'Accept, Accept-Encoding')
+
+    async def test_large_bodies_are_compressed_off_loop(self):
+        threads = []
+
+        def encoder(body, level):
+            threads.append(threading.current_thread())
+            return gzip_compress(body, level)
+
+        self.middleware.encoders = {'gzip': encoder}
+        srf_settings.COMPRESSION_OFFLOAD_SIZE = len(BODY) + 1
+        self.assertEqual(gzip.decompress(await self.middleware.compress(BODY, 'gzip')), BODY)
+        srf_settings.COMPRESSION_OFFLOAD_SIZE = len(BODY)
+        self.assertEqual(gzip.decompress(await self.middleware.compress(BODY, 'gzip')), BODY)
+        self.assertIs(threads[0], threading.current_thread())
+        self.assertTrue(threads[1].name.startswith('srf-compression'))
+
+    async def test_reuses_compressed_body_of_cached_response(self):
+        backend = LocMemCache('compression_test', {})
+        miss = ApiCacheEntry(backend, 'books', 60, False)
+        response = make_response()
+        await self.middleware.handle_response(make_request('gzip', miss), response)
+        compressed = await backend.get('books:gzip')
+        self.assertEqual(response.body, compressed)
+
+        hit = ApiCacheEntry(backend, 'books', 60, True)
+        with mock.patch.object(self.middleware, 'compress', side_effect=AssertionError('compressed again')):
+            response = make_response()
+            await self.middleware.handle_response(make_request('gzip', hit), response)
+        self.assertEqual(response.body, compressed)
+
+        # A fresh render drops bodies compressed from the previous one
+        await self.middleware.handle_response(make_request('deflate', hit), make_response())
+        self.assertIsNotNone(await backend.get('books:deflate'))
+        await self.middleware.handle_response(make_request('gzip', miss), make_response())
+        self.assertIsNone(await backend.get('books:deflate'))
+
+    async def test_weakens_etag(self):
+        response = make_response()
+        response.headers['etag'] = '"abc"'
+        await self.middleware.handle_response(make_request('gzip'), response)
+        self.assertEqual(response.headers['etag'], 'W/"abc"')
@@ -0,0 +1,71 @@
+import unittest
+
+from tortoise import Tortoise, fields, models
+
+from rest_framework.querylog import assert_num_queries
+from rest_framework.serializers import ModelSerializer
+
+
+class DirtyAuthor(models.Model):
+    name = fields.CharField(max_length=32)
+
+
+class DirtyBook(models.Model):
+    title = fields.CharField(max_length=32)
+    pages = fields.IntField(default=0)
+    author = fields.ForeignKeyField('models.DirtyAuthor', related_name='books', null=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+
+class BookSerializer(ModelSerializer):
+    class Meta:
+        model = DirtyBook
+        fields = ('id', 'title', 'pages', 'author')
+
+
+class TestDirtyFieldUpdate(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        self.authors = [await DirtyAuthor.create(name=name) for name in ('a', 'b')]
+        self.book = await DirtyBook.create(title='book', pages=10, author=self.authors[0])
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def update(self, data, **kwargs):
+        serializer = BookSerializer(self.book, data=data, partial=True)
+        await serializer.is_valid(raise_exception=True)
+        return serializer, await serializer.save(**kwargs)
+
+    async def test_writes_changed_columns(self):
+        serializer = BookSerializer(self.book, data={'title': 'new', 'pages': 10}, partial=True)
+        await serializer.is_valid(raise_exception=True)
+        self.assertEqual(serializer.changes, {'title': ('book', 'new')})
+
+        updated_at = self.book.updated_at
+        with assert_num_queries(1) as log:
+            await serializer.save()
+        sql = log.queries[0].sql
+        self.assertIn('"title"', sql)
+        self.assertIn('"updated_at"', sql)
+        self.assertNotIn('"pages"', sql)
+
+        book = await DirtyBook.get(id=self.book.id)
+        self.assertEqual((book.title, book.pages), ('new', 10))
+        self.assertGreater(book.updated_at, updated_at)
+
+    async def test_unchanged_skips_update(self):
+        with assert_num_queries(0):
+            serializer, instance = await self.update({'title': 'book', 'pages': 10})
+        self.assertEqual(serializer.changes, {})
+        self.assertIs(instance, self.book)
+
+    async def test_relations_and_save_kwargs(self):
+        serializer, _ = await self.update({'author': self.authors[1].pk}, pages=20)
+        self.assertEqual(serializer.changes, {'author_id': (self.authors[0].pk, self.authors[1].pk), 'pages': (10, 20)})
+        book = await DirtyBook.get(id=self.book.id)
+        self.assertEqual((book.author_id, book.pages), (self.authors[1].pk, 20))
+
+        serializer, _ = await self.update({'author': self.authors[1].pk})
+        self.assertEqual(serializer.changes, {})
@@ -0,0 +1,92 @@
+import unittest
+from types import SimpleNamespace
+
+from rest_framework.cache.backends.base import cache_manager
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import (
+    CodePermission, UserModelMixin, ViewMapPermission, get_user_permissions, invalidate_permissions
+)
+from rest_framework.settings import srf_settings
+
+
+class User(UserModelMixin):
+    def __init__(self, pk, codes):
+        self.pk = pk
+        self.codes = codes
+        self.loads = 0
+
+    async def get_permissions(self):
+        self.loads += 1
+        return self.codes
+
+
+class LegacyUser:
+    """Checks the codes itself, without listing them"""
+
+    def __init__(self, codes):
+        self.codes = set(codes)
+
+    async def has_permissions(self, codes):
+        return self.codes.issuperset(codes)
+
+
+class BookView:
+    permission_code = 'book.view'
+    permission_map = {'get': ['book.view'], 'delete': ['book.delete'], 'all': ['book']}
+
+
+def make_request(user, method='GET'):
+    return SimpleNamespace(user=user, method=method, ctx=SimpleNamespace())
+
+
+class TestPermissions(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        srf_settings.PERMISSION_CACHE = 'default'
+        await cache_manager.get_cache('default').clear()
+
+    async def asyncTearDown(self):
+        del srf_settings.PERMISSION_CACHE
+
+    async def assert_allowed(self, permission, request, allowed=True):
+        if allowed:
+            self.assertTrue(await permission.has_permission(request, BookView()))
+        else:
+            with self.assertRaises(PermissionDenied):
+                await permission.has_permission(request, BookView())
+
+    async def test_resolved_once_per_user(self):
+        user = User(1, ['book', 'book.view'])
+        await self.assert_allowed(CodePermission(), make_request(user))
+        await self.assert_allowed(ViewMapPermission(), make_request(user))
+        await self.assert_allowed(ViewMapPermission(), make_request(user, 'DELETE'), allowed=False)
+        self.assertEqual(user.loads, 1)
+        request = make_request(user)
+        self.assertEqual(await get_user_permissions(request), {'book', 'book.view'})
+
+    async def test_invalidation(self):
+        user = User(1, ['book'])
+        await self.assert_allowed(CodePermission(), make_request(user), allowed=False)
+        user.codes = ['book', 'book.view']
+        await self.assert_allowed(CodePermission(), make_request(user), allowed=False)
+
+        await invalidate_permissions(user.pk)
+        await self.assert_allowed(CodePermission(), make_request(user))
+        user.codes = ['book']
+        # Another user is untouched by the invalidation of the users
+        other = User(2, ['book.view'])
+        await get_user_permissions(make_request(other))
+        await invalidate_permissions()
+        await self.assert_allowed(CodePermission(), make_request(user), allowed=False)
+        await get_user_permissions(make_request(other))
+        self.assertEqual((user.loads, other.loads), (3, 2))
+
+    async def test_view_map(self):
+        permission = ViewMapPermission()
+        self.assertIs(permission.get_permission_map(BookView()), ViewMapPermission().get_permission_map(BookView()))
+        permission_map = permission.get_permission_map(BookView())
+        self.assertEqual(permission_map['delete'], {'book', 'book.delete'})
+        self.assertEqual(permission_map['post'], {'book'})
+
+        # The result of has_permissions() is awaited
+        await self.assert_allowed(permission, make_request(LegacyUser(['book', 'book.view'])))
+        await self.assert_allowed(permission, make_request(LegacyUser(['book.view'])), allowed=False)
@@ -0,0 +1,96 @@
+import unittest
+from types import SimpleNamespace
+
+from tortoise import Tortoise, fields, models
+
+from rest_framework.generics import ListAPIView
+from rest_framework.querylog import QueryLog, assert_num_queries, normalize_sql
+from rest_framework.serializers import ModelSerializer
+from rest_framework.settings import srf_settings
+
+
+class QueryLogAuthor(models.Model):
+    name = fields.CharField(max_length=32)
+
+
+class QueryLogBook(models.Model):
+    title = fields.CharField(max_length=32)
+    author = fields.ForeignKeyField('models.QueryLogAuthor', related_name='books')
+
+
+class BookSerializer(ModelSerializer):
+    class Meta:
+        model = QueryLogBook
+        fields = ('id', 'title')
+
+
+class AuthorSerializer(ModelSerializer):
+    books = BookSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = QueryLogAuthor
+        fields = ('id', 'name', 'books')
+
+
+class AuthorListView(ListAPIView):
+    serializer_class = AuthorSerializer
+    pagination_class = None
+    query_repeat_threshold = 2
+
+
+class TestNormalizeSql(unittest.TestCase):
+    def test_literals_are_replaced(self):
+        sql = 'SELECT "id" FROM "book" WHERE "author_id"=3 AND "title"=\'it\'\'s\' AND "id" IN (1,2,3) LIMIT 20'
+        self.assertEqual(normalize_sql(sql), 'SELECT "id" FROM "book" WHERE "author_id"=? AND "title"=? AND "id" IN (...) LIMIT ?')
+
+    def test_placeholders_are_replaced(self):
+        self.assertEqual(normalize_sql('SELECT * FROM t WHERE a=$1 AND b IN ($2, $3)'), 'SELECT * FROM t WHERE a=? AND b IN (...)')
+
+
+class TestQueryLog(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        for index in range(4):
+            author = await QueryLogAuthor.create(name=f'author {index}')
+            await QueryLogBook.create(title=f'book {index}', author=author)
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+        srf_settings.__dict__.pop('QUERY_LOG_ENABLED', None)
+
+    async def test_assert_num_queries(self):
+        with assert_num_queries(1):
+            await QueryLogAuthor.all()
+        with self.assertRaises(AssertionError):
+            with assert_num_queries(1):
+                await QueryLogAuthor.all()
+                await QueryLogBook.all()
+
+    async def test_nested_logs(self):
+        with QueryLog() as outer:
+            await QueryLogAuthor.all()
+            with QueryLog() as inner:
+                await QueryLogBook.all()
+        self.assertEqual(len(outer), 2)
+        self.assertEqual(len(inner), 1)
+        self.assertGreater(outer.duration, 0)
+
+    async def test_repeated_names_serializer_field(self):
+        with QueryLog() as log:
+            data = await AuthorSerializer(QueryLogAuthor.all(), many=True).data
+        self.assertEqual(len(data), 4)
+        self.assertEqual(len(log), 5)
+        [(shape, count, sources)] = log.repeated(3)
+        self.assertEqual(count, 4)
+        self.assertEqual(sources, ['AuthorSerializer.books'])
+
+    async def test_view_warns_on_n_plus_one(self):
+        srf_settings.QUERY_LOG_ENABLED = True
+        view = AuthorListView()
+        view.queryset = QueryLogAuthor.all()
+        view.request = SimpleNamespace(method='GET', args={})
+        with self.assertLogs('rest_framework.querylog', level='WARNING') as captured:
+            await view.dispatch(view.request)
+        self.assertEqual(len(view.query_log), 5)
+        self.assertIn('AuthorSerializer.books', captured.output[0])
@@ -0,0 +1,129 @@
+import unittest
+
+from sanic import Sanic
+from tortoise import Tortoise, fields, models
+
+from rest_framework.cache.backends.base import cache_manager
+from rest_framework.cache.queryset import CachedQuerySet
+from rest_framework.mixins import BulkDestroyModelMixin, CreateModelMixin, ListModelMixin, UpdateModelMixin
+from rest_framework.paginations import ORMPageNumberPagination
+from rest_framework.querylog import assert_num_queries
+from rest_framework.request import SRFRequest
+from rest_framework.serializers import ModelSerializer
+from rest_framework.viewsets import GenericViewSet
+
+
+class CachedAuthor(models.Model):
+    name = fields.CharField(max_length=32)
+
+
+class CachedBook(models.Model):
+    title = fields.CharField(max_length=32)
+    pages = fields.IntField(default=0)
+    author = fields.ForeignKeyField('models.CachedAuthor', related_name='books', null=True)
+
+
+class CachedBookSerializer(ModelSerializer):
+    class Meta:
+        model = CachedBook
+        fields = ('id', 'title', 'pages')
+
+
+class AuthorSerializer(ModelSerializer):
+    class Meta:
+        model = CachedAuthor
+        fields = ('id', 'name')
+
+
+class CachedBookViewSet(ListModelMixin, CreateModelMixin, UpdateModelMixin, BulkDestroyModelMixin, GenericViewSet):
+    serializer_class = CachedBookSerializer
+    pagination_class = ORMPageNumberPagination
+    search_fields = ('pages', 'author__name')
+    queryset_cache = 'default'
+
+
+class TestQuerysetCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        # The tables of every test are new, so are the results
+        await cache_manager.get_cache('default').clear()
+        self.author = await CachedAuthor.create(name='ann')
+        for index in range(3):
+            await CachedBook.create(title=f'book {index}', pages=index, author=self.author)
+
+        self.app = Sanic('queryset_cache_test', request_class=SRFRequest, configure_logging=False)
+        CachedBookViewSet.queryset = CachedBook.all().order_by('id')
+        view = CachedBookViewSet.as_view({'get': 'list', 'post': 'create', 'delete': 'bulk_destroy'})
+        self.app.add_route(view, '/books', methods=['GET', 'POST', 'DELETE'])
+        self.app.add_route(CachedBookViewSet.as_view({'patch': 'partial_update'}), '/books/<pk:int>', methods=['PATCH'])
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def titles(self, **params):
+        _, response = await self.app.asgi_client.get('/books', params=params)
+        self.assertEqual(response.status, 200, response.text)
+        return [book['title'] for book in response.json['data']['results']]
+
+    async def test_cached_list_and_count(self):
+        with assert_num_queries(2):
+            titles = await self.titles()
+        with assert_num_queries(0):
+            self.assertEqual(await self.titles(), titles)
+        # Other parameters compile to another SQL
+        with assert_num_queries(2):
+            self.assertEqual(await self.titles(pages=1), ['book 1'])
+        with assert_num_queries(1):
+            self.assertEqual(await self.titles(page_size=1), ['book 0'])
+
+    async def test_writes_of_the_mixins(self):
+        await self.titles()
+        _, response = await self.app.asgi_client.post('/books', json={'title': 'new'})
+        self.assertEqual(response.status, 200, response.text)
+        self.assertEqual(await self.titles(), ['book 0', 'book 1', 'book 2', 'new'])
+
+        await self.app.asgi_client.patch('/books/1', json={'title': 'first'})
+        self.assertEqual((await self.titles())[0], 'first')
+
+        # Deleted without reading the primary keys first
+        _, response = await self.app.asgi_client.delete('/books', params={'pages': 0})
+        self.assertEqual(response.json['data'], {'count': 2}, response.text)
+        self.assertEqual(await self.titles(), ['book 1', 'book 2'])
+
+    async def test_serializer_save_of_a_joined_table(self):
+        await self.titles()
+        self.assertEqual(len(await self.titles(author__name='ann')), 3)
+        serializer = AuthorSerializer(self.author, data={'name': 'ann'}, partial=True)
+        await serializer.is_valid(raise_exception=True)
+        await serializer.save()
+        # Nothing changed, the results are kept
+        with assert_num_queries(0):
+            await self.titles(author__name='ann')
+
+        serializer = AuthorSerializer(self.author, data={'name': 'bob'}, partial=True)
+        await serializer.is_valid(raise_exception=True)
+        await serializer.save()
+        self.assertEqual(await self.titles(author__name='ann'), [])
+        # A query not reading the table of the authors is kept
+        with assert_num_queries(0):
+            await self.titles()
+
+    async def test_shapes_and_uncached_queries(self):
+        queryset = CachedQuerySet(CachedBook.filter(pages__lt=2).order_by('id'), 'default', 30)
+        self.assertEqual(await queryset.values_list('title', flat=True), ['book 0', 'book 1'])
+        self.assertEqual(await queryset.values_list('title'), [('book 0',), ('book 1',)])
+        self.assertEqual([book.title async for book in queryset.all()], ['book 0', 'book 1'])
+        for _ in range(2):
+            self.assertEqual((await queryset.get_or_none(pages=1)).title, 'book 1')
+            self.assertEqual(await queryset.count(), 2)
+        with assert_num_queries(0):
+            await queryset.get_or_none(pages=1)
+            await queryset.count()
+        self.assertIsNone(await queryset.get_or_none(pages=9))
+        # The prefetched rows are not part of the SQL of the queryset
+        with assert_num_queries(2):
+            books = await queryset.prefetch_related('author')
+        self.assertEqual(books[0].author.name, 'ann')
+        with assert_num_queries(1):
+            self.assertTrue(await queryset.exists())
@@ -0,0 +1,167 @@
+import unittest
+from unittest import mock
+
+import orjson
+from sanic import Sanic
+from sanic.compat import Header
+
+from rest_framework.exceptions import APIException
+from rest_framework.request import JSONArrayParser, JSONElementTooLarge, SRFRequest, json_depth_exceeds
+from rest_framework.settings import srf_settings
+
+
+def make_request(body, content_type='application/json'):
+    headers = Header({'content-type': content_type} if content_type else {})
+    request = SRFRequest(b'/books', headers, '1.1', 'POST', None, Sanic.get_app('request_test', force_create=True))
+    request.body = body
+    return request
+
+
+class TestPostData(unittest.TestCase):
+    def tearDown(self):
+        for name in ('REQUEST_MAX_BODY_SIZE', 'REQUEST_MAX_JSON_DEPTH'):
+            srf_settings.__dict__.pop(name, None)
+
+    def test_json_is_parsed_once(self):
+        request = make_request(b'{"title": "Book", "tags": ["a"]}')
+        with mock.patch('rest_framework.request.orjson.loads', wraps=orjson.loads) as loads:
+            self.assertEqual(request.post_data, {'title': 'Book', 'tags': ['a']})
+            self.assertIs(request.post_data, request.post_data)
+            self.assertEqual(request.json, {'title': 'Book', 'tags': ['a']})
+        loads.assert_called_once()
+
+    def test_parser_follows_content_type(self):
+        self.assertEqual(make_request(b'{"a": 1}', 'application/json; charset=utf-8').post_data, {'a': 1})
+        self.assertEqual(make_request(b'{"a": 1}', None).post_data, {'a': 1})
+        form = make_request(b'title=Book&tag=a&tag=b', 'application/x-www-form-urlencoded').post_data
+        self.assertEqual(form.getlist('tag'), ['a', 'b'])
+        self.assertEqual(make_request(b'', None).post_data, {})
+        self.assertEqual(make_request(b'null').post_data, {})
+
+    def test_invalid_json(self):
+        with self.assertRaises(APIException) as captured:
+            make_request(b'title=Book').post_data
+        self.assertEqual(captured.exception.status, 400)
+
+    def test_deprecated_data(self):
+        request = make_request(b'{"a": 1}')
+        with self.assertWarns(DeprecationWarning):
+            self.assertIs(request.data, request.post_data)
+
+    def test_max_body_size(self):
+        srf_settings.REQUEST_MAX_BODY_SIZE = 8
+        self.assertEqual(make_request(b'{"a": 1}').post_data, {'a': 1})
+        with self.assertRaises(APIException) as captured:
+            make_request(b'{"a": 10}').post_data
+        self.assertEqual(captured.exception.status, 413)
+
+    def test_max_json_depth(self):
+        srf_settings.REQUEST_MAX_JSON_DEPTH = 3
+        self.assertEqual(make_request(b'{"a": [{"b": "[[[["}]}').post_data, {'a': [{'b': '[[[['}]})
+        with self.assertRaises(APIException) as captured:
+            make_request(b'{"a": [{"b": []}]}').post_data
+        self.assertEqual(captured.exception.status, 400)
+
+    def test_json_depth_exceeds(self):
+        self.assertFalse(json_depth_exceeds(b'[1, [2, [3]]]', 3))
+        self.assertTrue(json_depth_exceeds(b'[1, [2, [3, {}]]]', 3))
+        self.assertFalse(json_depth_exceeds(b'{"a": "]]]\\"{{{{"}', 1))
+        self.assertTrue(json_depth_exceeds(b'[' * 100 + b']' * 100, 64))
+
+
+class TestJSONArrayParser(unittest.TestCase):
+    def parse(self, body, size=3, max_depth=None, max_element_size=None):
+        parser = JSONArrayParser(max_depth, max_element_size)
+        items = []
+        for start in range(0, len(body), size):
+            items.extend(parser.feed(body[start:start + size]))
+        return items + parser.close()
+
+    def test_elements(self):
+        data = [{'title': 'a,]"[ü', 'tags': [1, 2.5, None]}, 12345, 'text', [], {}, True]
+        for body in (orjson.dumps(data), orjson.dumps(data, option=orjson.OPT_INDENT_2)):
+            for size in (1, 3, 1000):
+                self.assertEqual(self.parse(body, size), data)
+        self.assertEqual(self.parse(b' [ ] '), [])
+
+    def test_elements_are_returned_as_they_complete(self):
+        parser = JSONArrayParser()
+        self.assertEqual(parser.feed(b'[{"a": 1}, 12'), [{'a': 1}])
+        self.assertEqual(parser.feed(b'3, {"b"'), [123])
+        self.assertEqual(parser.feed(b': 2}]'), [{'b': 2}])
+        self.assertEqual(parser.close(), [])
+
+    def test_numbers_split_across_chunks(self):
+        for first, second, expected in ((b'[1.', b'5]', 1.5), (b'[1.5e', b'3]', 1500.0), (b'[1.5E+', b'3]', 1500.0),
+                                        (b'[-', b'2, 3]', -2), (b'[12', b' ]', 12)):
+            with self.subTest(body=first + second):
+                parser = JSONArrayParser()
+                self.assertEqual(parser.feed(first), [])
+                self.assertEqual(parser.feed(second)[0], expected)
+                parser.close()
+        body = orjson.dumps([1.5, -2.25e-3, 1e+20, 0, 7])
+        for size in (1, 2, 3):
+            self.assertEqual(self.parse(body, size), [1.5, -2.25e-3, 1e+20, 0, 7])
+
+    def test_invalid(self):
+        for body in (b'', b'{}', b'[1 2]', b'[1,]', b'[1, 2', b'[1] 2', b'["\xff"]'):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                self.parse(body)
+
+    def test_max_depth(self):
+        self.assertEqual(self.parse(b'[[[1]], 2]', max_depth=3), [[[1]], 2])
+        with self.assertRaises(ValueError):
+            self.parse(b'[[[1]], [[[2]]]]', max_depth=3)
+
+    def test_pending_element_is_rescanned_when_doubled(self):
+        parser = JSONArrayParser()
+        with mock.patch.object(parser, '_scan', wraps=parser._scan) as scan:
+            # Malformed, yet it could be the start of a long element
+            self.assertEqual(parser.feed(b'[{"a": x'), [])
+            for _ in range(1000):
+                self.assertEqual(parser.feed(b' ' * 1024), [])
+        # Scanned when the pending text doubled, log2(1000 KiB / 7) times
+        self.assertLessEqual(scan.call_count, 20)
+        with self.assertRaises(ValueError):
+            parser.close()
+
+        body = orjson.dumps([{'text': 'a' * 100000}, 1])
+        with mock.patch.object(JSONArrayParser, '_parse', autospec=True, side_effect=JSONArrayParser._parse) as parse:
+            self.assertEqual(self.parse(body, size=100), [{'text': 'a' * 100000}, 1])
+        self.assertLessEqual(parse.call_count, 20)
+
+    def test_max_element_size(self):
+        body = orjson.dumps([{'text': 'a' * 20}, {'text': 'b' * 20}])
+        # Any number of elements fit as long as each does
+        self.assertEqual(len(self.parse(body, size=len(body), max_element_size=40)), 2)
+        for size in (1, 7, len(body)):
+            with self.subTest(size=size), self.assertRaises(JSONElementTooLarge):
+                self.parse(body, size=size, max_element_size=20)
+        with self.assertRaises(JSONElementTooLarge):
+            self.parse(b'[{"a": x' + b' ' * 100, max_element_size=50)
+
+
+class TestIterJsonArray(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self):
+        for name in ('REQUEST_MAX_BODY_SIZE', 'REQUEST_MAX_JSON_ELEMENT_SIZE'):
+            srf_settings.__dict__.pop(name, None)
+
+    async def test_iter_json_array(self):
+        items = [item async for item in make_request(b'[{"a": 1}, 2]').iter_json_array()]
+        self.assertEqual(items, [{'a': 1}, 2])
+
+    async def test_errors(self):
+        with self.assertRaises(APIException) as captured:
+            [item async for item in make_request(b'{"a": 1}').iter_json_array()]
+        self.assertEqual(captured.exception.status, 400)
+
+        srf_settings.REQUEST_MAX_BODY_SIZE = 4
+        with self.assertRaises(APIException) as captured:
+            [item async for item in make_request(b'[1, 2]').iter_json_array()]
+        self.assertEqual(captured.exception.status, 413)
+
+        srf_settings.REQUEST_MAX_BODY_SIZE = None
+        srf_settings.REQUEST_MAX_JSON_ELEMENT_SIZE = 4
+        with self.assertRaises(APIException) as captured:
+            [item async for item in make_request(b'[1, "long"]').iter_json_array()]
+        self.assertEqual(captured.exception.status, 413)
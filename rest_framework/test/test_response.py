@@ -0,0 +1,192 @@
+import threading
+import unittest
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock
+
+import orjson
+
+from rest_framework import response
+from rest_framework.cache.backends.locmem import LocMemCache
+from rest_framework.cache.core import api_cache
+from rest_framework.response import (
+    JsonResponse, JSONRenderer, MsgPackRenderer, estimate_size, find_rows, parse_accept, select_renderer,
+)
+from rest_framework.settings import srf_settings
+from rest_framework.views import APIView
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+class PointView(APIView):
+    async def get(self, request, *args, **kwargs):
+        return self.success_json_response(data={'point': Point(1, 2)})
+
+
+ROWS = [{'id': index, 'name': f'row {index}', 'at': datetime(2024, 1, 2, tzinfo=timezone.utc)} for index in range(25)]
+
+
+class RowsView(APIView):
+    async def get(self, request, *args, **kwargs):
+        return self.success_json_response(data={'page': 1, 'results': ROWS})
+
+
+class CachedPointView(APIView):
+    calls = 0
+
+    @api_cache(60, cache_backend=LocMemCache('api_cache_test'))
+    async def get(self, request, *args, **kwargs):
+        CachedPointView.calls += 1
+        return self.success_json_response(data={'point': Point(1, 2)})
+
+
+def make_request(accept=None, **args):
+    headers = {'accept': accept} if accept else {}
+    return SimpleNamespace(method='GET', headers=headers, args=args)
+
+
+class TestJsonRenderer(unittest.TestCase):
+    def tearDown(self):
+        for name in ('JSON_PRETTY', 'JSON_DATETIME_FORMAT', 'RENDERER_CLASSES'):
+            srf_settings.__dict__.pop(name, None)
+        response._renderers = None
+
+    def test_compact_by_default(self):
+        body = JsonResponse({'a': [1, 2], 'b': Decimal('1.5')}).body
+        self.assertEqual(body, b'{"a":[1,2],"b":1.5}')
+
+    def test_pretty(self):
+        self.assertIn(b'\n  "a"', JsonResponse({'a': 1}, request=make_request(pretty='1')).body)
+        srf_settings.JSON_PRETTY = True
+        self.assertIn(b'\n  "a"', JsonResponse({'a': 1}).body)
+
+    def test_datetime_format(self):
+        value = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        self.assertEqual(orjson.loads(JsonResponse({'at': value}).body), {'at': 1704164645})
+        srf_settings.JSON_DATETIME_FORMAT = 'iso'
+        self.assertEqual(orjson.loads(JsonResponse({'at': value}).body), {'at': '2024-01-02T03:04:05+00:00'})
+
+    def test_parse_accept(self):
+        self.assertEqual(
+            parse_accept('*/*;q=0.1, application/msgpack;q=0.9, application/json, text/html;q=0'),
+            ['application/json', 'application/msgpack', '*/*'],
+        )
+
+
+class TestDeferredRendering(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self):
+        for name in ('RENDER_OFFLOAD_THRESHOLD', 'RENDER_CHUNK_ROWS'):
+            srf_settings.__dict__.pop(name, None)
+
+    def test_estimate_size(self):
+        self.assertEqual(estimate_size({'code': 1, 'data': {'page': 1, 'results': ROWS}}), 1 + 1 + 25 * 3)
+        self.assertEqual(estimate_size([]), 0)
+        self.assertEqual(estimate_size('text'), 1)
+
+    def test_find_rows(self):
+        self.assertEqual(find_rows({'code': 1, 'data': {'page': 1, 'results': ROWS, 'tags': ['a']}}), ('data', 'results'))
+        self.assertEqual(find_rows(ROWS), ())
+        self.assertIsNone(find_rows({'data': {'id': 1}}))
+
+    def test_render_chunked(self):
+        renderer = JSONRenderer()
+        for data in (
+            ROWS,
+            {'code': 1, 'data': {'page': 1, 'results': ROWS}, 'message': 'ok'},
+            {'data': []},
+            {'data': {'id': 1}},
+        ):
+            self.assertEqual(renderer.render_chunked(data, chunk_rows=4), renderer.render(data))
+        data = {'data': ROWS[:2]}
+        self.assertEqual(renderer.render_chunked(data, pretty=True), renderer.render(data, pretty=True))
+
+    async def test_large_body_is_rendered_off_loop(self):
+        srf_settings.RENDER_OFFLOAD_THRESHOLD = 50
+        srf_settings.RENDER_CHUNK_ROWS = 10
+        renderer = response.get_renderers()[0]
+        threads = []
+        render = renderer.render
+
+        def record(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return render(*args, **kwargs)
+
+        with mock.patch.object(renderer, 'render', side_effect=record):
+            resp = await RowsView().dispatch(make_request())
+        self.assertFalse(resp.deferred)
+        self.assertEqual(orjson.loads(resp.body)['data']['results'][3], {'id': 3, 'name': 'row 3', 'at': 1704153600})
+        # the rows marker, 3 chunks and the outer body
+        self.assertEqual(len(threads), 5)
+        self.assertTrue(all(thread.name.startswith('srf-render') for thread in threads))
+
+    async def test_small_or_outside_view_is_rendered_inline(self):
+        srf_settings.RENDER_OFFLOAD_THRESHOLD = 50
+        self.assertFalse(JsonResponse({'data': ROWS}).deferred)
+        srf_settings.RENDER_OFFLOAD_THRESHOLD = None
+        token = response.set_current_request(make_request())
+        try:
+            self.assertFalse(JsonResponse({'data': ROWS}).deferred)
+            srf_settings.RENDER_OFFLOAD_THRESHOLD = 50
+            resp = JsonResponse({'data': ROWS})
+        finally:
+            response.reset_current_request(token)
+        self.assertTrue(resp.deferred)
+        # Reading the body renders it on the spot
+        self.assertEqual(orjson.loads(resp.body)['data'][0]['id'], 0)
+        self.assertFalse(resp.deferred)
+
+
+@unittest.skipIf(response.msgpack is None, 'msgpack is not installed')
+class TestContentNegotiation(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        srf_settings.RENDERER_CLASSES = (JSONRenderer, MsgPackRenderer)
+        response._renderers = None
+
+    def tearDown(self):
+        srf_settings.__dict__.pop('RENDERER_CLASSES', None)
+        response._renderers = None
+
+    async def test_view_renders_msgpack(self):
+        resp = await PointView().dispatch(make_request('application/msgpack'))
+        self.assertEqual(resp.content_type, 'application/msgpack')
+        self.assertEqual(resp.headers['Vary'], 'Accept')
+        self.assertEqual(response.msgpack.unpackb(resp.body)['data'], {'point': {'x': 1, 'y': 2}})
+
+    async def test_view_renders_json(self):
+        resp = await PointView().dispatch(make_request())
+        self.assertEqual(resp.content_type, 'application/json')
+        self.assertEqual(orjson.loads(resp.body)['data'], {'point': {'x': 1, 'y': 2}})
+        self.assertIsNone(response.current_request())
+
+    async def test_api_cache_per_renderer(self):
+        def make_cached_request(accept=None, **args):
+            request = make_request(accept, **args)
+            request.endpoint, request.path, request.ctx = 'cached_point', '/point', SimpleNamespace()
+            return request
+
+        view = CachedPointView()
+        for _ in range(2):
+            msgpack_response = await view.dispatch(make_cached_request('application/msgpack'))
+            json_response = await view.dispatch(make_cached_request('application/json'))
+            pretty_response = await view.dispatch(make_cached_request(pretty='1'))
+        self.assertEqual(CachedPointView.calls, 3)
+        self.assertEqual(msgpack_response.content_type, 'application/msgpack')
+        self.assertEqual(response.msgpack.unpackb(msgpack_response.body)['data'], {'point': {'x': 1, 'y': 2}})
+        self.assertEqual(json_response.content_type, 'application/json')
+        self.assertNotIn(b'\n', json_response.body)
+        self.assertIn(b'\n', pretty_response.body)
+        self.assertEqual(orjson.loads(pretty_response.body), orjson.loads(json_response.body))
+
+    def test_select_renderer(self):
+        json_renderer, msgpack_renderer = JSONRenderer(), MsgPackRenderer()
+        renderers = [json_renderer, msgpack_renderer]
+        self.assertIs(select_renderer(make_request(), renderers), json_renderer)
+        self.assertIs(select_renderer(make_request('application/x-msgpack'), renderers), msgpack_renderer)
+        self.assertIs(select_renderer(make_request('application/msgpack, application/json;q=0.5'), renderers), msgpack_renderer)
+        self.assertIs(select_renderer(make_request('text/html'), renderers), json_renderer)
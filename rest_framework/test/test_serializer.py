@@ -1,5 +1,7 @@
 from enum import Enum
+import gc
 import unittest
+import weakref
 
 from rest_framework.exceptions import ValidationException
 from rest_framework.fields import (
@@ -215,6 +217,16 @@ class SampleSerializerTestCase(unittest.IsolatedAsyncioTestCase):
         serializer2 = SampleSerializer2()
         self.assertEqual(field_names, [field.field_name for field in serializer2.fields.values()])
 
+    async def test_fields_are_cached_per_instance(self):
+        serializer = self.sample_serializer_class()
+        self.assertIs(serializer.fields, serializer.fields)
+        self.assertIsNot(serializer.fields, self.sample_serializer.fields)
+
+        reference = weakref.ref(serializer)
+        del serializer
+        gc.collect()
+        self.assertIsNone(reference())
+
     async def test_external_to_internal(self):
         data = {
             'test_char': 'test',
@@ -0,0 +1,68 @@
+import unittest
+from types import SimpleNamespace
+
+from rest_framework import timing
+from rest_framework.response import JsonResponse
+from rest_framework.settings import srf_settings
+from rest_framework.views import APIView
+
+
+class SampleView(APIView):
+    async def get(self, request, *args, **kwargs):
+        with timing.phase('serialize'):
+            data = {'hello': 'world'}
+        return self.success_json_response(data=data)
+
+
+class TestRequestTimer(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self):
+        for name in ('TIMING_ENABLED', 'TIMING_SERVER_HEADER', 'TIMING_SINKS'):
+            srf_settings.__dict__.pop(name, None)
+        timing._sinks = None
+
+    async def test_phase_is_noop_without_timer(self):
+        self.assertIsNone(timing.current_timer())
+        self.assertIs(timing.phase('auth'), timing.NULL_PHASE)
+
+    async def test_phases_accumulate(self):
+        timer = timing.RequestTimer('SampleView', 'GET')
+        with timer:
+            with timing.phase('db'):
+                pass
+            with timing.phase('db'):
+                pass
+            self.assertIs(timing.current_timer(), timer)
+        self.assertIsNone(timing.current_timer())
+        self.assertEqual(list(timer.phases), ['db'])
+        self.assertGreaterEqual(timer.total, timer.phases['db'])
+
+    async def test_server_timing_header(self):
+        srf_settings.TIMING_ENABLED = True
+        srf_settings.TIMING_SERVER_HEADER = True
+        srf_settings.TIMING_SINKS = [timing.HistogramTimingSink]
+        view = SampleView()
+        request = SimpleNamespace(method='GET')
+        response = await view.dispatch(request)
+
+        self.assertIsInstance(response, JsonResponse)
+        header = response.headers['Server-Timing']
+        for name in ('auth', 'permission', 'throttle', 'serialize', 'render', 'total'):
+            self.assertIn(f'{name};dur=', header)
+
+        sink = timing.get_sinks()[0]
+        snapshot = sink.snapshot()
+        self.assertEqual(snapshot[('SampleView', 'total')]['count'], 1)
+        self.assertEqual(snapshot[('SampleView', 'auth')]['count'], 1)
+
+    async def test_disabled_has_no_header(self):
+        srf_settings.TIMING_ENABLED = False
+        response = await SampleView().dispatch(SimpleNamespace(method='GET'))
+        self.assertNotIn('Server-Timing', response.headers)
+
+    async def test_histogram_buckets_are_cumulative(self):
+        sink = timing.HistogramTimingSink()
+        sink.observe(('view', 'total'), 0.004)
+        buckets = sink.snapshot()[('view', 'total')]['buckets']
+        self.assertEqual(buckets[0.001], 0)
+        self.assertEqual(buckets[0.005], 1)
+        self.assertEqual(buckets[10.0], 1)
@@ -0,0 +1,196 @@
+import unittest
+
+from sanic import Sanic
+from tortoise import Tortoise, fields, models
+
+from rest_framework.cache.backends.base import cache_manager
+from rest_framework.generics import TreeAPIView
+from rest_framework.mixins import BulkDestroyModelMixin, CreateModelMixin, DestroyModelMixin, UpdateModelMixin
+from rest_framework.querylog import assert_num_queries
+from rest_framework.request import SRFRequest
+from rest_framework.serializers import ModelSerializer
+from rest_framework.viewsets import GenericViewSet
+
+
+class Category(models.Model):
+    name = fields.CharField(max_length=32)
+    order = fields.IntField(default=0)
+    hidden = fields.BooleanField(default=False)
+    parent = fields.ForeignKeyField('models.Category', related_name='children', null=True)
+
+
+class CategorySerializer(ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ('id', 'name', 'order', 'parent_id')
+
+
+class CategoryTreeView(TreeAPIView):
+    serializer_class = CategorySerializer
+
+
+class StreamedCategoryTreeView(CategoryTreeView):
+    stream_tree = True
+
+
+class CachedCategoryTreeView(CategoryTreeView):
+    tree_cache = 'default'
+
+
+class CategoryWriteSerializer(ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ('id', 'name', 'order', 'hidden', 'parent')
+
+
+class CategoryViewSet(CreateModelMixin, UpdateModelMixin, DestroyModelMixin, BulkDestroyModelMixin, GenericViewSet):
+    serializer_class = CategoryWriteSerializer
+
+
+def names(nodes):
+    return [(node['name'], None if node['children'] is None else names(node['children'])) for node in nodes]
+
+
+class TestTree(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        # b before a, the children of a in reverse creation order
+        a = await Category.create(name='a', order=2)
+        await Category.create(name='b', order=1)
+        a2 = await Category.create(name='a2', order=2, parent=a)
+        await Category.create(name='a1', order=1, parent=a)
+        await Category.create(name='a2x', parent=a2)
+        await Category.create(name='hidden', parent=a2, hidden=True)
+        self.a, self.a2 = a, a2
+
+        self.app = Sanic('tree_test', request_class=SRFRequest, configure_logging=False)
+        CategoryTreeView.queryset = Category.filter(hidden=False)
+        self.app.add_route(CategoryTreeView.as_view(), '/categories', methods=['GET'])
+        self.app.add_route(StreamedCategoryTreeView.as_view(), '/streamed', methods=['GET'])
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def get(self, uri='/categories', **params):
+        _, response = await self.app.asgi_client.get(uri, params=params)
+        self.assertEqual(response.status, 200, response.text)
+        return names(response.json['data'])
+
+    async def test_tree_ordered_by_database(self):
+        with assert_num_queries(1):
+            tree = await self.get()
+        self.assertEqual(tree, [('b', []), ('a', [('a1', []), ('a2', [('a2x', [])])])])
+
+    async def test_depth(self):
+        self.assertEqual(await self.get(depth=1), [('b', None), ('a', None)])
+        self.assertEqual(await self.get(depth=2), [('b', []), ('a', [('a1', None), ('a2', None)])])
+
+    async def test_subtree(self):
+        self.assertEqual(await self.get(parent=self.a.pk), [('a1', []), ('a2', [('a2x', [])])])
+        # Lazy loading of the children of a node of the last level
+        self.assertEqual(await self.get(parent=self.a2.pk, depth=1), [('a2x', None)])
+        self.assertEqual(await self.get(parent=999), [])
+
+    async def test_invalid_params(self):
+        for params in ({'depth': 0}, {'depth': 'x'}, {'depth': 1000}, {'parent': 'x'}):
+            with self.subTest(params=params):
+                _, response = await self.app.asgi_client.get('/categories', params=params)
+                self.assertEqual(response.status, 400)
+
+    async def test_streamed(self):
+        for params in ({}, {'parent': self.a.pk}, {'depth': 2}):
+            with self.subTest(params=params):
+                _, expected = await self.app.asgi_client.get('/categories', params=params)
+                _, response = await self.app.asgi_client.get('/streamed', params=params)
+                self.assertEqual(response.headers['content-type'], 'application/json')
+                self.assertEqual(response.json, expected.json)
+
+
+class TestTreeCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        a = await Category.create(name='a', order=2)
+        await Category.create(name='b', order=1)
+        a2 = await Category.create(name='a2', order=2, parent=a)
+        await Category.create(name='a1', order=1, parent=a)
+        await Category.create(name='a2x', parent=a2)
+        self.a, self.a2 = a, a2
+
+        self.cache = cache_manager.get_cache('default')
+        self.key = CachedCategoryTreeView.get_tree_cache_key()
+        await self.cache.delete(self.key)
+        self.app = Sanic('tree_cache_test', request_class=SRFRequest, configure_logging=False)
+        CategoryTreeView.queryset = Category.filter(hidden=False)
+        CategoryViewSet.queryset = Category.all()
+        self.app.add_route(CategoryTreeView.as_view(), '/categories', methods=['GET'])
+        self.app.add_route(CachedCategoryTreeView.as_view(), '/cached', methods=['GET'])
+        self.app.add_route(CategoryViewSet.as_view({'post': 'create', 'delete': 'bulk_destroy'}), '/write', methods=['POST', 'DELETE'])
+        view = CategoryViewSet.as_view({'patch': 'partial_update', 'delete': 'destroy'})
+        self.app.add_route(view, '/write/<pk:int>', methods=['PATCH', 'DELETE'])
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def get(self, uri, **params):
+        _, response = await self.app.asgi_client.get(uri, params=params)
+        self.assertEqual(response.status, 200, response.text)
+        return response.json['data']
+
+    async def assert_patched(self):
+        """The cached tree was patched rather than dropped, and equals the tree built from the database"""
+        self.assertIsNotNone(await self.cache.get(self.key))
+        with assert_num_queries(0):
+            cached = await self.get('/cached')
+        self.assertEqual(cached, await self.get('/categories'))
+        return names(cached)
+
+    async def test_cached_reads(self):
+        with assert_num_queries(1):
+            tree = await self.get('/cached')
+        self.assertEqual(tree, await self.get('/categories'))
+        for params in ({}, {'depth': 2}, {'parent': self.a.pk}, {'parent': self.a2.pk, 'depth': 1}):
+            with self.subTest(params=params):
+                with assert_num_queries(0):
+                    cached = await self.get('/cached', **params)
+                self.assertEqual(cached, await self.get('/categories', **params))
+        # A node out of the tree is looked up in the database
+        self.assertEqual(await self.get('/cached', parent=999), [])
+
+    async def test_create_and_update(self):
+        await self.get('/cached')
+        _, response = await self.app.asgi_client.post('/write', json={'name': 'a0', 'order': 0, 'parent': self.a.pk})
+        self.assertEqual(response.status, 200, response.text)
+        self.assertEqual(await self.assert_patched(), [('b', []), ('a', [('a0', []), ('a1', []), ('a2', [('a2x', [])])])])
+
+        # a2 moves below b with its subtree
+        await self.app.asgi_client.patch(f'/write/{self.a2.pk}', json={'parent': (await Category.get(name='b')).pk})
+        self.assertEqual(await self.assert_patched(), [('b', [('a2', [('a2x', [])])]), ('a', [('a0', []), ('a1', [])])])
+
+        await self.app.asgi_client.patch(f'/write/{self.a.pk}', json={'order': 0})
+        self.assertEqual([name for name, _ in await self.assert_patched()], ['a', 'b'])
+
+        # A leaf leaving the rows of the tree
+        await self.app.asgi_client.patch(f'/write/{(await Category.get(name="a1")).pk}', json={'hidden': True})
+        self.assertEqual(await self.assert_patched(), [('a', [('a0', [])]), ('b', [('a2', [('a2x', [])])])])
+
+    async def test_delete(self):
+        await self.get('/cached')
+        _, response = await self.app.asgi_client.delete(f'/write/{self.a2.pk}')
+        self.assertEqual(response.status, 200, response.text)
+        self.assertEqual(await self.assert_patched(), [('b', []), ('a', [('a1', [])])])
+
+        _, response = await self.app.asgi_client.request('DELETE', '/write', content=b'[%d]' % self.a.pk)
+        self.assertEqual(response.status, 200, response.text)
+        self.assertEqual(await self.assert_patched(), [('b', [])])
+
+    async def test_rebuild(self):
+        await self.get('/cached')
+        # A node with children leaving the rows of the tree, a node moved below its own descendant
+        a1 = await Category.get(name='a1')
+        for pk, data in ((self.a2.pk, {'hidden': True}), (self.a.pk, {'parent': a1.pk})):
+            with self.subTest(data=data):
+                await self.app.asgi_client.patch(f'/write/{pk}', json=data)
+                self.assertIsNone(await self.cache.get(self.key))
+                self.assertEqual(await self.get('/cached'), await self.get('/categories'))
@@ -0,0 +1,192 @@
+import unittest
+
+import orjson
+from sanic import Sanic
+from tortoise import Tortoise, fields, models
+from tortoise.exceptions import IntegrityError
+
+from rest_framework.exception_handlers import catch_serializer_validation_exc
+from rest_framework.exceptions import APIException, ValidationException
+from rest_framework.mixins import BulkUpdateModelMixin, CreateModelMixin, UpdateModelMixin, get_unique_indexes
+from rest_framework.querylog import assert_num_queries
+from rest_framework.request import SRFRequest
+from rest_framework.serializers import ModelSerializer
+from rest_framework.utils import IntegrityErrorHandel
+from rest_framework.viewsets import GenericViewSet
+
+
+class UniqueBook(models.Model):
+    isbn = fields.CharField(max_length=32, unique=True)
+    title = fields.CharField(max_length=32)
+    edition = fields.IntField(default=1)
+
+    class Meta:
+        unique_together = (('title', 'edition'),)
+
+
+class UniqueBookSerializer(ModelSerializer):
+    class Meta:
+        model = UniqueBook
+        fields = ('id', 'isbn', 'title', 'edition')
+
+
+class BookViewSet(CreateModelMixin, UpdateModelMixin, BulkUpdateModelMixin, GenericViewSet):
+    serializer_class = UniqueBookSerializer
+    unique_field = (('title', 'edition'),)
+
+
+class OptimisticBookViewSet(BookViewSet):
+    unique_optimistic = True
+
+
+class IsbnTitleViewSet(OptimisticBookViewSet):
+    # Shares `isbn` with the unique constraint of the field, no constraint covers both
+    unique_field = (('isbn', 'title'),)
+
+
+class StreamBookViewSet(BookViewSet):
+    stream_upload = True
+    stream_batch_size = 2
+
+
+class TestIntegrityErrorHandel(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        await UniqueBook.create(isbn='1', title='a')
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def test_fields(self):
+        with self.assertRaises(IntegrityError) as captured:
+            await UniqueBook.create(isbn='1', title='b')
+        error = IntegrityErrorHandel(captured.exception)
+        self.assertTrue(error.is_unique_violation)
+        self.assertEqual(error.fields, ('isbn',))
+
+        with self.assertRaises(IntegrityError) as captured:
+            await UniqueBook.create(isbn='2', title='a')
+        self.assertEqual(IntegrityErrorHandel(captured.exception).fields, ('title', 'edition'))
+
+    def test_other_backends(self):
+        class Detail:
+            detail = 'Key (title, edition)=(a, 1) already exists.'
+
+        postgres = IntegrityError(Detail())
+        self.assertEqual(IntegrityErrorHandel(postgres).fields, ('title', 'edition'))
+        mysql = IntegrityErrorHandel(IntegrityError('(1062, "Duplicate entry \'1\' for key \'uniquebook.isbn\'")'))
+        # The name of the index, not the columns
+        self.assertEqual((mysql.fields, mysql.index_name), ((), 'isbn'))
+        self.assertEqual(str(mysql), '发生错误:isbn已存在')
+        self.assertFalse(IntegrityErrorHandel(IntegrityError('NOT NULL constraint failed: uniquebook.title')).is_unique_violation)
+
+
+class TestUniqueView(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await Tortoise.init(db_url='sqlite://:memory:', modules={'models': [__name__]})
+        await Tortoise.generate_schemas()
+        await UniqueBook.bulk_create([UniqueBook(isbn=str(index), title=f'book {index}') for index in range(1, 4)])
+        self.app = Sanic('unique_test', request_class=SRFRequest, configure_logging=False)
+        self.app.error_handler.add(ValidationException, catch_serializer_validation_exc)
+        for viewset in (BookViewSet, OptimisticBookViewSet, StreamBookViewSet):
+            viewset.queryset = UniqueBook.all()
+        self.app.add_route(BookViewSet.as_view({'post': 'create', 'patch': 'partial_bulk_update'}), '/books', methods=['POST', 'PATCH'])
+        self.app.add_route(BookViewSet.as_view({'patch': 'partial_update'}), '/books/<pk:int>', methods=['PATCH'])
+        view = OptimisticBookViewSet.as_view({'post': 'create', 'patch': 'partial_bulk_update'})
+        self.app.add_route(view, '/optimistic', methods=['POST', 'PATCH'])
+        self.app.add_route(OptimisticBookViewSet.as_view({'patch': 'partial_update'}), '/optimistic/<pk:int>', methods=['PATCH'])
+        self.app.add_route(StreamBookViewSet.as_view({'post': 'create'}), '/stream', methods=['POST'])
+
+    async def asyncTearDown(self):
+        await Tortoise.close_connections()
+
+    async def test_optimistic_create(self):
+        message = BookViewSet.unique_error_msg.format(rt_msg=' title:book 1  edition:1 ')
+        for uri in ('/books', '/optimistic'):
+            with self.subTest(uri=uri):
+                _, response = await self.app.asgi_client.post(uri, json={'isbn': '9', 'title': 'book 1'})
+                self.assertEqual(response.json['message'], message)
+
+        with assert_num_queries(1):
+            _, response = await self.app.asgi_client.post('/optimistic', json={'isbn': '9', 'title': 'new'})
+        self.assertEqual(response.status, 200, response.text)
+        self.assertEqual(await UniqueBook.filter(isbn='9').count(), 1)
+
+    async def test_other_constraints_are_raised(self):
+        view = OptimisticBookViewSet()
+        with self.assertRaises(IntegrityError):
+            async with view.unique_violation({'title': 'new'}):
+                await UniqueBook.create(isbn='1', title='new')
+        # A constraint on one of the columns of `unique_field` is another constraint
+        with self.assertRaises(IntegrityError):
+            async with IsbnTitleViewSet().unique_violation({'isbn': '1', 'title': 'new'}):
+                await UniqueBook.create(isbn='1', title='new')
+
+    async def test_mysql_index_names(self):
+        indexes = get_unique_indexes(UniqueBook)
+        self.assertEqual(indexes['isbn'], ('isbn',))
+        self.assertEqual(indexes['PRIMARY'], ('id',))
+        uid = next(name for name in indexes if name.startswith('uid_'))
+        self.assertEqual(indexes[uid], ('title', 'edition'))
+
+        def duplicate(key):
+            return IntegrityError(f'(1062, "Duplicate entry \'book 1-1\' for key \'uniquebook.{key}\'")')
+
+        view = OptimisticBookViewSet()
+        with self.assertRaises(APIException) as captured:
+            async with view.unique_violation():
+                raise duplicate(uid)
+        self.assertEqual(captured.exception.message, BookViewSet.unique_error_msg.format(rt_msg=' title, edition'))
+        with self.assertRaises(IntegrityError):
+            async with view.unique_violation():
+                raise duplicate('isbn')
+        # An index unknown to the model, e.g. created by a migration, is trusted
+        with self.assertRaises(APIException):
+            async with view.unique_violation():
+                raise duplicate('uniq_title_edition')
+
+    async def test_optimistic_update(self):
+        # Partial updates take the values of the other fields from the instance
+        for uri in ('/books/1', '/optimistic/1'):
+            with self.subTest(uri=uri):
+                _, response = await self.app.asgi_client.patch(uri, json={'title': 'book 2'})
+                self.assertIn('title:book 2  edition:1', response.json['message'])
+        self.assertEqual((await UniqueBook.get(id=1)).title, 'book 1')
+
+    async def test_bulk_update(self):
+        # The values of the updated rows are replaced by the new ones, taking the values of another row is not
+        data = [{'id': 1, 'title': 'book 4'}, {'id': 2, 'title': 'book 1'}, {'id': 3, 'title': 'book 4'}]
+        with assert_num_queries(2):
+            _, response = await self.app.asgi_client.patch('/books', json=data)
+        errors = response.json['data']
+        self.assertEqual(errors[:2], [{}, {}])
+        self.assertEqual(set(errors[2]), {'title', 'edition'})
+
+        data = [{'id': 1, 'title': 'book 4'}, {'id': 2, 'title': 'book 1'}, {'id': 3, 'edition': 2}]
+        _, response = await self.app.asgi_client.patch('/books', json=data)
+        self.assertEqual(response.status, 200, response.text)
+        self.assertEqual([book.title for book in await UniqueBook.all().order_by('id')], ['book 4', 'book 1', 'book 3'])
+
+        _, response = await self.app.asgi_client.patch('/optimistic', json=[{'id': 1, 'title': 'book 1'}])
+        self.assertEqual(response.json['message'], BookViewSet.unique_error_msg.format(rt_msg=' title, edition'))
+
+    async def test_check_unique_batch(self):
+        view = BookViewSet()
+        rows = [{'title': 'book 1'}, {'title': 'x'}, {'title': 'x'}, {'title': 'book 2', 'edition': 2}, {'title': 'x', 'edition': 2}]
+        # One query for the whole batch
+        with assert_num_queries(1):
+            errors = await view.check_unique_batch(rows)
+        self.assertEqual(set(errors), {0, 2})
+        self.assertEqual(set(errors[0]), {'title', 'edition'})
+
+    async def test_stream_create(self):
+        body = orjson.dumps([{'isbn': str(index), 'title': f'new {index}'} for index in range(10, 13)])
+        _, response = await self.app.asgi_client.post('/stream', content=body)
+        self.assertEqual(response.json['data'], {'count': 3}, response.text)
+
+        body = orjson.dumps([{'isbn': '20', 'title': 'a'}, {'isbn': '21', 'title': 'b'}, {'isbn': '22', 'title': 'book 1'}])
+        _, response = await self.app.asgi_client.post('/stream', content=body)
+        self.assertEqual(response.json['data'][:2], [{}, {}])
+        self.assertIn('title', response.json['data'][2])
+        self.assertEqual(await UniqueBook.filter(isbn__in=['20', '21']).count(), 0)
@@ -15,6 +15,7 @@ import json
 import time
 from typing import Union, Any
 
+from rest_framework import metrics
 from rest_framework.exceptions import ThrottledException
 from rest_framework.cache.backends.base import cache_manager
 
@@ -129,6 +130,7 @@ class RedisThrottle(BaseThrottle):
             self.history.pop()
 
         if len(self.history) >= self.num_requests:
+            metrics.record_throttle_rejection(view, self)
             msg = 'Too many requests. Please try again later, Expected available in {wait} second.'
             raise ThrottledException(message=msg.format(wait=await self.wait()))
 
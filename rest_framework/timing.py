@@ -0,0 +1,224 @@
+"""
+@Author:TioitWang
+@E-mile:me@tioit.cc
+@CreateTime:2026/10/19-10:12
+@DependencyLibrary:[...]
+@MainFunction:None
+@FileDoc:
+    timing.py
+    请求阶段耗时统计
+    RequestTimer   记录单次请求中各阶段(auth/permission/throttle/queryset/count/serialize/render/db)的耗时
+                   各阶段可以重叠，例如 db 包含在 serialize 内
+    phase          热路径上使用的计时上下文，未开启计时时返回空操作对象
+    TimingSink     聚合耗时数据的可插拔接收端
+@ChangeHistory:
+    datetime action why
+    2026/10/19-10:12 [Create] timing.py
+"""
+import time
+from contextvars import ContextVar
+
+from rest_framework import querylog
+
+__all__ = ('RequestTimer', 'BaseTimingSink', 'HistogramTimingSink', 'phase', 'current_timer', 'is_enabled', 'get_sinks')
+
+_current_timer: ContextVar = ContextVar('srf_request_timer', default=None)
+_sinks = None
+_db_hook_installed = False
+
+
+class _NullPhase:
+    """Phase used when timing is disabled, entering and leaving it costs nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class Phase:
+    __slots__ = ('timer', 'name', 'started')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class RequestTimer:
+    """
+    Collects per-phase durations (in seconds) of a single request.
+
+    example:
+        with RequestTimer('BookViewSet', 'GET') as timer:
+            with timer.phase('auth'):
+                ...
+            timer.finish(response)
+    """
+
+    def __init__(self, view_name, method, action=None):
+        self.view_name = view_name
+        self.method = method
+        self.action = action
+        self.phases = {}
+        self.queries = 0
+        self.status = None
+        self.started = time.perf_counter()
+        self.total = None
+        self._token = None
+
+    def phase(self, name):
+        return Phase(self, name)
+
+    def add(self, name, duration):
+        """Durations of phases with the same name are accumulated."""
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+
+    def stop(self):
+        if self.total is None:
+            self.total = time.perf_counter() - self.started
+        return self.total
+
+    def server_timing(self):
+        """Render the phases as a `Server-Timing` header value, durations in milliseconds."""
+        items = [f'{name};dur={duration * 1000:.3f}' for name, duration in self.phases.items()]
+        items.append(f'total;dur={self.stop() * 1000:.3f}')
+        return ', '.join(items)
+
+    def finish(self, response):
+        """Stop the timer and attach the `Server-Timing` header if it is enabled."""
+        from rest_framework.settings import srf_settings
+
+        self.stop()
+        self.status = getattr(response, 'status', None)
+        if response is not None and srf_settings.TIMING_SERVER_HEADER:
+            response.headers['Server-Timing'] = self.server_timing()
+        return response
+
+    def __enter__(self):
+        _install_db_hook()
+        self._token = _current_timer.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        _current_timer.reset(self._token)
+        for sink in get_sinks():
+            sink.record(self)
+        return False
+
+
+class BaseTimingSink:
+    """
+    Receives every finished RequestTimer.
+    Register sinks with the `TIMING_SINKS` setting, e.g.
+        'TIMING_SINKS': ('rest_framework.timing.HistogramTimingSink',)
+    """
+
+    def record(self, timer: RequestTimer):
+        raise NotImplementedError('subclasses of BaseTimingSink must provide a record() method')
+
+
+class HistogramTimingSink(BaseTimingSink):
+    """Aggregates phase durations of each view into cumulative histograms."""
+
+    buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.histograms = {}
+
+    def observe(self, key, duration):
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+        for index, bound in enumerate(self.buckets):
+            if duration <= bound:
+                histogram['buckets'][index] += 1
+        histogram['sum'] += duration
+        histogram['count'] += 1
+
+    def record(self, timer: RequestTimer):
+        for name, duration in timer.phases.items():
+            self.observe((timer.view_name, name), duration)
+        self.observe((timer.view_name, 'total'), timer.total)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {(view_name, phase): {'buckets': {le: count}, 'sum': float, 'count': int}}
+        """
+        return {
+            key: {
+                'buckets': dict(zip(self.buckets, histogram['buckets'])),
+                'sum': histogram['sum'],
+                'count': histogram['count'],
+            }
+            for key, histogram in self.histograms.items()
+        }
+
+
+def is_enabled():
+    # settings -> utils -> exceptions -> response -> timing, import lazily to avoid the cycle
+    from rest_framework.settings import srf_settings
+
+    return srf_settings.TIMING_ENABLED or srf_settings.METRICS_ENABLED
+
+
+def current_timer():
+    """Returns the RequestTimer of the running request, or None."""
+    return _current_timer.get()
+
+
+def phase(name):
+    """
+    Time a block of the running request, e.g.
+        with timing.phase('serialize'):
+            ...
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        return NULL_PHASE
+    return Phase(timer, name)
+
+
+def get_sinks():
+    global _sinks
+    if _sinks is None:
+        from rest_framework.settings import srf_settings
+
+        _sinks = [sink_class() for sink_class in srf_settings.TIMING_SINKS]
+        if srf_settings.METRICS_ENABLED:
+            from rest_framework.metrics import MetricsTimingSink
+
+            _sinks.append(MetricsTimingSink())
+    return _sinks
+
+
+def _record_query(sql, values, duration):
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.add('db', duration)
+        timer.queries += 1
+
+
+def _install_db_hook():
+    # Database clients are loaded by `Tortoise.init`, hook them on the first timed request
+    global _db_hook_installed
+    if not _db_hook_installed:
+        querylog.install()
+        querylog.add_listener(_record_query)
+        _db_hook_installed = True
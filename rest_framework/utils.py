@@ -11,10 +11,12 @@
     datetime action why
     example:
     2021/3/11 16:59 change 'Fix bug'
+    2026/10/19-22:50 [Change] IntegrityErrorHandel 解析唯一约束冲突的字段(SQLite/PostgreSQL/MySQL)
 """
 import datetime
 import functools
 import inspect
+import re
 from decimal import Decimal
 from urllib import parse
 
@@ -75,16 +77,46 @@ def replace_query_param(url, key, val):
 
 
 class IntegrityErrorHandel:
+    # SQLite: UNIQUE constraint failed: book.title, book.author_id
+    _SQLITE_COLUMNS = re.compile(r'UNIQUE constraint failed: (.+)$')
+    # PostgreSQL detail: Key (title, author_id)=(Book, 1) already exists.
+    _POSTGRES_COLUMNS = re.compile(r'Key \((.+?)\)=')
+    # MySQL: Duplicate entry 'Book' for key 'book.title', the key is the index name, not the columns
+    _MYSQL_KEY = re.compile(r"Duplicate entry .* for key '(?:[^'.]+\.)?([^']+)'")
+
     def __init__(self, exc: IntegrityError):
         self.exc = exc
         self.message = str(exc)
 
+    @property
+    def is_unique_violation(self):
+        message = self.message.lower()
+        return 'unique constraint' in message or 'duplicate' in message
+
+    @property
+    def fields(self):
+        """Columns of the violated unique constraint as far as the backend reports them, `()` when unknown"""
+        match = self._SQLITE_COLUMNS.search(self.message)
+        if match:
+            return tuple(column.strip().split('.')[-1] for column in match.group(1).split(','))
+        # asyncpg keeps the key in the detail of the original exception
+        original = self.exc.args[0] if self.exc.args else None
+        match = self._POSTGRES_COLUMNS.search(getattr(original, 'detail', None) or self.message)
+        if match:
+            return tuple(column.strip().strip('"') for column in match.group(1).split(','))
+        return ()
+
+    @property
+    def index_name(self):
+        """Name of the violated index for backends reporting it instead of the columns (MySQL), None otherwise"""
+        match = self._MYSQL_KEY.search(self.message)
+        return match.group(1) if match else None
+
     def parse_error_str(self):
         error = '发生错误:{}{}'
-        if 'UNIQUE' in self.message:
-            field_name = self.message.split('.')[-1]
-            error = error.format(field_name, '已存在')
-        return error
+        if self.is_unique_violation and (self.fields or self.index_name):
+            return error.format(', '.join(self.fields or (self.index_name,)), '已存在')
+        return error.format(self.message, '')
 
     def __str__(self):
         return self.parse_error_str()
@@ -18,12 +18,14 @@
 
 from tortoise.transactions import in_transaction
 
+from rest_framework import timing
 from rest_framework.constant import DEFAULT_METHOD_MAP
 
 __all__ = ('BaseView', 'APIView')
 
 from rest_framework.exceptions import APIException
-from rest_framework.response import JsonResponse
+from rest_framework.permissions import BasePermission
+from rest_framework.response import JsonResponse, reset_current_request, set_current_request
 from rest_framework.settings import srf_settings
 from rest_framework.status import HttpStatus, ResponseCode
 from rest_framework.utils import run_awaitable
@@ -60,6 +62,10 @@ class BaseView:
                 raise APIException(msg, status=HttpStatus.HTTP_405_METHOD_NOT_ALLOWED)
 
             self.request = request
+            self.action = view_method_map[request.method.lower()]
+            if getattr(view, 'is_stream', False) and not cls.is_stream_action(self.action):
+                # Every method of a stream route is left unread, only the streamed actions read the body themselves
+                await request.receive_body()
             self.args = args
             self.kwargs = kwargs
             self.app = request.app
@@ -69,11 +75,19 @@ class BaseView:
 
         view.detail = class_kwargs.get('detail', None)
         view.methods = methods
+        if any(cls.is_stream_action(action) for action in method_map.values()):
+            # Sanic leaves the body unread for `request.stream`, see sanic.views.stream
+            view.is_stream = True
         view.base_class = cls
         view.__module__ = cls.__module__
         view.__name__ = cls.__name__
         return view
 
+    @classmethod
+    def is_stream_action(cls, action):
+        """Whether the handler of `action` reads the request body from `request.stream` itself"""
+        return getattr(getattr(cls, action, None), 'is_stream', False)
+
     async def dispatch(self, request, *args, **kwargs):
         method = request.method.lower()
         handler = getattr(self, method, None)
@@ -98,6 +112,20 @@ class APIView(BaseView):
 
     async def dispatch(self, request, *args, **kwargs):
         """分发路由"""
+        # Responses built while handling the request negotiate their renderer against it
+        token = set_current_request(request)
+        try:
+            if not timing.is_enabled():
+                return await self.handle_dispatch(request, *args, **kwargs)
+            with timing.RequestTimer(self.__class__.__name__, request.method, getattr(self, 'action', None)) as timer:
+                response = await self.handle_dispatch(request, *args, **kwargs)
+                timer.finish(response)
+            return response
+        finally:
+            reset_current_request(token)
+
+    async def handle_dispatch(self, request, *args, **kwargs):
+        """执行认证、鉴权、限流及请求处理"""
         method = request.method.lower()
         handler = getattr(self, method, None)
         try:
@@ -109,6 +137,8 @@ class APIView(BaseView):
             else:
                 response = await handler(request=request, *args, **kwargs)
                 # response = await run_awaitable(handler, request=request, *args, **kwargs)
+            if isinstance(response, JsonResponse):
+                await response.prepare()
         except Exception as exc:
             return await self.handle_exception(exc)
         return response
@@ -198,6 +228,27 @@ class APIView(BaseView):
         for permission in self.get_permissions():
             await permission.has_object_permission(request, self, obj)
 
+    async def check_objects_permissions(self, request, objs):
+        """
+        检查是否应允许给定的一组对象的请求, 用于批量操作,
+        每个权限以 has_objects_permission 一次检查全部对象
+        :param request: 当前请求
+        :param objs: 需要鉴权的模型对象列表
+        :return:
+        """
+        for permission in self.get_permissions():
+            await permission.has_objects_permission(request, self, objs)
+
+    def checks_object_permissions(self):
+        """
+        权限中是否有对象级的检查, 没有时批量操作无需为鉴权查询对象
+        """
+        return any(
+            type(permission).has_object_permission is not BasePermission.has_object_permission
+            or type(permission).has_objects_permission is not BasePermission.has_objects_permission
+            for permission in self.get_permissions()
+        )
+
     async def check_throttles(self, request):
         """
         检查范围频率。
@@ -212,9 +263,12 @@ class APIView(BaseView):
         """
         在请求分发之前执行初始化操作，用于检查权限及检查基础内容
         """
-        await self.check_authentication(request)
-        await self.check_permissions(request)
-        await self.check_throttles(request)
+        with timing.phase('auth'):
+            await self.check_authentication(request)
+        with timing.phase('permission'):
+            await self.check_permissions(request)
+        with timing.phase('throttle'):
+            await self.check_throttles(request)
 
     async def handle_exception(self, exception):
         if isinstance(exception, APIException):
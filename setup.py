@@ -3,11 +3,13 @@ from setuptools import find_packages, setup
 setup(
     name='sanic-rest-framework',
     version='dev.0.1',
-    packages=find_packages(),
+    packages=find_packages(exclude=('benchmarks', 'benchmarks.*')),
     description="DOC...",
     author="Tioit-Wang",
     author_email='me@tioit.cc',
     url="https://github.com/Tioit-Wang/sanic-rest-framework",
     download_url='https://codeload.github.com/Tioit-Wang/sanic-rest-framework/zip/refs/heads/main',  # 下载地址
     install_requires=['sanic', 'tortoise-orm', 'orjson', 'PyJWT'],
+    # JWKSTokenAuthenticate (RS256/ES256/EdDSA)
+    extras_require={'jwks': ['PyJWT[crypto]']},
 )